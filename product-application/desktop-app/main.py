@@ -16,7 +16,6 @@ Features:
 import sys
 import os
 import json
-import requests
 import traceback
 from pathlib import Path
 from datetime import datetime
@@ -73,7 +72,7 @@ from PyQt5.QtCore import (
 )
 from PyQt5.QtGui import (
     QPixmap, QImage, QIcon, QFont, QPalette, QColor,
-    QDragEnterEvent, QDropEvent, QPainter, QPen, QKeySequence
+    QDragEnterEvent, QDropEvent, QPainter, QPen, QKeySequence, QTextCursor
 )
 
 # Import custom modules
@@ -81,17 +80,23 @@ from PyQt5.QtGui import (
 from modules.image_processor import ImageProcessor  # type: ignore
 from modules.imagekit_uploader import ImageKitUploader  # type: ignore
 from modules.sku_scanner import SKUScanner  # type: ignore
-from modules.ai_engine import AIEngine  # type: ignore
+from modules.ai_engine import get_ai_engine  # type: ignore
+from modules.ai_http import get_http_transport  # type: ignore
 from modules.background_remover import BackgroundRemover, check_rembg_installation, REMBG_AVAILABLE  # type: ignore
+from modules.rembg_session import get_session_manager  # type: ignore
 from modules.crop_tool import CropDialog  # type: ignore
+from modules.bg_preview_dialog import BackgroundPreviewDialog  # type: ignore
 from modules.import_wizard import ImportWizard  # type: ignore
 from modules.output_generator import OutputGenerator
 from modules.website_publisher import WebsitePublisher  # type: ignore
 from modules.config_validator import ConfigValidator  # type: ignore
 from modules.theme_modern import ModernPalette  # type: ignore
 from modules.widgets import DropZone, ImageThumbnail
-from modules.workers import ProcessingThread  # type: ignore
+from modules.workers import (  # type: ignore
+    ProcessingThread, GenerateAllThread, DescriptionStreamThread, SuggestFieldsStreamThread
+)
 from modules.utils import validate_image_for_upload, validate_images_for_upload  # type: ignore
+from modules.image_metadata import get_metadata_service  # type: ignore
 from modules.help_dialog import show_quick_start # type: ignore
 from modules.app_logger import (  # type: ignore
     logger, log_startup_info, log_config_status, log_function_call,
@@ -137,6 +142,12 @@ class KollectItApp(QMainWindow):
         self.selected_images = []  # Track multi-selected images for batch operations
         self.uploaded_image_urls = []  # Store URLs after ImageKit upload
         self.processing_thread = None
+        self.generate_all_thread = None
+        self.description_thread = None
+        self._description_before_stream = ""
+        self.fields_thread = None
+        self._streamed_fields = []
+        self._streamed_keys = set()
 
         # Initialize UI component attributes
         self.drop_zone = None
@@ -188,6 +199,14 @@ class KollectItApp(QMainWindow):
         self.setup_toolbar()
         self.setup_statusbar()
 
+        # Load the background-removal models in the background so the first
+        # preview / "Remove BG" click does not pay for it (light preview model first)
+        bg_config = self.config.get("image_processing", {}).get("background_removal", {})
+        if REMBG_AVAILABLE and bg_config.get("enabled", True):
+            remover = BackgroundRemover(self.config)
+            get_session_manager().warm_up(remover.preview_model_name)
+            get_session_manager().warm_up(remover.model_name)
+
     def load_config(self) -> dict:
         """Load configuration from config.json with validation and .env override."""
         print("[CONFIG] Loading configuration...")
@@ -535,6 +554,15 @@ class KollectItApp(QMainWindow):
         self.analyze_images_btn.setToolTip("Analyze images to auto-fill product details (title, category, era)")
         self.analyze_images_btn.clicked.connect(self.analyze_and_autofill)
         ai_btn_layout.addWidget(self.analyze_images_btn)
+
+        self.generate_all_btn = QPushButton("⚡ Generate All")
+        self.generate_all_btn.setObjectName("generateAllBtn")
+        self.generate_all_btn.setProperty("variant", "primary")
+        self.generate_all_btn.setToolTip(
+            "Fill details, description, SEO and price research in one pass (requests run in parallel)"
+        )
+        self.generate_all_btn.clicked.connect(self.generate_all_listing)
+        ai_btn_layout.addWidget(self.generate_all_btn)
         
         self.generate_desc_btn = QPushButton("✨ Generate with AI")
         self.generate_desc_btn.setObjectName("generateDescBtn")
@@ -892,10 +920,8 @@ class KollectItApp(QMainWindow):
             self.current_images = []
 
             image_extensions = {'.jpg', '.jpeg', '.png', '.webp', '.tiff', '.bmp'}
-            images = sorted([
-                f for f in Path(folder_path).iterdir()
-                if f.suffix.lower() in image_extensions
-            ])
+            # One bulk header scan; later validation/upload checks hit the cache
+            images = list(get_metadata_service().scan_folder(folder_path, image_extensions))
 
             logger.info(f"Found {len(images)} images")
             print(f"[LOAD] Found {len(images)} images")
@@ -1380,15 +1406,25 @@ class KollectItApp(QMainWindow):
         logger.info(f"Starting background removal: {image_path}")
 
         try:
+            bg_config = self.config.get("image_processing", {}).get("background_removal", {})
+            strength = self.bg_strength_slider.value() / 100
+            bg_color = bg_config.get("background_color", "#FFFFFF")
+
+            # Progressive preview: tune strength on a quick proxy result
+            # first; saving then reuses the cached full-quality mask
+            if bg_config.get("progressive_preview", True):
+                dialog = BackgroundPreviewDialog(image_path, self.config, strength, bg_color, self)
+                if dialog.exec_() != QDialog.Accepted:
+                    logger.info("Background removal preview cancelled")
+                    return
+                strength = dialog.strength()
+                self.bg_strength_slider.setValue(int(round(strength * 100)))
+
             self.log(f"Removing background: {os.path.basename(image_path)}", "info")
             self.progress_bar.setValue(0)
             self.status_label.setText("Removing background...")
 
-            remover = BackgroundRemover()
-            strength = self.bg_strength_slider.value() / 100
-            bg_color = self.config.get("image_processing", {}).get(
-                "background_removal", {}
-            ).get("background_color", "#FFFFFF")
+            remover = BackgroundRemover(self.config)
 
             logger.debug(f"BG removal settings: strength={strength}, bg_color={bg_color}")
 
@@ -1401,6 +1437,12 @@ class KollectItApp(QMainWindow):
             self.progress_bar.setValue(100)
             self.status_label.setText("Background removed!")
             self.log(f"Background removed: {os.path.basename(output_path)}", "success")
+            timing = get_session_manager().stats().get(remover.model_name)
+            if timing:
+                logger.info(
+                    f"rembg inference {timing['last_inference_seconds']}s "
+                    f"(model load {timing['load_seconds']}s, {timing['calls']} calls)"
+                )
             logger.info(f"Background removed successfully: {output_path}")
             print(f"[BG-REMOVE] ✓ Complete: {os.path.basename(output_path)}")
 
@@ -1480,6 +1522,22 @@ class KollectItApp(QMainWindow):
 
             self.log(f"Background removal: {success_count} succeeded, {failed_count} failed", "success")
 
+            if "images_per_minute" in results:
+                self.log(
+                    f"Throughput {results['images_per_minute']} images/min "
+                    f"({results['workers']} workers x {results['threads_per_worker']} threads, "
+                    f"{results['elapsed_seconds']}s)",
+                    "info"
+                )
+
+            timing = results.get("timing")
+            if timing and timing.get("calls"):
+                self.log(
+                    f"Model load {timing['load_seconds']}s, "
+                    f"avg inference {timing['avg_inference_seconds']}s/image",
+                    "info"
+                )
+
             if failed_count > 0:
                 self.log(f"Errors: {len(results['errors'])} images failed", "warning")
 
@@ -1607,8 +1665,6 @@ class KollectItApp(QMainWindow):
             self.progress_bar.setValue(10)
             QApplication.processEvents()
 
-            logger.debug("Initializing AIEngine for analysis")
-            engine = AIEngine(self.config)
             images = self.current_images[:MAX_AI_IMAGES_ANALYZE]
 
             logger.info(f"Analyzing {len(images)} images (max {MAX_AI_IMAGES_ANALYZE})")
@@ -1628,6 +1684,12 @@ class KollectItApp(QMainWindow):
             self.progress_bar.setValue(30)
             QApplication.processEvents()
 
+            if self.config.get("ai", {}).get("streaming", True):
+                # Fields fill in one by one as the reply streams in
+                self._start_fields_stream(product_data, categories)
+                return
+
+            engine = get_ai_engine(self.config)
             result = engine.suggest_fields(product_data, categories)
 
             if not result:
@@ -1647,123 +1709,7 @@ class KollectItApp(QMainWindow):
             self.progress_bar.setValue(50)
             QApplication.processEvents()
 
-            fields_filled = []
-
-            # Title
-            if result.get("title"):
-                self.title_edit.setText(result["title"])
-                fields_filled.append("Title")
-                self.log(f"📝 Title: {result['title']}", "info")
-
-            # Category mapping
-            cat_id = result.get("category_id")
-            if cat_id:
-                idx = self.category_combo.findData(cat_id)
-                if idx >= 0:
-                    self.category_combo.setCurrentIndex(idx)
-                    self.on_category_changed()  # Refresh subcategories
-                    fields_filled.append("Category")
-                    self.log(f"📂 Category: {cat_id}", "info")
-                else:
-                    self.log(f"⚠️ Category '{cat_id}' not found in config", "warning")
-
-            QApplication.processEvents()
-
-            # Subcategory
-            subc = result.get("subcategory")
-            if subc:
-                # Try exact match first, then contains match
-                idx = self.subcategory_combo.findText(subc, Qt.MatchExactly)
-                if idx < 0:
-                    idx = self.subcategory_combo.findText(subc, Qt.MatchContains)
-                if idx >= 0:
-                    self.subcategory_combo.setCurrentIndex(idx)
-                else:
-                    # Add it temporarily
-                    self.subcategory_combo.insertItem(0, subc)
-                    self.subcategory_combo.setCurrentIndex(0)
-                fields_filled.append("Subcategory")
-                self.log(f"📁 Subcategory: {subc}", "info")
-
-            # Condition
-            cond = result.get("condition")
-            if cond:
-                idx = self.condition_combo.findText(cond, Qt.MatchContains)
-                if idx >= 0:
-                    self.condition_combo.setCurrentIndex(idx)
-                else:
-                    self.condition_combo.insertItem(0, cond)
-                    self.condition_combo.setCurrentIndex(0)
-                fields_filled.append("Condition")
-                self.log(f"⭐ Condition: {cond}", "info")
-
-            self.progress_bar.setValue(70)
-            QApplication.processEvents()
-
-            # Era & Origin
-            if result.get("era"):
-                self.era_edit.setText(result["era"])
-                fields_filled.append("Era")
-                self.log(f"📅 Era: {result['era']}", "info")
-            if result.get("origin"):
-                self.origin_edit.setText(result["origin"])
-                fields_filled.append("Origin")
-                self.log(f"🌍 Origin: {result['origin']}", "info")
-
-            # Description
-            if result.get("description"):
-                self.description_edit.setPlainText(result["description"])
-                fields_filled.append("Description")
-                self.log(f"📄 Description: {len(result['description'])} chars", "info")
-
-            self.progress_bar.setValue(85)
-            QApplication.processEvents()
-
-            # SEO fields
-            if result.get("seo_title"):
-                self.seo_title_edit.setText(result["seo_title"][:70])
-                fields_filled.append("SEO Title")
-
-            if result.get("seo_description"):
-                self.seo_desc_edit.setPlainText(result["seo_description"][:160])
-                fields_filled.append("SEO Description")
-
-            keywords = result.get("keywords", [])
-            if keywords:
-                if isinstance(keywords, list):
-                    self.seo_keywords_edit.setText(", ".join(keywords))
-                else:
-                    self.seo_keywords_edit.setText(str(keywords))
-                fields_filled.append("Keywords")
-                self.log(f"🏷️ Keywords: {len(keywords) if isinstance(keywords, list) else 1} generated", "info")
-
-            self.progress_bar.setValue(95)
-            QApplication.processEvents()
-
-            # Valuation -> show in log but don't auto-set price
-            val = result.get("valuation") or {}
-            rec_price = val.get("recommended")
-            low_price = val.get("low", 0)
-            high_price = val.get("high", 0)
-            confidence = val.get("confidence", "Unknown")
-
-            if isinstance(rec_price, (int, float)) and rec_price > 0:
-                self.last_valuation = {
-                    "low": low_price,
-                    "high": high_price,
-                    "recommended": rec_price,
-                    "confidence": confidence,
-                    "notes": val.get("notes", "")
-                }
-                self.log(
-                    f"💰 Estimated Value: ${low_price:,.0f} - ${high_price:,.0f} "
-                    f"(Recommended: ${rec_price:,.0f}, {confidence} confidence)",
-                    "info"
-                )
-                # Optionally set the price
-                if self.price_spin.value() == 0:
-                    self.price_spin.setValue(float(rec_price))
-                    fields_filled.append("Price")
+            fields_filled = self._apply_suggested_fields(result)
 
             self.progress_bar.setValue(100)
             self.update_export_button_state()
@@ -1795,8 +1741,274 @@ class KollectItApp(QMainWindow):
                 f"An error occurred during analysis:\n\n{str(e)}"
             )
 
+    def _start_fields_stream(self, product_data: dict, categories: dict):
+        """Run suggest_fields streamed; each field is applied as soon as it arrives."""
+        self._streamed_fields = []
+        self._streamed_keys = set()
+        self.analyze_images_btn.setEnabled(False)
+
+        self.fields_thread = SuggestFieldsStreamThread(self.config, product_data, categories)
+        self.fields_thread.field_ready.connect(self.on_field_streamed)
+        self.fields_thread.finished.connect(self.on_fields_stream_finished)
+        self.fields_thread.error.connect(self.on_fields_stream_error)
+        self.fields_thread.start()
+
+    def on_field_streamed(self, key: str, value):
+        """Fill one form field from the streaming suggestion."""
+        self._streamed_keys.add(key)
+        self._streamed_fields.extend(self._apply_suggested_fields({key: value}))
+        self.progress_bar.setValue(min(95, 30 + 5 * len(self._streamed_keys)))
+        self.status_label.setText(f"AI filling fields... ({len(self._streamed_fields)} so far)")
+
+    def _end_fields_stream(self):
+        self.analyze_images_btn.setEnabled(True)
+        if self.fields_thread is not None:
+            self.fields_thread.deleteLater()
+            self.fields_thread = None
+
+    def on_fields_stream_finished(self, result: dict):
+        """Apply anything the stream did not deliver field by field, then summarize."""
+        self._end_fields_stream()
+        remaining = {
+            k: v for k, v in result.items()
+            if k not in self._streamed_keys and k != "cancelled"
+        }
+        fields_filled = self._streamed_fields + self._apply_suggested_fields(remaining)
+
+        if not fields_filled:
+            self.log("❌ AI analysis returned no data - check API key", "warning")
+            self.status_label.setText("Analysis failed - check API key")
+            self.progress_bar.setValue(0)
+            return
+
+        self.progress_bar.setValue(100)
+        self.update_export_button_state()
+        self.status_label.setText("Analysis complete!")
+        self.log(f"✅ AI filled {len(fields_filled)} fields: {', '.join(fields_filled)}", "success")
+        self.log("Review and adjust as needed, then Generate Description for final polish", "info")
+
+    def on_fields_stream_error(self, error: str):
+        """Handle a failed streaming analysis."""
+        self._end_fields_stream()
+        self.progress_bar.setValue(0)
+        self.log(f"❌ AI analyze error: {error}", "error")
+        self.status_label.setText("Analysis error")
+        QMessageBox.warning(self, "AI Error", f"An error occurred during analysis:\n\n{error}")
+
+    def generate_all_listing(self):
+        """
+        Generate the complete listing (fields, description, SEO, valuation)
+        in the background, with the AI requests running concurrently.
+        """
+        logger.info("Starting AI generate all")
+
+        if not self.current_images:
+            logger.warning("No images loaded for generate all")
+            QMessageBox.warning(self, "No Images", "Load a product folder first.")
+            return
+        if self.generate_all_thread is not None:
+            return
+
+        product_data = {
+            "title": self.title_edit.text(),
+            "category": self.category_combo.currentData(),
+            "subcategory": self.subcategory_combo.currentText(),
+            "condition": self.condition_combo.currentText(),
+            "era": self.era_edit.text(),
+            "origin": self.origin_edit.text(),
+            "images": self.current_images[:MAX_AI_IMAGES_ANALYZE]
+        }
+
+        self.log("⚡ Generating complete listing with AI...", "info")
+        self.status_label.setText("AI generating listing...")
+        self.progress_bar.setValue(0)
+        self.generate_all_btn.setEnabled(False)
+
+        self.generate_all_thread = GenerateAllThread(
+            self.config, product_data, self.config.get("categories", {})
+        )
+        self.generate_all_thread.progress.connect(self.on_processing_progress)
+        self.generate_all_thread.finished.connect(self.on_generate_all_finished)
+        self.generate_all_thread.error.connect(self.on_generate_all_error)
+        self.generate_all_thread.start()
+
+    def on_generate_all_finished(self, result: dict):
+        """Fill the form from a generate_all result."""
+        self.generate_all_btn.setEnabled(True)
+        if self.generate_all_thread is not None:
+            self.generate_all_thread.deleteLater()
+            self.generate_all_thread = None
+
+        errors = result.get("errors", {})
+        for step, message in errors.items():
+            self.log(f"⚠️ AI {step}: {message}", "warning")
+
+        fields_filled = self._apply_suggested_fields(result)
+        if result.get("condition_notes"):
+            self.log(f"Condition: {result['condition_notes'][:100]}...", "info")
+
+        if result.get("fallbacks"):
+            self.log(f"AI redid sections separately: {', '.join(result['fallbacks'])}", "info")
+
+        timings = result.get("timings", {})
+        logger.info(f"Generate all ({result.get('mode')}) timings: {timings}")
+        self.log(
+            f"⏱️ {result.get('elapsed_seconds', 0):.1f}s total "
+            f"(requests: {sum(timings.values()):.1f}s combined)",
+            "info"
+        )
+        rate_limits = result.get("rate_limits", {})
+        if rate_limits.get("retries") or rate_limits.get("wait_seconds"):
+            self.log(
+                f"⏳ Rate limits this session: waited {rate_limits.get('wait_seconds', 0):.1f}s, "
+                f"{rate_limits.get('retries', 0)} retries",
+                "info"
+            )
+
+        self.progress_bar.setValue(100)
+        self.update_export_button_state()
+        if fields_filled:
+            self.status_label.setText("Listing generated!")
+            self.log(f"✅ AI filled {len(fields_filled)} fields: {', '.join(fields_filled)}", "success")
+        else:
+            self.status_label.setText("Generation failed - check API key")
+            self.log("❌ AI returned no data - check API key", "warning")
+
+    def on_generate_all_error(self, error: str):
+        """Handle a failed generate all run."""
+        self.generate_all_btn.setEnabled(True)
+        if self.generate_all_thread is not None:
+            self.generate_all_thread.deleteLater()
+            self.generate_all_thread = None
+        self.progress_bar.setValue(0)
+        self.log(f"❌ AI generate all error: {error}", "error")
+        self.status_label.setText("AI error - check log")
+        QMessageBox.warning(self, "AI Error", f"Listing generation failed:\n\n{error}")
+
+    def _apply_suggested_fields(self, result: dict) -> list:
+        """
+        Fill the form from an AI field suggestion (suggest_fields or generate_all format).
+
+        Returns:
+            Names of the fields that were filled
+        """
+        fields_filled = []
+
+        # Title
+        if result.get("title"):
+            self.title_edit.setText(result["title"])
+            fields_filled.append("Title")
+            self.log(f"📝 Title: {result['title']}", "info")
+
+        # Category mapping
+        cat_id = result.get("category_id")
+        if cat_id:
+            idx = self.category_combo.findData(cat_id)
+            if idx >= 0:
+                self.category_combo.setCurrentIndex(idx)
+                self.on_category_changed()  # Refresh subcategories
+                fields_filled.append("Category")
+                self.log(f"📂 Category: {cat_id}", "info")
+            else:
+                self.log(f"⚠️ Category '{cat_id}' not found in config", "warning")
+
+        # Subcategory
+        subc = result.get("subcategory")
+        if subc:
+            # Try exact match first, then contains match
+            idx = self.subcategory_combo.findText(subc, Qt.MatchExactly)
+            if idx < 0:
+                idx = self.subcategory_combo.findText(subc, Qt.MatchContains)
+            if idx >= 0:
+                self.subcategory_combo.setCurrentIndex(idx)
+            else:
+                # Add it temporarily
+                self.subcategory_combo.insertItem(0, subc)
+                self.subcategory_combo.setCurrentIndex(0)
+            fields_filled.append("Subcategory")
+            self.log(f"📁 Subcategory: {subc}", "info")
+
+        # Condition
+        cond = result.get("condition")
+        if cond:
+            idx = self.condition_combo.findText(cond, Qt.MatchContains)
+            if idx >= 0:
+                self.condition_combo.setCurrentIndex(idx)
+            else:
+                self.condition_combo.insertItem(0, cond)
+                self.condition_combo.setCurrentIndex(0)
+            fields_filled.append("Condition")
+            self.log(f"⭐ Condition: {cond}", "info")
+
+        # Era & Origin
+        if result.get("era"):
+            self.era_edit.setText(result["era"])
+            fields_filled.append("Era")
+            self.log(f"📅 Era: {result['era']}", "info")
+        if result.get("origin"):
+            self.origin_edit.setText(result["origin"])
+            fields_filled.append("Origin")
+            self.log(f"🌍 Origin: {result['origin']}", "info")
+
+        # Description
+        if result.get("description"):
+            self.description_edit.setPlainText(result["description"])
+            fields_filled.append("Description")
+            self.log(f"📄 Description: {len(result['description'])} chars", "info")
+
+        # SEO fields
+        if result.get("seo_title"):
+            self.seo_title_edit.setText(result["seo_title"][:70])
+            fields_filled.append("SEO Title")
+
+        if result.get("seo_description"):
+            self.seo_desc_edit.setPlainText(result["seo_description"][:160])
+            fields_filled.append("SEO Description")
+
+        keywords = result.get("keywords", [])
+        if keywords:
+            if isinstance(keywords, list):
+                self.seo_keywords_edit.setText(", ".join(keywords))
+            else:
+                self.seo_keywords_edit.setText(str(keywords))
+            fields_filled.append("Keywords")
+            self.log(f"🏷️ Keywords: {len(keywords) if isinstance(keywords, list) else 1} generated", "info")
+
+        # Valuation -> show in log but don't auto-set price
+        val = result.get("valuation") or {}
+        rec_price = val.get("recommended")
+        low_price = val.get("low", 0)
+        high_price = val.get("high", 0)
+        confidence = val.get("confidence", "Unknown")
+
+        if isinstance(rec_price, (int, float)) and rec_price > 0:
+            self.last_valuation = {
+                "low": low_price,
+                "high": high_price,
+                "recommended": rec_price,
+                "confidence": confidence,
+                "notes": val.get("notes", "")
+            }
+            self.log(
+                f"💰 Estimated Value: ${low_price:,.0f} - ${high_price:,.0f} "
+                f"(Recommended: ${rec_price:,.0f}, {confidence} confidence)",
+                "info"
+            )
+            # Optionally set the price
+            if self.price_spin.value() == 0:
+                self.price_spin.setValue(float(rec_price))
+                fields_filled.append("Price")
+
+        return fields_filled
+
     def generate_description(self):
-        """Generate product description using AI."""
+        """Generate product description using AI (streamed into the editor when enabled)."""
+        if self.description_thread is not None:
+            # Button doubles as "Stop" while a description streams in
+            self.description_thread.requestInterruption()
+            self.status_label.setText("Stopping description...")
+            return
+
         print("[AI] Starting description generation...")
         logger.info("Starting AI description generation")
 
@@ -1805,138 +2017,41 @@ class KollectItApp(QMainWindow):
             QMessageBox.warning(self, "No Images", "Load a product folder first.")
             return
 
-        self.log("Generating AI description...", "info")
-        self.status_label.setText("AI generating description...")
-
-        try:
-            print("[AI] Initializing AI Engine...")
-            logger.debug("Initializing AIEngine")
-            engine = AIEngine(self.config)
+        category = self.category_combo.currentData()
+        if not category:
+            logger.warning("No category selected")
+            QMessageBox.warning(self, "No Category", "Please select a category first.")
+            return
 
-            category = self.category_combo.currentData()
-            if not category:
-                logger.warning("No category selected")
-                QMessageBox.warning(self, "No Category", "Please select a category first.")
-                return
+        product_data = {
+            "title": self.title_edit.text(),
+            "category": category,
+            "subcategory": self.subcategory_combo.currentText(),
+            "condition": self.condition_combo.currentText(),
+            "era": self.era_edit.text(),
+            "origin": self.origin_edit.text(),
+            "images": self.current_images[:MAX_AI_IMAGES_DESCRIPTION]
+        }
 
-            product_data = {
-                "title": self.title_edit.text(),
-                "category": category,
-                "subcategory": self.subcategory_combo.currentText(),
-                "condition": self.condition_combo.currentText(),
-                "era": self.era_edit.text(),
-                "origin": self.origin_edit.text(),
-                "images": self.current_images[:MAX_AI_IMAGES_DESCRIPTION]
-            }
+        self.log("Generating AI description...", "info")
+        self.status_label.setText("AI generating description...")
+        logger.info(f"Sending {len(product_data['images'])} images to AI")
+        print(f"[AI] Sending request with {len(product_data['images'])} images...")
 
-            logger.info(f"Sending {len(product_data['images'])} images to AI")
-            print(f"[AI] Sending request with {len(product_data['images'])} images...")
+        if self.config.get("ai", {}).get("streaming", True):
+            self._start_description_stream(product_data)
+            return
 
+        try:
+            engine = get_ai_engine(self.config)
             result = engine.generate_description(product_data)
 
             # Log the result
             logger.debug(f"AI Response: {result}")
             print(f"[AI] Response received: {type(result)}")
 
-            if result:
-                # CHECK FOR ERRORS FIRST
-                if result.get("error"):
-                    self.log(f"AI Error: {result['error']}", "error")
-                    QMessageBox.warning(self, "AI Error", f"Failed to generate description:\n\n{result['error']}")
-                    self.status_label.setText("AI error - check log")
-                    return
-
-                # ============================================================
-                # Issue 3: SEO Fields Population - Robust field mapping
-                # ============================================================
-
-                # Populate description
-                description = result.get("description", "")
-                if description:
-                    self.description_edit.setPlainText(description)
-                    self.log(f"Description generated ({len(description)} chars)", "info")
-                else:
-                    self.log("Warning: No description in AI response", "warning")
-
-                # Populate SEO Title - try multiple keys
-                seo_title = (
-                    result.get("seo_title") or
-                    result.get("seoTitle") or
-                    result.get("suggested_title") or
-                    ""
-                )
-                if seo_title:
-                    # Truncate to 70 chars as per SEO best practices
-                    self.seo_title_edit.setText(seo_title[:70])
-                    self.log(f"SEO Title: {seo_title[:50]}...", "info")
-
-                # Populate SEO Meta Description - try multiple keys
-                seo_desc = (
-                    result.get("seo_description") or
-                    result.get("seoDescription") or
-                    result.get("meta_description") or
-                    ""
-                )
-                if seo_desc:
-                    # Truncate to 160 chars as per SEO best practices
-                    self.seo_desc_edit.setPlainText(seo_desc[:160])
-                    self.log(f"SEO Description: {seo_desc[:50]}...", "info")
-                elif description:
-                    # Fallback: use first 160 chars of description
-                    fallback_desc = description[:160].rsplit(' ', 1)[0] + "..."
-                    self.seo_desc_edit.setPlainText(fallback_desc)
-                    self.log("SEO Description: Auto-generated from description", "info")
-
-                # Populate Keywords - handle both list and string formats
-                keywords = result.get("keywords") or result.get("seoKeywords") or []
-                if keywords:
-                    if isinstance(keywords, list):
-                        keywords_str = ", ".join(str(k) for k in keywords)
-                    else:
-                        keywords_str = str(keywords)
-                    self.seo_keywords_edit.setText(keywords_str)
-                    keyword_count = len(keywords) if isinstance(keywords, list) else keywords_str.count(",") + 1
-                    self.log(f"Keywords: {keyword_count} generated", "info")
-
-                # Populate suggested title if current title is empty
-                suggested_title = result.get("suggested_title") or result.get("title") or ""
-                if suggested_title and not self.title_edit.text().strip():
-                    self.title_edit.setText(suggested_title)
-                    self.log(f"Suggested title: {suggested_title}", "info")
-
-                # Handle valuation if present (from description generation)
-                valuation = result.get("valuation")
-                if valuation and isinstance(valuation, dict):
-                    recommended = valuation.get("recommended") or 0
-                    low = valuation.get("low") or 0
-                    high = valuation.get("high") or 0
-                    if recommended:
-                        self.log(
-                            f"Price Research: ${low:,.2f} - ${high:,.2f} (Recommended: ${recommended:,.2f})",
-                            "info"
-                        )
-                        self.last_valuation = {
-                            "low": low,
-                            "high": high,
-                            "recommended": recommended,
-                            "confidence": valuation.get("confidence", "Medium"),
-                            "notes": valuation.get("notes", "")
-                        }
-                        # Optionally suggest the price
-                        if self.price_spin.value() == 0 and recommended > 0:
-                            self.price_spin.setValue(float(recommended))
-                            self.log(f"Price auto-set to ${recommended:,.2f}", "info")
-
-                # Handle condition notes
-                condition_notes = result.get("condition_notes", "")
-                if condition_notes:
-                    self.log(f"Condition: {condition_notes[:100]}...", "info")
-
-                self.log("AI description generated successfully", "success")
-                self.update_export_button_state()
-            else:
-                self.log("AI generation returned no results", "warning")
-                QMessageBox.warning(self, "AI Error", "No response from AI. Check your API key configuration.")
+            if not self._apply_description_result(result):
+                return
 
         except Exception as e:
             self.log(f"AI error: {e}", "error")
@@ -1944,6 +2059,162 @@ class KollectItApp(QMainWindow):
 
         self.status_label.setText("Ready")
 
+    def _start_description_stream(self, product_data: dict):
+        """Stream the description into the editor; the button stops it."""
+        self._description_before_stream = self.description_edit.toPlainText()
+        self.description_edit.clear()
+        self.generate_desc_btn.setText("⏹ Stop")
+
+        self.description_thread = DescriptionStreamThread(self.config, product_data)
+        self.description_thread.delta.connect(self.on_description_delta)
+        self.description_thread.finished.connect(self.on_description_stream_finished)
+        self.description_thread.error.connect(self.on_description_stream_error)
+        self.description_thread.start()
+
+    def on_description_delta(self, text: str):
+        """Append streamed description text."""
+        cursor = self.description_edit.textCursor()
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
+        self.description_edit.setTextCursor(cursor)
+        self.description_edit.ensureCursorVisible()
+
+    def _end_description_stream(self):
+        self.generate_desc_btn.setText("✨ Generate with AI")
+        if self.description_thread is not None:
+            self.description_thread.deleteLater()
+            self.description_thread = None
+
+    def on_description_stream_finished(self, result: dict):
+        """Fill the remaining fields once the streamed reply is complete."""
+        self._end_description_stream()
+        if result.get("cancelled"):
+            self.log("Description generation stopped", "warning")
+            if not self.description_edit.toPlainText().strip():
+                self.description_edit.setPlainText(self._description_before_stream)
+            self.status_label.setText("Ready")
+            return
+        logger.debug(f"AI Response: {result}")
+        if self._apply_description_result(result):
+            self.status_label.setText("Ready")
+
+    def on_description_stream_error(self, error: str):
+        """Handle a failed description stream."""
+        self._end_description_stream()
+        if not self.description_edit.toPlainText().strip():
+            self.description_edit.setPlainText(self._description_before_stream)
+        self.log(f"AI error: {error}", "error")
+        QMessageBox.warning(self, "AI Error", f"Failed to generate description:\n\n{error}")
+        self.status_label.setText("AI error - check log")
+
+    def _apply_description_result(self, result) -> bool:
+        """
+        Populate description, SEO, title and valuation from a description result.
+
+        Returns:
+            False if the result reported an error
+        """
+        if result:
+            # CHECK FOR ERRORS FIRST
+            if result.get("error"):
+                self.log(f"AI Error: {result['error']}", "error")
+                QMessageBox.warning(self, "AI Error", f"Failed to generate description:\n\n{result['error']}")
+                self.status_label.setText("AI error - check log")
+                return False
+
+            # ============================================================
+            # Issue 3: SEO Fields Population - Robust field mapping
+            # ============================================================
+
+            # Populate description
+            description = result.get("description", "")
+            if description:
+                self.description_edit.setPlainText(description)
+                self.log(f"Description generated ({len(description)} chars)", "info")
+            else:
+                self.log("Warning: No description in AI response", "warning")
+
+            # Populate SEO Title - try multiple keys
+            seo_title = (
+                result.get("seo_title") or
+                result.get("seoTitle") or
+                result.get("suggested_title") or
+                ""
+            )
+            if seo_title:
+                # Truncate to 70 chars as per SEO best practices
+                self.seo_title_edit.setText(seo_title[:70])
+                self.log(f"SEO Title: {seo_title[:50]}...", "info")
+
+            # Populate SEO Meta Description - try multiple keys
+            seo_desc = (
+                result.get("seo_description") or
+                result.get("seoDescription") or
+                result.get("meta_description") or
+                ""
+            )
+            if seo_desc:
+                # Truncate to 160 chars as per SEO best practices
+                self.seo_desc_edit.setPlainText(seo_desc[:160])
+                self.log(f"SEO Description: {seo_desc[:50]}...", "info")
+            elif description:
+                # Fallback: use first 160 chars of description
+                fallback_desc = description[:160].rsplit(' ', 1)[0] + "..."
+                self.seo_desc_edit.setPlainText(fallback_desc)
+                self.log("SEO Description: Auto-generated from description", "info")
+
+            # Populate Keywords - handle both list and string formats
+            keywords = result.get("keywords") or result.get("seoKeywords") or []
+            if keywords:
+                if isinstance(keywords, list):
+                    keywords_str = ", ".join(str(k) for k in keywords)
+                else:
+                    keywords_str = str(keywords)
+                self.seo_keywords_edit.setText(keywords_str)
+                keyword_count = len(keywords) if isinstance(keywords, list) else keywords_str.count(",") + 1
+                self.log(f"Keywords: {keyword_count} generated", "info")
+
+            # Populate suggested title if current title is empty
+            suggested_title = result.get("suggested_title") or result.get("title") or ""
+            if suggested_title and not self.title_edit.text().strip():
+                self.title_edit.setText(suggested_title)
+                self.log(f"Suggested title: {suggested_title}", "info")
+
+            # Handle valuation if present (from description generation)
+            valuation = result.get("valuation")
+            if valuation and isinstance(valuation, dict):
+                recommended = valuation.get("recommended") or 0
+                low = valuation.get("low") or 0
+                high = valuation.get("high") or 0
+                if recommended:
+                    self.log(
+                        f"Price Research: ${low:,.2f} - ${high:,.2f} (Recommended: ${recommended:,.2f})",
+                        "info"
+                    )
+                    self.last_valuation = {
+                        "low": low,
+                        "high": high,
+                        "recommended": recommended,
+                        "confidence": valuation.get("confidence", "Medium"),
+                        "notes": valuation.get("notes", "")
+                    }
+                    # Optionally suggest the price
+                    if self.price_spin.value() == 0 and recommended > 0:
+                        self.price_spin.setValue(float(recommended))
+                        self.log(f"Price auto-set to ${recommended:,.2f}", "info")
+
+            # Handle condition notes
+            condition_notes = result.get("condition_notes", "")
+            if condition_notes:
+                self.log(f"Condition: {condition_notes[:100]}...", "info")
+
+            self.log("AI description generated successfully", "success")
+            self.update_export_button_state()
+        else:
+            self.log("AI generation returned no results", "warning")
+            QMessageBox.warning(self, "AI Error", "No response from AI. Check your API key configuration.")
+        return True
+
     def generate_valuation(self):
         """Generate AI-powered price research and display guidance."""
         print("[AI] Starting price valuation research...")
@@ -1953,8 +2224,7 @@ class KollectItApp(QMainWindow):
         self.status_label.setText("Researching prices...")
 
         try:
-            logger.debug("Initializing AIEngine for valuation")
-            engine = AIEngine(self.config)
+            engine = get_ai_engine(self.config)
 
             category = self.category_combo.currentData()
             if not category:
@@ -2692,7 +2962,9 @@ class KollectItApp(QMainWindow):
         }
 
         try:
-            resp = requests.post("https://api.anthropic.com/v1/messages", headers=headers, json=payload, timeout=20)
+            # Same keep-alive pool as the AI engine, so the check also warms a connection
+            session = get_http_transport(self.config).session
+            resp = session.post("https://api.anthropic.com/v1/messages", headers=headers, json=payload, timeout=20)
             if resp.status_code == 200:
                 QMessageBox.information(self, "Anthropic Key Test", "Success: Anthropic API responded OK.")
             else:
@@ -2788,11 +3060,46 @@ class KollectItApp(QMainWindow):
                 logger.warning(error_msg, exc_info=True)
                 # Don't block exit on cleanup failure
         
+        # Stop AI threads before their shared connections go away
+        ai_threads_stopped = self._stop_ai_threads()
+        
+        # Close pooled AI connections, logging how many requests reused one
+        transport = get_http_transport(self.config)
+        logger.info(f"AI connection reuse: {transport.stats.snapshot()}")
+        if ai_threads_stopped:
+            transport.close()
+        else:
+            # A request is still in flight; process exit closes the sockets
+            logger.warning("AI request still running at exit; leaving its connection open")
+        
         super().closeEvent(event)
+    
+    def _stop_ai_threads(self, timeout_ms: int = 15000) -> bool:
+        """
+        Interrupt and wait for the generate-all, description and field
+        threads (streams stop at the next delta; a blocking request runs
+        until its response). Returns False if one is still running.
+        """
+        threads = [
+            thread for thread in (self.generate_all_thread, self.description_thread, self.fields_thread)
+            if thread is not None and thread.isRunning()
+        ]
+        for thread in threads:
+            thread.requestInterruption()
+        stopped = True
+        for thread in threads:
+            if not thread.wait(timeout_ms):
+                logger.warning(f"{type(thread).__name__} did not stop within {timeout_ms} ms")
+                stopped = False
+        return stopped
 
 
 def main():
     """Application entry point."""
+    # Required for the image process pool in frozen (PyInstaller) builds
+    import multiprocessing
+    multiprocessing.freeze_support()
+
     # Validate environment before starting GUI
     validate_env_before_startup()
     
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Adaptive Encoder Module
+Chooses WebP quality (and lossy vs lossless) per image instead of a fixed
+webp_quality.
+
+Modes (image_processing.adaptive_encoding.mode):
+- fixed:         encode at webp_quality (previous behavior)
+- target_size:   highest quality whose output fits target_kb
+- quality_floor: lowest quality whose SSIM vs. the resized pixels >= ssim_floor
+
+Line-art and few-color images (book scans, documents, plain white-background
+graphics) are also tried lossless, and the smaller acceptable result wins.
+All trials reuse the already-resized pixels; nothing is decoded again.
+"""
+
+import io
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import numpy as np
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+ENCODE_MODES = ("fixed", "target_size", "quality_floor")
+
+# SSIM is measured on a downscaled luma copy; larger adds cost, not accuracy
+SSIM_MAX_SIDE = 512
+
+
+class AdaptiveWebPEncoder:
+    """
+    Per-image WebP encoder with quality search.
+
+    Search trials run at a faster WebP method (search_method); the final
+    encode uses method 6, which is normally smaller than the trial at the
+    same quality. If it is not, the trial bytes are written instead, so a
+    size target found during the search always holds.
+    """
+
+    def __init__(self, image_config: Optional[dict] = None):
+        image_config = image_config or {}
+        enc = image_config.get("adaptive_encoding", {})
+
+        self.mode = enc.get("mode", "fixed")
+        self.target_kb = enc.get("target_kb", 300)
+        self.ssim_floor = enc.get("ssim_floor", 0.985)
+        self.min_quality = enc.get("min_quality", 50)
+        self.max_quality = enc.get("max_quality", 95)
+        self.allow_lossless = enc.get("allow_lossless", True)
+        self.search_method = enc.get("search_method", 4)
+
+    def settings(self, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Effective settings after per-image overrides.
+
+        Args:
+            options: process_image options; may contain encode_mode,
+                target_kb and ssim_floor
+
+        Returns:
+            Dict of settings (also used in processing-cache keys)
+        """
+        options = options or {}
+        mode = options.get("encode_mode", self.mode)
+        if mode not in ENCODE_MODES:
+            logger.warning(f"Unknown encode_mode '{mode}', using fixed quality")
+            mode = "fixed"
+
+        settings = {"mode": mode}
+        if mode != "fixed":
+            settings.update({
+                "target_kb": options.get("target_kb", self.target_kb),
+                "ssim_floor": options.get("ssim_floor", self.ssim_floor),
+                "min_quality": self.min_quality,
+                "max_quality": self.max_quality,
+                "allow_lossless": self.allow_lossless
+            })
+        return settings
+
+    def save(
+        self,
+        img: Image.Image,
+        output_path: Path,
+        quality: int,
+        options: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Encode img to output_path as WebP according to the effective mode.
+
+        Args:
+            img: RGB image, already resized
+            output_path: Destination .webp path
+            quality: Fixed quality (used by "fixed" mode and as the savings baseline)
+            options: Per-image overrides (see settings())
+
+        Returns:
+            Dict with encode_mode, encode_choice, encode_quality,
+            content_class and bytes_saved (vs. the fixed quality)
+        """
+        settings = self.settings(options)
+
+        if settings["mode"] == "fixed":
+            img.save(output_path, format="WEBP", quality=quality, method=6, optimize=True)
+            return {
+                "encode_mode": "fixed",
+                "encode_choice": "lossy",
+                "encode_quality": quality,
+                "content_class": None,
+                "bytes_saved": 0
+            }
+
+        content_class = classify_content(img)
+        baseline_size = len(self._trial(img, quality))
+
+        if settings["mode"] == "target_size":
+            chosen_quality, chosen_size = self._search_target_size(img, settings["target_kb"] * 1024, settings)
+        else:
+            chosen_quality, chosen_size = self._search_quality_floor(img, settings["ssim_floor"], settings)
+
+        choice = "lossy"
+        if settings["allow_lossless"] and content_class in ("line_art", "few_colors"):
+            lossless_size = len(self._trial(img, lossless=True))
+            fits = (
+                settings["mode"] != "target_size"
+                or lossless_size <= settings["target_kb"] * 1024
+            )
+            if fits and lossless_size <= chosen_size:
+                choice, chosen_size = "lossless", lossless_size
+
+        # Savings compare trials at the same (search) method as the baseline
+        bytes_saved = baseline_size - chosen_size
+
+        buffer = io.BytesIO()
+        if choice == "lossless":
+            img.save(buffer, format="WEBP", lossless=True, quality=100, method=6)
+        else:
+            img.save(buffer, format="WEBP", quality=chosen_quality, method=6)
+        data = buffer.getvalue()
+        if len(data) > chosen_size:
+            data = self._trial(img, chosen_quality, lossless=(choice == "lossless"))
+        Path(output_path).write_bytes(data)
+
+        return {
+            "encode_mode": settings["mode"],
+            "encode_choice": choice,
+            "encode_quality": 100 if choice == "lossless" else chosen_quality,
+            "content_class": content_class,
+            "bytes_saved": bytes_saved
+        }
+
+    def _trial(self, img: Image.Image, quality: int = 100, lossless: bool = False) -> bytes:
+        """Encode to memory at the search method and return the bytes."""
+        buffer = io.BytesIO()
+        if lossless:
+            img.save(buffer, format="WEBP", lossless=True, quality=100, method=self.search_method)
+        else:
+            img.save(buffer, format="WEBP", quality=quality, method=self.search_method)
+        return buffer.getvalue()
+
+    def _search_target_size(self, img: Image.Image, target_bytes: int, settings: dict) -> Tuple[int, int]:
+        """Binary search for the highest quality that fits target_bytes."""
+        low, high = settings["min_quality"], settings["max_quality"]
+        best_quality = low
+        best_size = len(self._trial(img, low))
+
+        if best_size > target_bytes:
+            return best_quality, best_size  # Cannot fit; smallest sensible output
+
+        while low <= high:
+            mid = (low + high) // 2
+            size = len(self._trial(img, mid))
+            if size <= target_bytes:
+                best_quality, best_size = mid, size
+                low = mid + 1
+            else:
+                high = mid - 1
+
+        return best_quality, best_size
+
+    def _search_quality_floor(self, img: Image.Image, ssim_floor: float, settings: dict) -> Tuple[int, int]:
+        """Binary search for the lowest quality whose SSIM meets the floor."""
+        reference = _luma_for_ssim(img)
+        low, high = settings["min_quality"], settings["max_quality"]
+        best_quality = high
+        best_size = None
+
+        while low <= high:
+            mid = (low + high) // 2
+            data = self._trial(img, mid)
+            with Image.open(io.BytesIO(data)) as decoded:
+                score = ssim(reference, _luma_for_ssim(decoded))
+            if score >= ssim_floor:
+                best_quality, best_size = mid, len(data)
+                high = mid - 1
+            else:
+                low = mid + 1
+
+        if best_size is None:
+            best_size = len(self._trial(img, best_quality))
+        return best_quality, best_size
+
+
+def classify_content(img: Image.Image) -> str:
+    """
+    Rough content class used to decide whether lossless is worth trying.
+
+    Returns:
+        "few_colors" (flat graphics), "line_art" (near-monochrome ink on
+        paper) or "photo"
+    """
+    small = img.convert("RGB")
+    small.thumbnail((256, 256))
+
+    colors = small.getcolors(maxcolors=256)
+    if colors is not None:
+        return "few_colors"
+
+    pixels = np.asarray(small, dtype=np.int16)
+    chroma = float((pixels.max(axis=2) - pixels.min(axis=2)).mean())
+    luma = pixels.mean(axis=2)
+    extreme_fraction = float(((luma < 64) | (luma > 200)).mean())
+
+    if chroma < 12 and extreme_fraction > 0.85:
+        return "line_art"
+    return "photo"
+
+
+def _luma_for_ssim(img: Image.Image) -> np.ndarray:
+    """Downscaled float luma plane for SSIM."""
+    gray = img.convert("L")
+    if max(gray.size) > SSIM_MAX_SIDE:
+        gray.thumbnail((SSIM_MAX_SIDE, SSIM_MAX_SIDE), Image.Resampling.BOX)
+    return np.asarray(gray, dtype=np.float64)
+
+
+def _box_mean(values: np.ndarray, size: int) -> np.ndarray:
+    """Mean over size x size windows (valid region) via an integral image."""
+    integral = np.pad(values, ((1, 0), (1, 0))).cumsum(axis=0).cumsum(axis=1)
+    window = (
+        integral[size:, size:] - integral[:-size, size:]
+        - integral[size:, :-size] + integral[:-size, :-size]
+    )
+    return window / (size * size)
+
+
+def ssim(a: np.ndarray, b: np.ndarray, window: int = 7) -> float:
+    """
+    Mean structural similarity of two equally sized luma planes (0-255).
+
+    Uses a uniform window; close to the Gaussian-window reference for the
+    relative comparisons the quality search needs.
+    """
+    if a.shape != b.shape:
+        raise ValueError(f"SSIM shape mismatch: {a.shape} vs {b.shape}")
+    if min(a.shape) < window:
+        return 1.0 if np.array_equal(a, b) else 0.0
+
+    c1 = (0.01 * 255) ** 2
+    c2 = (0.03 * 255) ** 2
+
+    mu_a = _box_mean(a, window)
+    mu_b = _box_mean(b, window)
+    var_a = _box_mean(a * a, window) - mu_a ** 2
+    var_b = _box_mean(b * b, window) - mu_b ** 2
+    cov = _box_mean(a * b, window) - mu_a * mu_b
+
+    numerator = (2 * mu_a * mu_b + c1) * (2 * cov + c2)
+    denominator = (mu_a ** 2 + mu_b ** 2 + c1) * (var_a + var_b + c2)
+    return float((numerator / denominator).mean())
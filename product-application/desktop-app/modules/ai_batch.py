@@ -0,0 +1,436 @@
+#!/usr/bin/env python3
+"""
+AI Batch Module
+Catalog-scale description/valuation generation through the Message Batches API.
+
+Batch requests are processed asynchronously (typically within hours) at
+half the price of interactive calls, which suits onboarding an estate of
+hundreds of items overnight. Prompts are built exactly as for the
+interactive AIEngine calls, so results match what the buttons produce.
+
+Workflow:
+1. submit(): one request per product folder and kind ("description",
+   "valuation"), split into batches under the API's request-size limit.
+   Batch IDs and the custom_id -> folder mapping are persisted under
+   cache/ai_batches so an interrupted run can be resumed.
+2. wait(): poll each batch with exponential backoff until it has ended.
+3. collect(): download results and merge them into each folder's
+   product_info.json.
+
+generate_direct() produces the same results immediately through the
+Messages API instead, in the scheduler's bulk lane so that interactive
+requests in the same process go first.
+
+For testing without the real API, tools/batch_stub_server.py provides a
+local stand-in for the batch endpoints (pass its URL as base_url).
+"""
+
+import json
+import logging
+import os
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import requests
+
+from .ai_scheduler import PRIORITY_BULK
+from .paths import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+API_BASE_URL = "https://api.anthropic.com"
+ANTHROPIC_VERSION = "2023-06-01"
+
+KINDS = ("description", "valuation")
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp'}
+
+# The API accepts up to 100,000 requests / 256 MB per batch
+MAX_BATCH_REQUESTS = 100000
+DEFAULT_MAX_BATCH_MB = 200
+
+DEFAULT_POLL_INITIAL = 30.0
+DEFAULT_POLL_MAX = 600.0
+POLL_BACKOFF = 1.5
+
+# Recorded as the batch_id of results from generate_direct()
+DIRECT_BATCH_ID = "direct"
+
+
+class BatchAPIError(Exception):
+    """A batch endpoint returned an error response."""
+
+
+class MessageBatchClient:
+    """Minimal client for the Message Batches endpoints."""
+
+    def __init__(
+        self,
+        api_key: str,
+        base_url: str = API_BASE_URL,
+        session: Optional[requests.Session] = None,
+        timeout: float = 300
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.session = session or requests.Session()
+        self.timeout = timeout
+        self.headers = {
+            "x-api-key": api_key,
+            "anthropic-version": ANTHROPIC_VERSION,
+            "content-type": "application/json"
+        }
+
+    def _check(self, response: requests.Response) -> requests.Response:
+        if response.status_code >= 400:
+            raise BatchAPIError(f"Batch API {response.status_code}: {response.text[:300]}")
+        return response
+
+    def create(self, batch_requests: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Submit requests ({custom_id, params}); returns the batch object."""
+        response = self.session.post(
+            f"{self.base_url}/v1/messages/batches",
+            headers=self.headers,
+            json={"requests": batch_requests},
+            timeout=self.timeout
+        )
+        return self._check(response).json()
+
+    def retrieve(self, batch_id: str) -> Dict[str, Any]:
+        """Current batch object (processing_status, request_counts, results_url)."""
+        response = self.session.get(
+            f"{self.base_url}/v1/messages/batches/{batch_id}",
+            headers=self.headers,
+            timeout=self.timeout
+        )
+        return self._check(response).json()
+
+    def results(self, batch: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        """Stream the JSONL results of an ended batch, one entry per request."""
+        url = batch.get("results_url") or f"{self.base_url}/v1/messages/batches/{batch['id']}/results"
+        response = self._check(self.session.get(url, headers=self.headers, timeout=self.timeout, stream=True))
+        try:
+            for line in response.iter_lines():
+                if line:
+                    yield json.loads(line)
+        finally:
+            response.close()
+
+
+class BatchJobStore:
+    """One JSON record per submitted batch: its ID, status and request mapping."""
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = Path(root) if root else CACHE_DIR / "ai_batches"
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, batch_id: str) -> Path:
+        return self.root / f"{batch_id}.json"
+
+    def save(self, record: Dict[str, Any]) -> None:
+        _write_json_atomic(self._path(record["id"]), record)
+
+    def load(self, batch_id: str) -> Dict[str, Any]:
+        with open(self._path(batch_id), encoding="utf-8") as f:
+            return json.load(f)
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """Records whose results have not been collected yet, oldest first."""
+        records = []
+        for path in sorted(self.root.glob("*.json")):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    record = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Skipping unreadable batch record {path.name}: {e}")
+                continue
+            if not record.get("collected"):
+                records.append(record)
+        return sorted(records, key=lambda r: r.get("submitted", ""))
+
+
+def _write_json_atomic(path: Path, data: Dict[str, Any]) -> None:
+    """Write JSON via a temporary file so a crash never leaves a truncated file."""
+    fd, tmp = tempfile.mkstemp(dir=str(path.parent), suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, path)
+    except Exception:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def load_product_data(folder: Path) -> Dict[str, Any]:
+    """product_data for a product folder, from product_info.json plus its images."""
+    info_file = folder / "product_info.json"
+    info: Dict[str, Any] = {}
+    if info_file.exists():
+        with open(info_file, encoding="utf-8") as f:
+            info = json.load(f)
+
+    names = info.get("images") or sorted(
+        p.name for p in folder.iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS
+    )
+    images = [str(folder / name) for name in names if (folder / name).exists()]
+    data = {key: info[key] for key in (
+        "title", "category", "subcategory", "condition", "era", "origin",
+        "description", "notes", "known_sales", "provenance"
+    ) if info.get(key)}
+    data["images"] = images
+    return data
+
+
+class BulkGenerator:
+    """
+    Submits, tracks and collects AIEngine prompts as Message Batches.
+
+    Example:
+        bulk = BulkGenerator(AIEngine(config))
+        batch_ids = bulk.submit(product_folders)
+        bulk.wait_and_collect(batch_ids)   # or later: bulk.resume()
+    """
+
+    def __init__(
+        self,
+        engine,
+        client: Optional[MessageBatchClient] = None,
+        store: Optional[BatchJobStore] = None,
+        max_batch_bytes: int = DEFAULT_MAX_BATCH_MB * 1024 * 1024,
+        poll_initial: float = DEFAULT_POLL_INITIAL,
+        poll_max: float = DEFAULT_POLL_MAX
+    ):
+        self.engine = engine
+        self.client = client or MessageBatchClient(engine.api_key, session=engine.http.session)
+        self.store = store or BatchJobStore()
+        self.max_batch_bytes = max_batch_bytes
+        self.poll_initial = poll_initial
+        self.poll_max = poll_max
+
+    @classmethod
+    def from_config(cls, engine, config: dict, **kwargs) -> "BulkGenerator":
+        """Build with ai.batch {base_url, max_batch_mb, poll_initial_seconds, poll_max_seconds}."""
+        batch_config = config.get("ai", {}).get("batch", {})
+        client = kwargs.pop("client", None) or MessageBatchClient(
+            engine.api_key, base_url=batch_config.get("base_url", API_BASE_URL),
+            session=engine.http.session
+        )
+        return cls(
+            engine,
+            client=client,
+            max_batch_bytes=int(batch_config.get("max_batch_mb", DEFAULT_MAX_BATCH_MB)) * 1024 * 1024,
+            poll_initial=float(batch_config.get("poll_initial_seconds", DEFAULT_POLL_INITIAL)),
+            poll_max=float(batch_config.get("poll_max_seconds", DEFAULT_POLL_MAX)),
+            **kwargs
+        )
+
+    def build_request(self, product_data: Dict[str, Any], kind: str) -> Dict[str, Any]:
+        """Batch params for one product and kind, using the interactive prompts."""
+        if kind == "description":
+            messages, system = self.engine._description_request(product_data)
+        elif kind == "valuation":
+            messages, system = self.engine._valuation_request(product_data)
+        else:
+            raise ValueError(f"Unknown batch kind: {kind}")
+        return self.engine._build_payload(messages, system)
+
+    def submit(self, folders: List[str], kinds=KINDS) -> List[str]:
+        """
+        Submit every (folder, kind) request, split into size-limited batches.
+
+        Returns:
+            IDs of the submitted batches (also persisted in the store)
+        """
+        self.engine._check_api_key()
+        batch_ids: List[str] = []
+        chunk: List[Dict[str, Any]] = []
+        mapping: Dict[str, Dict[str, str]] = {}
+        chunk_bytes = 0
+
+        def flush() -> None:
+            nonlocal chunk, mapping, chunk_bytes
+            if not chunk:
+                return
+            batch = self.client.create(chunk)
+            self.store.save({
+                "id": batch["id"],
+                "submitted": datetime.now().isoformat(),
+                "status": batch.get("processing_status", "in_progress"),
+                "requests": mapping,
+                "collected": False
+            })
+            logger.info(f"Submitted batch {batch['id']} with {len(chunk)} requests ({chunk_bytes / 1e6:.1f} MB)")
+            batch_ids.append(batch["id"])
+            chunk, mapping, chunk_bytes = [], {}, 0
+
+        for index, folder in enumerate(folders):
+            folder_path = Path(folder)
+            product_data = load_product_data(folder_path)
+            if not product_data["images"]:
+                logger.warning(f"Skipping {folder_path.name}: no images")
+                continue
+            for kind in kinds:
+                custom_id = f"p{index:05d}-{kind}"
+                entry = {"custom_id": custom_id, "params": self.build_request(product_data, kind)}
+                size = len(json.dumps(entry))
+                if chunk and (chunk_bytes + size > self.max_batch_bytes or len(chunk) >= MAX_BATCH_REQUESTS):
+                    flush()
+                chunk.append(entry)
+                mapping[custom_id] = {"folder": str(folder_path), "kind": kind}
+                chunk_bytes += size
+        flush()
+        return batch_ids
+
+    def wait(
+        self,
+        batch_id: str,
+        timeout: Optional[float] = None,
+        sleep: Callable[[float], None] = time.sleep
+    ) -> Dict[str, Any]:
+        """
+        Poll until the batch has ended, backing off from poll_initial to poll_max.
+
+        Raises:
+            TimeoutError: if timeout seconds pass first
+        """
+        start = time.monotonic()
+        delay = self.poll_initial
+        while True:
+            batch = self.client.retrieve(batch_id)
+            status = batch.get("processing_status")
+            if status == "ended":
+                return batch
+            if timeout is not None and time.monotonic() - start + delay > timeout:
+                raise TimeoutError(f"Batch {batch_id} still {status} after {timeout:.0f}s")
+            logger.info(f"Batch {batch_id} {status} {batch.get('request_counts', {})}; next check in {delay:.0f}s")
+            sleep(delay)
+            delay = min(self.poll_max, delay * POLL_BACKOFF)
+
+    def collect(self, batch_id: str, batch: Optional[Dict[str, Any]] = None) -> Dict[str, int]:
+        """
+        Write an ended batch's results into each product_info.json.
+
+        Returns:
+            {"succeeded", "failed"} counts
+        """
+        record = self.store.load(batch_id)
+        batch = batch or self.client.retrieve(batch_id)
+        counts = {"succeeded": 0, "failed": 0}
+
+        for entry in self.client.results(batch):
+            target = record["requests"].get(entry.get("custom_id"))
+            if not target:
+                continue
+            result = entry.get("result", {})
+            parsed = None
+            if result.get("type") == "succeeded":
+                content = result.get("message", {}).get("content") or [{}]
+                parsed = self.engine._parse_json_response(content[0].get("text", ""))
+            if parsed:
+                self._write_result(Path(target["folder"]), target["kind"], parsed, batch_id)
+                counts["succeeded"] += 1
+            else:
+                reason = result.get("error", {}).get("error", {}).get("message") or result.get("type", "unparseable")
+                self._write_status(Path(target["folder"]), target["kind"], f"failed: {reason}", batch_id)
+                counts["failed"] += 1
+
+        record.update(status="ended", collected=True, collected_at=datetime.now().isoformat(), counts=counts)
+        self.store.save(record)
+        logger.info(f"Collected batch {batch_id}: {counts}")
+        return counts
+
+    def wait_and_collect(self, batch_ids: List[str], timeout: Optional[float] = None) -> Dict[str, int]:
+        """wait() then collect() each batch; returns summed counts."""
+        totals = {"succeeded": 0, "failed": 0}
+        for batch_id in batch_ids:
+            counts = self.collect(batch_id, self.wait(batch_id, timeout=timeout))
+            for key in totals:
+                totals[key] += counts[key]
+        return totals
+
+    def resume(self, timeout: Optional[float] = None) -> Dict[str, int]:
+        """Finish every persisted batch whose results were not collected yet."""
+        return self.wait_and_collect([r["id"] for r in self.store.pending()], timeout=timeout)
+
+    def generate_direct(self, folders: List[str], kinds=KINDS, priority: int = PRIORITY_BULK) -> Dict[str, int]:
+        """
+        Generate every (folder, kind) now with regular Messages API calls.
+
+        Full price but no batch turnaround; calls run concurrently (up to
+        ai.max_concurrent_requests) in the given scheduler lane. Results are
+        merged into product_info.json exactly as collect() does.
+
+        Returns:
+            {"succeeded", "failed"} counts
+        """
+        self.engine._check_api_key()
+
+        def run(folder: str) -> Dict[str, int]:
+            folder_path = Path(folder)
+            product_data = load_product_data(folder_path)
+            counts = {"succeeded": 0, "failed": 0}
+            if not product_data["images"]:
+                logger.warning(f"Skipping {folder_path.name}: no images")
+                return counts
+            for kind in kinds:
+                if kind == "description":
+                    messages, system = self.engine._description_request(product_data)
+                else:
+                    messages, system = self.engine._valuation_request(product_data)
+                result = self.engine._make_api_request(messages, system, priority=priority)
+                parsed = None
+                if result and result.get("success"):
+                    parsed = self.engine._parse_json_response(result.get("text", ""))
+                if parsed:
+                    self._write_result(folder_path, kind, parsed, DIRECT_BATCH_ID)
+                    counts["succeeded"] += 1
+                else:
+                    reason = (result or {}).get("error") or "no usable response"
+                    self._write_status(folder_path, kind, f"failed: {reason}", DIRECT_BATCH_ID)
+                    counts["failed"] += 1
+            return counts
+
+        totals = {"succeeded": 0, "failed": 0}
+        with ThreadPoolExecutor(max_workers=self.engine.max_concurrent_requests,
+                                thread_name_prefix="ai-bulk") as pool:
+            for counts in pool.map(run, folders):
+                for key in totals:
+                    totals[key] += counts[key]
+        logger.info(f"Direct generation finished: {totals}")
+        return totals
+
+    def _write_result(self, folder: Path, kind: str, parsed: Dict[str, Any], batch_id: str) -> None:
+        def update(info: Dict[str, Any]) -> None:
+            if kind == "valuation":
+                info["valuation"] = self.engine._normalize_valuation(parsed)
+            else:
+                for key in ("description", "description_html", "condition_notes", "materials",
+                            "seo_title", "seo_description", "keywords"):
+                    if parsed.get(key):
+                        info[key] = parsed[key]
+                if not info.get("title") and parsed.get("suggested_title"):
+                    info["title"] = parsed["suggested_title"]
+                if parsed.get("valuation") and "valuation" not in info:
+                    info["valuation"] = parsed["valuation"]
+            info.setdefault("ai_batch", {})[kind] = {"status": "succeeded", "batch_id": batch_id}
+        self._update_info(folder, update)
+
+    def _write_status(self, folder: Path, kind: str, status: str, batch_id: str) -> None:
+        self._update_info(
+            folder,
+            lambda info: info.setdefault("ai_batch", {}).__setitem__(kind, {"status": status, "batch_id": batch_id})
+        )
+
+    @staticmethod
+    def _update_info(folder: Path, update: Callable[[Dict[str, Any]], None]) -> None:
+        info_file = folder / "product_info.json"
+        info: Dict[str, Any] = {}
+        if info_file.exists():
+            with open(info_file, encoding="utf-8") as f:
+                info = json.load(f)
+        update(info)
+        info["updated"] = datetime.now().isoformat()
+        _write_json_atomic(info_file, info)
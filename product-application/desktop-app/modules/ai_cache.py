@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+AI Cache Module
+Disk-backed cache of Claude API responses.
+
+Requests are keyed by the SHA-256 of the model, sampling parameters,
+system prompt and message content, with inline base64 images replaced by
+a hash of their bytes (so the key is small and stable). Responses are
+kept in SQLite with a TTL and a size cap (least recently used first).
+
+Identical requests that arrive while the first one is still in flight
+wait for it and share its result instead of making a second call.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from .paths import CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+# Bump when the request/response format changes
+CACHE_VERSION = 1
+
+DEFAULT_TTL_HOURS = 168
+DEFAULT_MAX_SIZE_MB = 64
+
+
+def _hash_images(value: Any) -> Any:
+    """Copy of a message structure with base64 image data replaced by its SHA-256."""
+    if isinstance(value, dict):
+        if value.get("type") == "base64" and "data" in value:
+            digest = hashlib.sha256(value["data"].encode("utf-8")).hexdigest()
+            return dict(value, data=f"sha256:{digest}")
+        return {k: _hash_images(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_hash_images(v) for v in value]
+    return value
+
+
+class AIResponseCache:
+    """
+    SQLite-backed response cache with in-flight request deduplication.
+
+    Features:
+    - Content keys (model + parameters + system + messages + image hashes)
+    - TTL expiry and LRU eviction once max_bytes is exceeded
+    - Shared results for identical concurrent requests
+    - Hit/miss counters for the current process
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[str] = None,
+        ttl_seconds: float = DEFAULT_TTL_HOURS * 3600,
+        max_bytes: int = DEFAULT_MAX_SIZE_MB * 1024 * 1024
+    ):
+        self.db_path = Path(db_path) if db_path else CACHE_DIR / "ai_responses.sqlite3"
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Dict[str, Any]] = {}
+        self._init_db()
+
+    @classmethod
+    def from_config(cls, config: dict) -> Optional["AIResponseCache"]:
+        """Build the cache from ai.cache, or None when disabled."""
+        cache_config = config.get("ai", {}).get("cache", {})
+        if not cache_config.get("enabled", True):
+            return None
+        try:
+            return cls(
+                db_path=cache_config.get("path"),
+                ttl_seconds=float(cache_config.get("ttl_hours", DEFAULT_TTL_HOURS)) * 3600,
+                max_bytes=int(cache_config.get("max_size_mb", DEFAULT_MAX_SIZE_MB)) * 1024 * 1024
+            )
+        except (OSError, sqlite3.Error) as e:
+            logger.warning(f"AI response cache unavailable: {e}")
+            return None
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        """Short-lived connection per operation (safe across threads); commits on success."""
+        conn = sqlite3.connect(str(self.db_path), timeout=10)
+        try:
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _init_db(self) -> None:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                """CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT,
+                    response TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )"""
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_last_access ON responses(last_access)")
+
+    def make_key(self, model: str, system: Optional[str], messages: list, **params: Any) -> str:
+        """
+        Build the cache key for a request.
+
+        Args:
+            model: Model name
+            system: System prompt (or None)
+            messages: API messages (images may be inline base64)
+            **params: Other parameters that change the output (max_tokens, temperature, ...)
+
+        Returns:
+            Hex key string
+        """
+        material = json.dumps(
+            {
+                "version": CACHE_VERSION,
+                "model": model,
+                "system": system,
+                "messages": _hash_images(messages),
+                "params": params
+            },
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached response for a key, or None if missing or expired."""
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    "SELECT response, created FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row and now - row[1] <= self.ttl_seconds:
+                    conn.execute("UPDATE responses SET last_access = ? WHERE key = ?", (now, key))
+                    self.hits += 1
+                    return json.loads(row[0])
+                if row:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+        except (sqlite3.Error, ValueError) as e:
+            logger.debug(f"AI cache read failed for {key[:12]}: {e}")
+        self.misses += 1
+        return None
+
+    def put(self, key: str, response: Dict[str, Any], model: Optional[str] = None) -> bool:
+        """Store a response (JSON-serializable dict). Returns True if stored."""
+        payload = json.dumps(response, default=str)
+        now = time.time()
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, model, response, size, created, last_access) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, model, payload, len(payload.encode("utf-8")), now, now)
+                )
+                self._evict(conn, now)
+        except sqlite3.Error as e:
+            logger.debug(f"AI cache write failed for {key[:12]}: {e}")
+            return False
+        return True
+
+    def _evict(self, conn: sqlite3.Connection, now: float) -> None:
+        """Drop expired entries, then least recently used ones until under max_bytes."""
+        conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl_seconds,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in conn.execute("SELECT key, size FROM responses ORDER BY last_access").fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+
+    def fetch(
+        self,
+        key: str,
+        call: Callable[[], Optional[Dict[str, Any]]],
+        bypass: bool = False,
+        model: Optional[str] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached response for key, or run call() and cache its result.
+
+        Only responses with success=True are stored. Identical concurrent
+        requests share a single call() (bypass included).
+
+        Args:
+            key: Key from make_key()
+            call: Function making the actual API request
+            bypass: Skip the lookup (the fresh response still replaces the entry)
+            model: Stored alongside the entry for inspection
+
+        Returns:
+            Response dict; cache hits carry "cached": True
+        """
+        if not bypass:
+            cached = self.get(key)
+            if cached is not None:
+                return dict(cached, cached=True)
+
+        with self._lock:
+            flight = self._in_flight.get(key)
+            owner = flight is None
+            if owner:
+                flight = {"event": threading.Event(), "result": None}
+                self._in_flight[key] = flight
+
+        if not owner:
+            flight["event"].wait()
+            self.shared += 1
+            return flight["result"]
+
+        try:
+            result = call()
+            if result and result.get("success"):
+                self.put(key, result, model)
+            flight["result"] = result
+            return result
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            flight["event"].set()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        try:
+            with self._connect() as conn:
+                entries, size = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+                ).fetchone()
+        except sqlite3.Error:
+            entries, size = 0, 0
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "shared": self.shared,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": entries,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes
+        }
+
+    def clear(self) -> None:
+        """Delete every cached response."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM responses")
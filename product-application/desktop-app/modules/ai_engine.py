@@ -9,11 +9,13 @@ CRITICAL: This module includes robust SSL/TLS certificate handling for Windows.
 import os
 import sys
 import json
-import base64
 import re
+import time
 import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable
 
 # ============================================
 # CRITICAL: SSL/TLS Certificate Setup
@@ -113,6 +115,30 @@ from modules.env_loader import get_required_env, get_env
 # Import conservative valuation prompts
 from modules.valuation_prompt import VALUATION_SYSTEM_PROMPT, DESCRIPTION_SYSTEM_PROMPT
 
+# Disk cache of API responses
+from modules.ai_cache import AIResponseCache
+
+# Downsized, session-cached image payloads
+from modules.ai_image_encoder import get_image_encoder, measure_request
+
+# Prompt-caching markers and token usage accounting
+from modules.ai_usage import UsageTracker, add_cache_markers, usage_from_response
+
+# Streamed responses (SDK and raw SSE)
+from modules.ai_streaming import stream_sdk, stream_http
+from modules.incremental_json import IncrementalJSONParser
+
+# Rate-limit-aware admission and retries (shared by all engines)
+from modules.ai_scheduler import (
+    PRIORITY_INTERACTIVE, RETRY_STATUSES, estimate_input_tokens, get_scheduler, parse_retry_after
+)
+
+# Pooled keep-alive connections (SDK and HTTP fallbacks)
+from modules.ai_http import get_http_transport
+
+# Single-request full listing
+from modules.listing_schema import LISTING_TEMPLATE, SECTIONS as LISTING_SECTIONS, validate_listing
+
 # Try to import Anthropic SDK
 try:
     from anthropic import Anthropic
@@ -140,9 +166,17 @@ class AIEngine:
     - SEO title and meta generation
     - Category-specific templates
     - Image analysis for auto-filling forms
+    - Disk cache of responses for repeated identical requests
+    - Prompt caching of system prompts and images, with token usage totals
+    - Streamed responses with cancellation
+    - Concurrent "generate all" of a complete listing, or a single-request
+      full listing with per-section fallbacks
+    - Requests admitted under the account's rate limits, retried on 429
+    - Pooled keep-alive connections; use get_ai_engine() for the
+      app-wide instance
     """
     
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, priority: int = PRIORITY_INTERACTIVE):
         self.config = config
         self.ai_config = config.get("ai", {})
         
@@ -161,6 +195,7 @@ class AIEngine:
         
         self.model = self.ai_config.get("model", "claude-sonnet-4-20250514")
         self.max_tokens = self.ai_config.get("max_tokens", 4000)
+        self.max_concurrent_requests = max(1, int(self.ai_config.get("max_concurrent_requests", 4)))
         
         # Temperature from centralized env loader or config
         temp_str = get_env("AI_TEMPERATURE")
@@ -177,31 +212,140 @@ class AIEngine:
         from modules.paths import TEMPLATES_DIR
         self.templates_dir = TEMPLATES_DIR
         
-        # Initialize SDK client if available
+        # Connections are pooled per process and kept alive between requests
+        self.http = get_http_transport(config)
+        
+        # Initialize SDK client if available (retries are left to the scheduler)
         self.client = None
         if ANTHROPIC_SDK_AVAILABLE and self.api_key:
             try:
-                self.client = Anthropic(api_key=self.api_key)
+                self.client = Anthropic(
+                    api_key=self.api_key,
+                    http_client=self.http.sdk_http_client(),
+                    max_retries=0
+                )
                 logger.info("Anthropic SDK client initialized")
             except Exception as e:
                 logger.warning(f"Failed to initialize Anthropic SDK: {e}")
+        
+        # Identical requests (same model, prompts and image bytes) are
+        # answered from disk; pass use_cache=False to force a fresh call
+        self.cache = AIResponseCache.from_config(config)
+        
+        # Shared by every engine in the process: each image is encoded once
+        self.image_encoder = get_image_encoder(config)
+        
+        # Server-side prompt caching of the system prompt and product images:
+        # later requests for the same product reuse the cached prefix
+        self.prompt_caching = bool(self.ai_config.get("prompt_caching", True))
+        self.usage = UsageTracker()
+        
+        # Every request waits for rate-limit headroom; interactive calls go
+        # ahead of bulk ones (PRIORITY_BULK, per engine or per call)
+        self.scheduler = get_scheduler(config)
+        self.priority = priority
     
     def _make_api_request(
         self,
         messages: list,
-        system: str = None
+        system: str = None,
+        use_cache: bool = True,
+        priority: Optional[int] = None
     ) -> Optional[Dict]:
         """
-        Make API request with robust error handling and SSL fallbacks.
-        Tries SDK first, falls back to direct HTTP, then to unverified SSL.
+        Make an API request, answered from the response cache when possible.
         
         Args:
             messages: List of message dicts for the API
             system: Optional system prompt
+            use_cache: False skips the cache lookup (the fresh response
+                still replaces the cached one)
+            priority: Scheduler lane for this call (PRIORITY_BULK for
+                background work); defaults to the engine's priority
             
         Returns:
-            Dict with success status and text, or None on failure
+            Dict with success status, text, token usage and request_stats
+            (image payload sizes; cached=True on a cache hit), or None on failure
         """
+        request_stats = self._measure_request(messages)
+        
+        def fresh() -> Optional[Dict]:
+            return self._record_usage(
+                self._scheduled(lambda: self._call_api(messages, system), messages, system, priority)
+            )
+        
+        if not self.cache:
+            return _with_request_stats(fresh(), request_stats)
+        
+        key = self._cache_key(messages, system)
+        result = self.cache.fetch(
+            key,
+            fresh,
+            bypass=not use_cache,
+            model=self.model
+        )
+        if result and result.get("cached"):
+            logger.info("API response served from cache")
+        return _with_request_stats(result, request_stats)
+    
+    def _scheduled(
+        self,
+        call: Callable[[], Optional[Dict]],
+        messages: list,
+        system: str = None,
+        priority: Optional[int] = None
+    ) -> Optional[Dict]:
+        """Run an API call through the rate-limit scheduler (admission and retries)."""
+        return self.scheduler.run(
+            call,
+            input_tokens=estimate_input_tokens(messages, system),
+            output_tokens=min(self.max_tokens, self.scheduler.expected_output_tokens),
+            priority=self.priority if priority is None else priority
+        )
+    
+    @staticmethod
+    def _retryable_error(status: int, retry_after: Any, detail: str) -> Dict[str, Any]:
+        """Failure result the scheduler retries (rate limited / overloaded / 5xx)."""
+        return {
+            "success": False,
+            "error": f"API returned {status}: {detail[:200]}",
+            "status_code": status,
+            "retry_after": parse_retry_after(retry_after)
+        }
+    
+    def _measure_request(self, messages: list) -> Dict[str, int]:
+        """Log and return the image payload size of a request (see measure_request)."""
+        stats = measure_request(messages, self.image_encoder)
+        if stats["images"]:
+            logger.info(
+                f"AI request images: {stats['images']}, "
+                f"{stats['original_image_bytes'] / 1024:.0f} KB original -> "
+                f"{stats['image_bytes'] / 1024:.0f} KB sent"
+            )
+        return stats
+    
+    def _cache_key(self, messages: list, system: str = None) -> str:
+        """Response cache key for a request (shared by streamed and plain calls)."""
+        return self.cache.make_key(
+            self.model, system, messages,
+            max_tokens=self.max_tokens, temperature=self.temperature
+        )
+    
+    def _record_usage(self, result: Optional[Dict]) -> Optional[Dict]:
+        """Log and accumulate the token usage of a fresh API response."""
+        usage = (result or {}).get("usage")
+        if usage:
+            self.usage.add(usage)
+            logger.info(
+                f"AI usage: {usage['input_tokens']} input, "
+                f"{usage['cache_read_input_tokens']} cache read, "
+                f"{usage['cache_creation_input_tokens']} cache write, "
+                f"{usage['output_tokens']} output tokens"
+            )
+        return result
+    
+    def _check_api_key(self) -> None:
+        """Raise ValueError with setup instructions when no API key is configured."""
         if not self.api_key:
             raise ValueError(
                 "Anthropic API key not configured.\n\n"
@@ -209,8 +353,11 @@ class AIEngine:
                 "  Location: C:\\Users\\james\\kollect-it\\.env.local\n"
                 "  ANTHROPIC_API_KEY=sk-ant-api03-your-key-here"
             )
-        
-        # Build request payload
+    
+    def _build_payload(self, messages: list, system: str = None) -> Dict[str, Any]:
+        """Request payload (with prompt-caching markers when enabled)."""
+        if self.prompt_caching:
+            system, messages = add_cache_markers(system, messages)
         payload = {
             "model": self.model,
             "max_tokens": self.max_tokens,
@@ -219,6 +366,36 @@ class AIEngine:
         }
         if system:
             payload["system"] = system
+        return payload
+    
+    def _api_headers(self) -> Dict[str, str]:
+        """Headers for direct HTTP requests."""
+        return {
+            "Content-Type": "application/json",
+            "x-api-key": self.api_key,
+            "anthropic-version": "2023-06-01"
+        }
+    
+    def _call_api(
+        self,
+        messages: list,
+        system: str = None
+    ) -> Optional[Dict]:
+        """
+        Make API request with robust error handling and SSL fallbacks.
+        Tries SDK first, falls back to direct HTTP, then to unverified SSL.
+        
+        Args:
+            messages: List of message dicts for the API
+            system: Optional system prompt
+            
+        Returns:
+            Dict with success status, text and usage, or None on failure.
+            Rate-limit and server errors carry status_code and retry_after
+            (see RequestScheduler.run)
+        """
+        self._check_api_key()
+        payload = self._build_payload(messages, system)
         
         # ========================================
         # Method 1: Try Anthropic SDK
@@ -226,45 +403,33 @@ class AIEngine:
         if self.client:
             try:
                 logger.debug(f"Trying Anthropic SDK with model: {self.model}")
-                if system:
-                    response = self.client.messages.create(
-                        model=self.model,
-                        max_tokens=self.max_tokens,
-                        temperature=self.temperature,
-                        system=system,
-                        messages=messages
-                    )
-                else:
-                    response = self.client.messages.create(
-                        model=self.model,
-                        max_tokens=self.max_tokens,
-                        temperature=self.temperature,
-                        messages=messages
-                    )
+                response = self.client.messages.create(**payload)
                 
                 if response.content:
                     text = response.content[0].text
                     logger.info("API call successful via SDK")
-                    return {"success": True, "text": text}
+                    return {"success": True, "text": text, "usage": usage_from_response(response.usage)}
                     
             except Exception as e:
+                status = getattr(e, "status_code", None)
+                if status in RETRY_STATUSES:
+                    # Same account limits over HTTP; let the scheduler back off
+                    headers = getattr(getattr(e, "response", None), "headers", {}) or {}
+                    logger.warning(f"SDK request got {status}")
+                    return self._retryable_error(status, headers.get("retry-after"), str(e))
                 logger.warning(f"SDK request failed: {e}, trying direct HTTP...")
         
         # ========================================
         # Method 2: Direct HTTP with SSL verification
         # ========================================
-        headers = {
-            "Content-Type": "application/json",
-            "x-api-key": self.api_key,
-            "anthropic-version": "2023-06-01"
-        }
+        headers = self._api_headers()
         
         try:
             # Use SSL cert path if available
             verify_setting = SSL_CERT_PATH if (SSL_CERT_PATH and os.path.exists(SSL_CERT_PATH)) else True
             
             logger.debug(f"Trying direct HTTP with verify={verify_setting}")
-            response = requests.post(
+            response = self.http.session.post(
                 self.api_url,
                 headers=headers,
                 json=payload,
@@ -277,10 +442,15 @@ class AIEngine:
                 if data.get("content"):
                     text = data["content"][0].get("text", "")
                     logger.info("API call successful via requests (verified SSL)")
-                    return {"success": True, "text": text}
+                    return {"success": True, "text": text, "usage": usage_from_response(data.get("usage"))}
             elif response.status_code == 401:
                 logger.error(f"API authentication failed (401). Check ANTHROPIC_API_KEY in main repo .env.local")
                 return {"success": False, "error": "Invalid API key"}
+            elif response.status_code in RETRY_STATUSES:
+                logger.warning(f"API returned {response.status_code}")
+                return self._retryable_error(
+                    response.status_code, response.headers.get("retry-after"), response.text
+                )
             else:
                 logger.warning(f"API returned {response.status_code}: {response.text[:200]}")
                 
@@ -303,7 +473,7 @@ class AIEngine:
         
         try:
             logger.warning("Trying API call without SSL verification (explicitly allowed in config)")
-            response = requests.post(
+            response = self.http.session.post(
                 self.api_url,
                 headers=headers,
                 json=payload,
@@ -316,10 +486,15 @@ class AIEngine:
                 if data.get("content"):
                     text = data["content"][0].get("text", "")
                     logger.warning("API call succeeded with SSL verification DISABLED")
-                    return {"success": True, "text": text}
+                    return {"success": True, "text": text, "usage": usage_from_response(data.get("usage"))}
             elif response.status_code == 401:
                 logger.error("API authentication failed (401)")
                 return {"success": False, "error": "Invalid API key"}
+            elif response.status_code in RETRY_STATUSES:
+                logger.warning(f"API returned {response.status_code}")
+                return self._retryable_error(
+                    response.status_code, response.headers.get("retry-after"), response.text
+                )
             else:
                 logger.error(f"API error {response.status_code}: {response.text[:200]}")
                 
@@ -328,40 +503,107 @@ class AIEngine:
         
         return None
     
-    def _encode_image(self, image_path: str) -> Optional[Dict]:
-        """Encode image to base64 for API."""
-        try:
-            path = Path(image_path)
-            if not path.exists():
-                logger.warning(f"Image not found: {image_path}")
-                return None
-            
-            # Determine media type
-            suffix = path.suffix.lower()
-            media_types = {
-                '.jpg': 'image/jpeg',
-                '.jpeg': 'image/jpeg',
-                '.png': 'image/png',
-                '.gif': 'image/gif',
-                '.webp': 'image/webp'
-            }
-            media_type = media_types.get(suffix, 'image/jpeg')
+    def stream_api_request(
+        self,
+        messages: list,
+        system: str = None,
+        on_delta: Optional[Callable[[str], None]] = None,
+        should_cancel: Optional[Callable[[], bool]] = None,
+        use_cache: bool = True,
+        priority: Optional[int] = None
+    ) -> Optional[Dict]:
+        """
+        Streaming variant of _make_api_request: text deltas are passed to
+        on_delta as they are generated.
+        
+        Tries the SDK stream first, then the raw HTTP SSE endpoint (verified
+        SSL, or unverified only when allow_insecure_ssl is set). A transport
+        failure only falls through before the first delta. A cached response
+        is delivered as a single delta.
+        
+        Args:
+            messages: List of message dicts for the API
+            system: Optional system prompt
+            on_delta: Called with each new piece of text
+            should_cancel: Polled between deltas; True closes the stream
+            use_cache: False skips the response cache lookup
+            priority: Scheduler lane for this call (default: the engine's)
             
-            # Read and encode
-            with open(path, 'rb') as f:
-                data = base64.b64encode(f.read()).decode('utf-8')
+        Returns:
+            Dict with success, text, usage, cancelled and request_stats
+            (cached=True on a cache hit), or None on failure
+        """
+        self._check_api_key()
+        request_stats = self._measure_request(messages)
+        
+        key = self._cache_key(messages, system) if self.cache else None
+        if key and use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                logger.info("API response served from cache")
+                if on_delta:
+                    on_delta(cached.get("text", ""))
+                return dict(cached, cached=True, request_stats=request_stats)
+        
+        payload = self._build_payload(messages, system)
+        emitted = []
+        
+        def forward(delta: str) -> None:
+            emitted.append(delta)
+            if on_delta:
+                on_delta(delta)
+        
+        def attempt() -> Optional[Dict]:
+            if self.client:
+                try:
+                    logger.debug(f"Streaming via Anthropic SDK with model: {self.model}")
+                    return stream_sdk(self.client, payload, forward, should_cancel)
+                except Exception as e:
+                    if emitted:
+                        logger.error(f"SDK stream failed mid-response: {e}")
+                        return {"success": False, "error": str(e), "text": "".join(emitted)}
+                    status = getattr(e, "status_code", None)
+                    if status in RETRY_STATUSES:
+                        headers = getattr(getattr(e, "response", None), "headers", {}) or {}
+                        return self._retryable_error(status, headers.get("retry-after"), str(e))
+                    logger.warning(f"SDK stream failed: {e}, trying direct HTTP...")
             
-            return {
-                "type": "image",
-                "source": {
-                    "type": "base64",
-                    "media_type": media_type,
-                    "data": data
-                }
-            }
-        except Exception as e:
-            logger.error(f"Failed to encode image {image_path}: {e}")
+            verify_setting = SSL_CERT_PATH if (SSL_CERT_PATH and os.path.exists(SSL_CERT_PATH)) else True
+            attempts = [verify_setting]
+            if self.config.get("ai", {}).get("allow_insecure_ssl", False):
+                attempts.append(False)
+            for verify in attempts:
+                try:
+                    return stream_http(
+                        self.api_url, self._api_headers(), payload,
+                        forward, should_cancel, verify=verify, session=self.http.session
+                    )
+                except requests.exceptions.RequestException as e:
+                    if emitted:
+                        return {"success": False, "error": str(e), "text": "".join(emitted)}
+                    logger.warning(f"HTTP stream failed (verify={verify}): {e}")
+            return None
+        
+        # Rate-limit replies arrive before any text, so retries never repeat deltas
+        result = self._scheduled(attempt, messages, system, priority)
+        if result is None:
+            logger.error("All streaming methods failed")
             return None
+        if result.get("cancelled"):
+            logger.info(f"AI stream cancelled after {len(result['text'])} chars")
+        elif result.get("success"):
+            logger.info("API stream completed")
+            self._record_usage(result)
+            if key:
+                self.cache.put(key, result, self.model)
+        return _with_request_stats(result, request_stats)
+    
+    def _encode_image(self, image_path: str) -> Optional[Dict]:
+        """
+        Encode image for the API: downsized to the model's long-edge limit,
+        re-encoded compactly, and cached per image content for the session.
+        """
+        return self.image_encoder.encode(image_path)
     
     def _parse_json_response(self, text: str) -> Optional[Dict]:
         """Parse JSON from AI response, handling markdown fences."""
@@ -431,7 +673,8 @@ class AIEngine:
     def suggest_fields(
         self,
         product_data: Dict[str, Any],
-        categories: Dict[str, Any]
+        categories: Dict[str, Any],
+        use_cache: bool = True
     ) -> Optional[Dict[str, Any]]:
         """
         Analyze images and suggest ALL form fields for auto-fill.
@@ -440,6 +683,7 @@ class AIEngine:
         Args:
             product_data: Dict with 'images' key containing list of image paths
             categories: Dict of available categories from config
+            use_cache: False forces a fresh API call
             
         Returns:
             Dict with all suggested form fields:
@@ -447,6 +691,75 @@ class AIEngine:
             - description, seo_title, seo_description, keywords
             - valuation {low, high, recommended}
         """
+        request = self._suggest_fields_request(product_data, categories)
+        if not request:
+            return None
+        messages, system = request
+        
+        result = self._make_api_request(messages, system, use_cache=use_cache)
+        
+        if result and result.get("success"):
+            parsed = self._parse_json_response(result.get("text", ""))
+            if parsed:
+                logger.info("Image analysis completed successfully")
+                return parsed
+            else:
+                logger.warning("Failed to parse analysis response")
+        else:
+            logger.warning("Image analysis API call failed")
+        
+        return None
+    
+    def stream_suggest_fields(
+        self,
+        product_data: Dict[str, Any],
+        categories: Dict[str, Any],
+        on_field: Optional[Callable[[str, Any], None]] = None,
+        should_cancel: Optional[Callable[[], bool]] = None,
+        use_cache: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """
+        suggest_fields with each top-level field reported as soon as it is complete.
+        
+        Args:
+            product_data: Dict with 'images' key containing list of image paths
+            categories: Dict of available categories from config
+            on_field: Called with (key, value) for every completed field, in reply order
+            should_cancel: Polled between deltas; True stops generation
+            use_cache: False forces a fresh API call
+            
+        Returns:
+            Same as suggest_fields; {"cancelled": True, ...fields so far} when cancelled
+        """
+        request = self._suggest_fields_request(product_data, categories)
+        if not request:
+            return None
+        messages, system = request
+        
+        parser = IncrementalJSONParser()
+        
+        def on_delta(delta: str) -> None:
+            for key, value in parser.feed(delta):
+                if on_field:
+                    on_field(key, value)
+        
+        result = self.stream_api_request(
+            messages, system, on_delta=on_delta, should_cancel=should_cancel, use_cache=use_cache
+        )
+        
+        if result and result.get("cancelled"):
+            return dict(parser.fields, cancelled=True)
+        if result and result.get("success"):
+            parsed = self._parse_json_response(result.get("text", "")) or parser.fields
+            if parsed:
+                logger.info("Image analysis streamed successfully")
+                return parsed
+        
+        logger.warning("Image analysis API call failed")
+        return None
+    
+    def _suggest_fields_request(self, product_data: Dict[str, Any], categories: Dict[str, Any]):
+        """(messages, system prompt) for a field-suggestion request, or None without usable images."""
         images = product_data.get("images", [])
         if not images:
             logger.warning("No images provided for analysis")
@@ -509,21 +822,7 @@ Choose the most appropriate category and subcategory from the provided list."""
         messages = [{"role": "user", "content": content}]
         
         # Use conservative description system prompt for field suggestions
-        system = DESCRIPTION_SYSTEM_PROMPT
-        
-        result = self._make_api_request(messages, system)
-        
-        if result and result.get("success"):
-            parsed = self._parse_json_response(result.get("text", ""))
-            if parsed:
-                logger.info("Image analysis completed successfully")
-                return parsed
-            else:
-                logger.warning("Failed to parse analysis response")
-        else:
-            logger.warning("Image analysis API call failed")
-        
-        return None
+        return messages, DESCRIPTION_SYSTEM_PROMPT
     
     def analyze_images(
         self,
@@ -578,17 +877,68 @@ Respond with valid JSON only."""
     
     def generate_description(
         self,
-        product_data: Dict[str, Any]
+        product_data: Dict[str, Any],
+        use_cache: bool = True
     ) -> Optional[Dict[str, Any]]:
         """
         Generate a comprehensive product description.
         
         Args:
             product_data: Dictionary with product info
+            use_cache: False forces a fresh API call
             
         Returns:
             Dictionary with generated content including description, SEO fields, valuation
         """
+        messages, system = self._description_request(product_data)
+        result = self._make_api_request(messages, system, use_cache=use_cache)
+        
+        if result and result.get("success"):
+            parsed = self._parse_json_response(result.get("text", ""))
+            if parsed:
+                logger.info("Description generated successfully")
+                return parsed
+        
+        logger.warning("Description generation failed")
+        return None
+    
+    def stream_description(
+        self,
+        product_data: Dict[str, Any],
+        on_delta: Optional[Callable[[str], None]] = None,
+        should_cancel: Optional[Callable[[], bool]] = None,
+        use_cache: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """
+        generate_description with the raw JSON reply streamed to on_delta.
+        
+        Args:
+            product_data: Dictionary with product info
+            on_delta: Called with each new piece of the raw reply
+            should_cancel: Polled between deltas; True stops generation
+            use_cache: False forces a fresh API call
+            
+        Returns:
+            Same as generate_description; {"cancelled": True} when cancelled
+        """
+        messages, system = self._description_request(product_data)
+        result = self.stream_api_request(
+            messages, system, on_delta=on_delta, should_cancel=should_cancel, use_cache=use_cache
+        )
+        
+        if result and result.get("cancelled"):
+            return {"cancelled": True}
+        if result and result.get("success"):
+            parsed = self._parse_json_response(result.get("text", ""))
+            if parsed:
+                logger.info("Description streamed successfully")
+                return parsed
+        
+        logger.warning("Description generation failed")
+        return None
+    
+    def _description_request(self, product_data: Dict[str, Any]):
+        """(messages, system prompt) for a description request."""
         category = product_data.get("category", "collectibles")
         template = self._load_template(category)
         
@@ -638,22 +988,12 @@ Respond with valid JSON only."""
         messages = [{"role": "user", "content": content}]
         
         # Use conservative description system prompt
-        system = DESCRIPTION_SYSTEM_PROMPT
-        
-        result = self._make_api_request(messages, system)
-        
-        if result and result.get("success"):
-            parsed = self._parse_json_response(result.get("text", ""))
-            if parsed:
-                logger.info("Description generated successfully")
-                return parsed
-        
-        logger.warning("Description generation failed")
-        return None
+        return messages, DESCRIPTION_SYSTEM_PROMPT
     
     def generate_valuation(
         self,
-        product_data: Dict[str, Any]
+        product_data: Dict[str, Any],
+        use_cache: bool = True
     ) -> Optional[Dict[str, Any]]:
         """
         Generate price research and valuation using conservative, evidence-based methodology.
@@ -666,10 +1006,26 @@ Respond with valid JSON only."""
         
         Args:
             product_data: Product information dictionary
+            use_cache: False forces a fresh API call
             
         Returns:
             Dictionary with valuation range, confidence tier, and justification
         """
+        messages, system = self._valuation_request(product_data)
+        result = self._make_api_request(messages, system, use_cache=use_cache)
+        
+        if result and result.get("success"):
+            parsed = self._parse_json_response(result.get("text", ""))
+            if parsed:
+                normalized = self._normalize_valuation(parsed)
+                logger.info(f"Valuation generated: ${normalized['low']}-${normalized['high']}, {normalized['confidence_tier']}")
+                return normalized
+        
+        logger.warning("Valuation generation failed")
+        return None
+    
+    def _valuation_request(self, product_data: Dict[str, Any]):
+        """(messages, system prompt) for a valuation request."""
         content = []
         
         # Add images (up to 5 for better context)
@@ -728,37 +1084,31 @@ Respond with valid JSON only, no markdown formatting."""
         messages = [{"role": "user", "content": content}]
         
         # Use the authoritative conservative valuation system prompt
-        result = self._make_api_request(messages, VALUATION_SYSTEM_PROMPT)
-        
-        if result and result.get("success"):
-            parsed = self._parse_json_response(result.get("text", ""))
-            if parsed:
-                # Normalize response format for backward compatibility
-                normalized = {
-                    "low": parsed.get("valuation_range", {}).get("low", parsed.get("low", 0)),
-                    "high": parsed.get("valuation_range", {}).get("high", parsed.get("high", 0)),
-                    "recommended": parsed.get("valuation_range", {}).get("recommended", parsed.get("recommended", 0)),
-                    "confidence": parsed.get("confidence_tier", parsed.get("confidence", "Medium")),
-                    "notes": parsed.get("valuation_justification", parsed.get("notes", "")),
-                    "comparable_sales": parsed.get("comparable_sales", ""),
-                    "market_demand": parsed.get("market_demand", "moderate"),
-                    "factors": parsed.get("factors", []),
-                    # Include full structured response
-                    "item_description": parsed.get("item_description", ""),
-                    "condition_assessment": parsed.get("condition_assessment", ""),
-                    "market_evidence": parsed.get("market_evidence", ""),
-                    "confidence_tier": parsed.get("confidence_tier", "Tier 3")
-                }
-                logger.info(f"Valuation generated: ${normalized['low']}-${normalized['high']}, {normalized['confidence_tier']}")
-                return normalized
-        
-        logger.warning("Valuation generation failed")
-        return None
+        return messages, VALUATION_SYSTEM_PROMPT
+    
+    def _normalize_valuation(self, parsed: Dict[str, Any]) -> Dict[str, Any]:
+        """Normalize a valuation reply to the flat format (backward compatible)."""
+        return {
+            "low": parsed.get("valuation_range", {}).get("low", parsed.get("low", 0)),
+            "high": parsed.get("valuation_range", {}).get("high", parsed.get("high", 0)),
+            "recommended": parsed.get("valuation_range", {}).get("recommended", parsed.get("recommended", 0)),
+            "confidence": parsed.get("confidence_tier", parsed.get("confidence", "Medium")),
+            "notes": parsed.get("valuation_justification", parsed.get("notes", "")),
+            "comparable_sales": parsed.get("comparable_sales", ""),
+            "market_demand": parsed.get("market_demand", "moderate"),
+            "factors": parsed.get("factors", []),
+            # Include full structured response
+            "item_description": parsed.get("item_description", ""),
+            "condition_assessment": parsed.get("condition_assessment", ""),
+            "market_evidence": parsed.get("market_evidence", ""),
+            "confidence_tier": parsed.get("confidence_tier", "Tier 3")
+        }
     
     def generate_seo_keywords(
         self,
         product_data: Dict[str, Any],
-        count: int = 15
+        count: int = 15,
+        use_cache: bool = True
     ) -> List[str]:
         """
         Generate SEO keywords for the product.
@@ -766,6 +1116,7 @@ Respond with valid JSON only, no markdown formatting."""
         Args:
             product_data: Product information
             count: Number of keywords to generate
+            use_cache: False forces a fresh API call
             
         Returns:
             List of keywords
@@ -783,7 +1134,7 @@ Return ONLY a JSON array of keywords: ["keyword1", "keyword2", ...]"""
 
         messages = [{"role": "user", "content": [{"type": "text", "text": prompt}]}]
         
-        result = self._make_api_request(messages)
+        result = self._make_api_request(messages, use_cache=use_cache)
         
         if result and result.get("success"):
             parsed = self._parse_json_response(result.get("text", ""))
@@ -791,3 +1142,319 @@ Return ONLY a JSON array of keywords: ["keyword1", "keyword2", ...]"""
                 return parsed[:count]
         
         return []
+
+    # ============================================================
+    # GENERATE ALL - a complete listing, concurrently or in one request
+    # ============================================================
+    
+    def generate_all(
+        self,
+        product_data: Dict[str, Any],
+        categories: Dict[str, Any],
+        use_cache: bool = True,
+        progress_callback: Optional[Callable[[int, int, str], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Run field suggestion, description, valuation and SEO keywords concurrently.
+        
+        Independent requests start together on a thread pool. Valuation and
+        keywords need a title: with one already in product_data they start
+        immediately, otherwise they wait only for suggest_fields and use
+        its title/category/era/origin. Total time is roughly the slowest
+        chain rather than the sum of all calls.
+        
+        Args:
+            product_data: Form data (title, category, condition, era, origin, images, ...)
+            categories: Dict of available categories from config
+            use_cache: False forces fresh API calls
+            progress_callback: Optional callback(completed, total, step_name)
+            
+        Returns:
+            Merged listing in the suggest_fields format (title, category_id,
+            subcategory, condition, era, origin, description, seo_title,
+            seo_description, keywords, valuation, ...), plus:
+            - steps: raw result of each request
+            - errors: {step: message} for failed or empty requests
+            - timings: {step: seconds}
+            - elapsed_seconds: wall time of the whole pass
+            - usage: tokens used during this listing (the shared engine may
+              also count other requests made at the same time)
+            - session_usage: the engine's running totals (UsageTracker.totals())
+            - rate_limits: scheduler metrics (queue depth, waits, retries)
+            - connections: connection reuse per transport (ConnectionStats)
+        """
+        start = time.perf_counter()
+        usage_before = self.usage.totals()
+        steps, errors, timings = self._run_listing_steps(
+            product_data, categories, LISTING_SECTIONS, use_cache, progress_callback
+        )
+        return self._finish_listing(steps, errors, timings, start, usage_before, mode="parallel")
+    
+    def generate_listing(
+        self,
+        product_data: Dict[str, Any],
+        categories: Dict[str, Any],
+        use_cache: bool = True,
+        progress_callback: Optional[Callable[[int, int, str], None]] = None
+    ) -> Dict[str, Any]:
+        """
+        Generate a complete listing with a single request.
+        
+        One reply carries fields, description, valuation and keywords (see
+        listing_schema.LISTING_TEMPLATE), so the images are sent once
+        instead of four times. Each section is validated; only sections
+        that are missing or invalid are redone with their dedicated call
+        (concurrently, as in generate_all).
+        
+        Args:
+            product_data: Form data (title, category, condition, era, origin, images, ...)
+            categories: Dict of available categories from config
+            use_cache: False forces fresh API calls
+            progress_callback: Optional callback(completed, total, step_name)
+            
+        Returns:
+            Same as generate_all, plus:
+            - fallbacks: sections redone with a dedicated call
+            - validation: {section: [problems]} for the single reply
+        """
+        start = time.perf_counter()
+        usage_before = self.usage.totals()
+        steps: Dict[str, Any] = {}
+        doc = None
+        
+        request_start = time.perf_counter()
+        request = self._listing_request(product_data, categories)
+        if request:
+            messages, system = request
+            result = self._make_api_request(messages, system, use_cache=use_cache)
+            if result and result.get("success"):
+                doc = self._parse_json_response(result.get("text", ""))
+        timings = {"listing": round(time.perf_counter() - request_start, 3)}
+        
+        validation = validate_listing(doc, categories)
+        failed = [section for section in LISTING_SECTIONS if validation[section]]
+        for section in LISTING_SECTIONS:
+            if section not in failed:
+                steps[section] = doc[section]
+        if failed:
+            logger.info(f"Full listing: redoing {', '.join(failed)} ({validation})")
+        if progress_callback:
+            progress_callback(1, 1 + len(failed), "listing")
+        
+        errors: Dict[str, str] = {}
+        if failed:
+            def step_progress(completed: int, total: int, step: str) -> None:
+                if progress_callback:
+                    progress_callback(1 + completed, 1 + total, step)
+            
+            fallback_steps, errors, fallback_timings = self._run_listing_steps(
+                product_data, categories, failed, use_cache, step_progress,
+                fields=steps.get("fields")
+            )
+            steps.update(fallback_steps)
+            timings.update(fallback_timings)
+        
+        listing = self._finish_listing(steps, errors, timings, start, usage_before, mode="single")
+        listing["fallbacks"] = failed
+        listing["validation"] = validation
+        return listing
+    
+    def _listing_request(self, product_data: Dict[str, Any], categories: Dict[str, Any]):
+        """(messages, system prompt) for a full-listing request, or None without usable images."""
+        content = []
+        for img_path in product_data.get("images", [])[:5]:
+            img_data = self._encode_image(img_path)
+            if img_data:
+                content.append(img_data)
+        if not content:
+            logger.warning("No valid images for full listing generation")
+            return None
+        
+        cat_spec = {
+            k: {"display": v.get("display_name", k.title()), "subcategories": v.get("subcategories", [])}
+            for k, v in categories.items()
+        }
+        known = {
+            key: product_data.get(key)
+            for key in ("title", "category", "subcategory", "condition", "era", "origin")
+            if product_data.get(key)
+        }
+        
+        prompt = f"""Create a complete collectibles listing for the item in these images.
+
+AVAILABLE CATEGORIES (choose fields.category_id from these keys):
+{json.dumps(cat_spec, indent=2)}
+
+DETAILS ALREADY KNOWN (keep unless the images clearly contradict them):
+{json.dumps(known, indent=2) if known else "None"}
+
+Return ONE JSON object with exactly this structure:
+{json.dumps(LISTING_TEMPLATE, indent=2)}
+
+RULES:
+- valuation.low, valuation.high and valuation.recommended are numbers in USD with low <= recommended <= high
+- If value exceeds $500, justify it in valuation.notes with auction comps, rarity or provenance
+- Use auction prices, NOT retail asking prices; default to the lower confidence tier if evidence is weak
+- Base everything ONLY on what you can see and the known details
+
+Respond with valid JSON only, no markdown formatting."""
+        
+        content.append({"type": "text", "text": prompt})
+        return [{"role": "user", "content": content}], VALUATION_SYSTEM_PROMPT
+    
+    def _run_listing_steps(
+        self,
+        product_data: Dict[str, Any],
+        categories: Dict[str, Any],
+        sections,
+        use_cache: bool,
+        progress_callback: Optional[Callable[[int, int, str], None]] = None,
+        fields: Optional[Dict[str, Any]] = None
+    ):
+        """
+        Run the dedicated request for each section concurrently.
+        
+        Valuation and keywords wait only for the "fields" step, and only
+        when neither product_data nor the given fields provide a title.
+        
+        Returns:
+            (results {section: result}, errors {section: message}, timings {section: seconds})
+        """
+        timings: Dict[str, float] = {}
+        steps: Dict[str, Any] = {}
+        errors: Dict[str, str] = {}
+        has_title = bool(str(product_data.get("title") or "").strip())
+        
+        def timed(step: str, call: Callable[[], Any]) -> Any:
+            step_start = time.perf_counter()
+            try:
+                return call()
+            finally:
+                timings[step] = round(time.perf_counter() - step_start, 3)
+        
+        futures: Dict[str, Future] = {}
+        
+        def with_suggestions() -> Dict[str, Any]:
+            """product_data with empty fields filled from the suggested fields."""
+            data = dict(product_data)
+            suggested = fields
+            if suggested is None:
+                if has_title or "fields" not in futures:
+                    return data
+                try:
+                    suggested = futures["fields"].result() or {}
+                except Exception:
+                    suggested = {}
+            for key, source in (("title", "title"), ("category", "category_id"),
+                                ("era", "era"), ("origin", "origin")):
+                if not data.get(key) and suggested.get(source):
+                    data[key] = suggested[source]
+            return data
+        
+        calls = {
+            "fields": lambda: self.suggest_fields(product_data, categories, use_cache=use_cache),
+            "description": lambda: self.generate_description(dict(product_data), use_cache=use_cache),
+            "valuation": lambda: self.generate_valuation(with_suggestions(), use_cache=use_cache),
+            "keywords": lambda: self.generate_seo_keywords(with_suggestions(), use_cache=use_cache)
+        }
+        
+        with ThreadPoolExecutor(
+            max_workers=self.max_concurrent_requests,
+            thread_name_prefix="ai-generate"
+        ) as pool:
+            # LISTING_SECTIONS order submits "fields" first, so a step
+            # waiting on it can never occupy the worker it needs
+            for step in LISTING_SECTIONS:
+                if step in sections:
+                    futures[step] = pool.submit(timed, step, calls[step])
+            
+            step_names = {future: step for step, future in futures.items()}
+            for completed, future in enumerate(as_completed(step_names), 1):
+                step = step_names[future]
+                try:
+                    steps[step] = future.result()
+                    if not steps[step]:
+                        errors[step] = "No result returned"
+                except Exception as e:
+                    logger.warning(f"Generate all: {step} failed: {e}")
+                    steps[step] = None
+                    errors[step] = str(e)
+                if progress_callback:
+                    progress_callback(completed, len(futures), step)
+        
+        return steps, errors, timings
+    
+    def _finish_listing(
+        self,
+        steps: Dict[str, Any],
+        errors: Dict[str, str],
+        timings: Dict[str, float],
+        start: float,
+        usage_before: Dict[str, Any],
+        mode: str
+    ) -> Dict[str, Any]:
+        """Merged listing with its bookkeeping keys."""
+        merged = self._merge_listing(steps)
+        merged["steps"] = steps
+        merged["errors"] = errors
+        merged["timings"] = timings
+        merged["elapsed_seconds"] = round(time.perf_counter() - start, 3)
+        merged["usage"] = self.usage.since(usage_before)
+        merged["session_usage"] = self.usage.totals()
+        merged["rate_limits"] = self.scheduler.metrics()
+        merged["connections"] = self.http.stats.snapshot()
+        merged["mode"] = mode
+        logger.info(
+            f"Listing ({mode}) finished in {merged['elapsed_seconds']:.1f}s "
+            f"(sum of requests {sum(timings.values()):.1f}s, {len(timings)} requests, {len(errors)} failed)"
+        )
+        return merged
+    
+    def _merge_listing(self, steps: Dict[str, Any]) -> Dict[str, Any]:
+        """Combine generate_all step results; dedicated requests win over overlapping fields."""
+        fields = steps.get("fields") or {}
+        description = steps.get("description") or {}
+        merged = dict(fields)
+        
+        for key in ("description", "seo_title", "seo_description", "condition_notes", "materials"):
+            if description.get(key):
+                merged[key] = description[key]
+        if not merged.get("title") and description.get("suggested_title"):
+            merged["title"] = description["suggested_title"]
+        
+        merged["keywords"] = (
+            steps.get("keywords") or description.get("keywords") or fields.get("keywords") or []
+        )
+        merged["valuation"] = (
+            steps.get("valuation") or description.get("valuation") or fields.get("valuation") or {}
+        )
+        return merged
+
+
+def _with_request_stats(result: Optional[Dict], request_stats: Dict[str, int]) -> Optional[Dict]:
+    """Copy of a result with the call's payload stats (cached entries stay untouched)."""
+    if result is None:
+        return None
+    return dict(result, request_stats=request_stats)
+
+
+_engine: Optional[AIEngine] = None
+_engine_key: Optional[str] = None
+_engine_lock = threading.Lock()
+
+
+def get_ai_engine(config: dict) -> AIEngine:
+    """
+    App-wide AIEngine, created on first use and reused by every AI action
+    (API key, SDK client and connections are set up once).
+    
+    Rebuilt when the "ai" config section changes (e.g. the model is
+    edited in Settings).
+    """
+    global _engine, _engine_key
+    key = json.dumps(config.get("ai", {}), sort_keys=True, default=str)
+    with _engine_lock:
+        if _engine is None or key != _engine_key:
+            _engine = AIEngine(config)
+            _engine_key = key
+        return _engine
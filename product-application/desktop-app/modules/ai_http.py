@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+AI HTTP Module
+Pooled keep-alive connections for every Anthropic API call.
+
+A fresh client per request pays a TCP + TLS handshake each time (about a
+second on a slow link). One AIHttpTransport per process keeps connections
+open instead:
+- a requests.Session with a sized HTTPAdapter pool, used by the direct
+  HTTP fallback, raw SSE streaming, the batch client and the key test
+- a single httpx client for the Anthropic SDK
+
+The SDK is built on httpx and the fallbacks on requests, so the two keep
+separate pools. Both pools report to one ConnectionStats: requests sent
+and how many of them opened a new connection.
+"""
+
+import logging
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 8
+
+
+class ConnectionStats:
+    """
+    Thread-safe request / new-connection counters per transport.
+
+    A connection is recognised by its object identity (held weakly), so a
+    request on an already-seen connection counts as reused.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._seen: Dict[str, Any] = {}
+
+    def record(self, transport: str, connection: Any) -> None:
+        """Count one request on transport over the given connection object."""
+        with self._lock:
+            counts = self._counts.setdefault(transport, {"requests": 0, "new_connections": 0})
+            counts["requests"] += 1
+            if connection is None:
+                return
+            seen = self._seen.setdefault(transport, weakref.WeakSet())
+            try:
+                if connection in seen:
+                    return
+                seen.add(connection)
+            except TypeError:
+                # Not weak-referenceable: fall back to identity
+                ids = self._seen.setdefault(transport + ":ids", set())
+                if id(connection) in ids:
+                    return
+                ids.add(id(connection))
+            counts["new_connections"] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """{transport: {requests, new_connections, reused, reuse_ratio}}."""
+        with self._lock:
+            result = {}
+            for transport, counts in self._counts.items():
+                reused = max(0, counts["requests"] - counts["new_connections"])
+                result[transport] = dict(
+                    counts,
+                    reused=reused,
+                    reuse_ratio=round(reused / counts["requests"], 3) if counts["requests"] else 0.0
+                )
+            return result
+
+
+class AIHttpTransport:
+    """
+    Process-wide pooled HTTP clients for the Anthropic API.
+
+    Args:
+        pool_size: Keep-alive connections per host (at least the number of
+            concurrent AI requests)
+    """
+
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE):
+        self.pool_size = pool_size
+        self.stats = ConnectionStats()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.hooks["response"].append(self._on_requests_response)
+        self._sdk_http_client = None
+        self._sdk_lock = threading.Lock()
+
+    def _on_requests_response(self, response: requests.Response, *args, **kwargs) -> None:
+        raw = getattr(response, "raw", None)
+        self.stats.record("http", getattr(raw, "_connection", None) or getattr(raw, "connection", None))
+
+    def _on_sdk_response(self, response: Any) -> None:
+        self.stats.record("sdk", response.extensions.get("network_stream"))
+
+    def sdk_http_client(self):
+        """
+        Shared httpx client for Anthropic(http_client=...), or None when the
+        SDK is not installed. Uses the SDK's default keep-alive limits and
+        timeouts.
+        """
+        with self._sdk_lock:
+            if self._sdk_http_client is None:
+                try:
+                    from anthropic import DefaultHttpxClient
+                except ImportError:
+                    return None
+                self._sdk_http_client = DefaultHttpxClient(
+                    event_hooks={"response": [self._on_sdk_response]}
+                )
+            return self._sdk_http_client
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+        with self._sdk_lock:
+            if self._sdk_http_client is not None:
+                self._sdk_http_client.close()
+                self._sdk_http_client = None
+
+
+_transport: Optional[AIHttpTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_http_transport(config: Optional[dict] = None) -> AIHttpTransport:
+    """
+    Process-wide transport shared by every AIEngine, with a pool sized
+    from ai.max_concurrent_requests on first use.
+    """
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            ai_config = (config or {}).get("ai", {})
+            concurrency = int(ai_config.get("max_concurrent_requests", 4))
+            _transport = AIHttpTransport(pool_size=max(DEFAULT_POOL_SIZE, concurrency * 2))
+        return _transport
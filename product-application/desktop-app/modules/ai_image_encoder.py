@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+AI Image Encoder Module
+Compact, cached image payloads for Claude vision requests.
+
+The API downsizes any image whose long edge exceeds ~1568 px before the
+model sees it, so sending a 10 MB camera JPEG (or a PNG) only costs upload
+time and request size. Each image is decoded once (JPEG draft decode,
+EXIF orientation applied), downsized to the long-edge limit, re-encoded
+as JPEG and kept base64-encoded in memory, keyed by its content hash.
+Every AIEngine call in the session (suggest fields, description,
+valuation, ...) reuses the same payload.
+"""
+
+import base64
+import io
+import logging
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from PIL import Image, ImageOps
+
+from .memory_budget import draft_for_max_dimension
+from .utils import file_content_hash
+
+logger = logging.getLogger(__name__)
+
+# Long edge the API resizes larger images to
+DEFAULT_MAX_EDGE = 1568
+DEFAULT_JPEG_QUALITY = 85
+MAX_CACHED_IMAGES = 256
+
+MEDIA_TYPES = {
+    '.jpg': 'image/jpeg',
+    '.jpeg': 'image/jpeg',
+    '.png': 'image/png',
+    '.gif': 'image/gif',
+    '.webp': 'image/webp'
+}
+
+
+class ImagePayloadEncoder:
+    """
+    Thread-safe LRU cache of base64 image blocks for the Messages API.
+
+    Features:
+    - Downsizing to the model's long-edge limit, compact JPEG re-encode
+    - Original bytes kept when they are already smaller and supported
+    - Per-payload byte accounting (original vs. sent) for request reports
+    """
+
+    def __init__(
+        self,
+        max_edge: int = DEFAULT_MAX_EDGE,
+        quality: int = DEFAULT_JPEG_QUALITY,
+        max_entries: int = MAX_CACHED_IMAGES
+    ):
+        self.max_edge = max_edge
+        self.quality = quality
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._hashes: Dict[Tuple[str, int, int], str] = {}
+        self._original_bytes: Dict[str, int] = {}
+
+    def encode(self, image_path: str) -> Optional[Dict[str, Any]]:
+        """
+        API image block for a file, from cache when the content is unchanged.
+
+        Returns:
+            {"type": "image", "source": {...}} or None if the file is missing or unreadable
+        """
+        path = Path(image_path)
+        try:
+            stat = path.stat()
+            signature = (str(path), stat.st_size, stat.st_mtime_ns)
+            with self._lock:
+                content_hash = self._hashes.get(signature)
+            if content_hash is None:
+                content_hash = file_content_hash(str(path))
+                with self._lock:
+                    self._hashes[signature] = content_hash
+        except OSError as e:
+            logger.warning(f"Image not found: {image_path} ({e})")
+            return None
+
+        with self._lock:
+            entry = self._entries.get(content_hash)
+            if entry is not None:
+                self._entries.move_to_end(content_hash)
+                self.hits += 1
+                return entry["block"]
+
+        try:
+            block, original_bytes = self._encode_file(path)
+        except Exception as e:
+            logger.error(f"Failed to encode image {image_path}: {e}")
+            return None
+
+        data = block["source"]["data"]
+        with self._lock:
+            self.misses += 1
+            self._entries[content_hash] = {"block": block}
+            self._original_bytes[data] = original_bytes
+            while len(self._entries) > self.max_entries:
+                _, evicted = self._entries.popitem(last=False)
+                self._original_bytes.pop(evicted["block"]["source"]["data"], None)
+
+        logger.debug(
+            f"AI image payload {path.name}: {original_bytes / 1024:.0f} KB -> "
+            f"{len(data) * 3 / 4 / 1024:.0f} KB"
+        )
+        return block
+
+    def _encode_file(self, path: Path) -> Tuple[Dict[str, Any], int]:
+        """Downsize and re-encode one file; returns (block, original file size)."""
+        raw = path.read_bytes()
+        media_type = MEDIA_TYPES.get(path.suffix.lower())
+
+        with Image.open(io.BytesIO(raw)) as src:
+            size = src.size
+            draft_for_max_dimension(src, self.max_edge)
+            img = ImageOps.exif_transpose(src)
+            if img.mode in ("RGBA", "LA", "P"):
+                rgba = img.convert("RGBA")
+                img = Image.new("RGB", rgba.size, (255, 255, 255))
+                img.paste(rgba, mask=rgba.getchannel("A"))
+            else:
+                img = img.convert("RGB")
+
+        if max(img.size) > self.max_edge:
+            img.thumbnail((self.max_edge, self.max_edge), Image.Resampling.LANCZOS)
+
+        buffer = io.BytesIO()
+        img.save(buffer, format="JPEG", quality=self.quality, optimize=True)
+        encoded = buffer.getvalue()
+
+        # Small, already supported originals are sent as-is when smaller
+        if media_type and max(size) <= self.max_edge and len(raw) <= len(encoded):
+            encoded = raw
+        else:
+            media_type = "image/jpeg"
+
+        block = {
+            "type": "image",
+            "source": {
+                "type": "base64",
+                "media_type": media_type,
+                "data": base64.b64encode(encoded).decode("ascii")
+            }
+        }
+        return block, len(raw)
+
+    def original_bytes(self, data: str) -> Optional[int]:
+        """File size behind a cached payload's base64 data (None if unknown)."""
+        with self._lock:
+            return self._original_bytes.get(data)
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache counters and payload totals."""
+        with self._lock:
+            sent = sum(len(e["block"]["source"]["data"]) * 3 // 4 for e in self._entries.values())
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+                "original_bytes": sum(self._original_bytes.values()),
+                "encoded_bytes": sent
+            }
+
+
+def measure_request(messages: list, encoder: Optional[ImagePayloadEncoder] = None) -> Dict[str, int]:
+    """
+    Request size accounting for one API call.
+
+    Returns:
+        {"images", "image_bytes" (decoded payload bytes sent),
+         "original_image_bytes" (file sizes before re-encoding)}
+    """
+    images = image_bytes = original = 0
+    for message in messages:
+        content = message.get("content")
+        if not isinstance(content, list):
+            continue
+        for block in content:
+            if not isinstance(block, dict) or block.get("type") != "image":
+                continue
+            source = block.get("source", {})
+            if source.get("type") != "base64":
+                continue
+            sent = len(source["data"]) * 3 // 4
+            images += 1
+            image_bytes += sent
+            known = encoder.original_bytes(source["data"]) if encoder else None
+            original += known if known is not None else sent
+    return {"images": images, "image_bytes": image_bytes, "original_image_bytes": original}
+
+
+_encoder: Optional[ImagePayloadEncoder] = None
+_encoder_lock = threading.Lock()
+
+
+def get_image_encoder(config: Optional[dict] = None) -> ImagePayloadEncoder:
+    """
+    Process-wide encoder shared by every AIEngine, configured from
+    ai.image_max_edge / ai.image_quality on first use.
+    """
+    global _encoder
+    with _encoder_lock:
+        if _encoder is None:
+            ai_config = (config or {}).get("ai", {})
+            _encoder = ImagePayloadEncoder(
+                max_edge=int(ai_config.get("image_max_edge", DEFAULT_MAX_EDGE)),
+                quality=int(ai_config.get("image_quality", DEFAULT_JPEG_QUALITY))
+            )
+        return _encoder
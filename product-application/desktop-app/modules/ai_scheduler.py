@@ -0,0 +1,353 @@
+#!/usr/bin/env python3
+"""
+AI Scheduler Module
+Rate-limit-aware admission for every Claude request in the process.
+
+API limits are per account, so all AIEngine instances share one
+RequestScheduler. Each request is admitted only when three token buckets
+(requests, input tokens and output tokens per minute) have room for it;
+waiting requests are served by priority lane (interactive before bulk)
+and then in arrival order. A 429/529 or 5xx reply pauses admission for
+everyone for the server's retry-after time (exponential backoff when the
+header is missing) and the request is retried.
+
+Token counts are estimated before the call and corrected from the
+response's usage afterwards, so throughput tracks the configured limits
+without exceeding them.
+"""
+
+import heapq
+import itertools
+import json
+import logging
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BULK = 1
+LANE_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_BULK: "bulk"}
+
+# Responses worth retrying: rate limited, overloaded, transient server errors
+RETRY_STATUSES = {429, 500, 502, 503, 504, 529}
+
+DEFAULT_LIMITS = {
+    "requests_per_minute": 50,
+    "input_tokens_per_minute": 30000,
+    "output_tokens_per_minute": 8000
+}
+DEFAULT_BURST_SECONDS = 10
+DEFAULT_MAX_RETRIES = 4
+# Output reserved per request until its real usage is known
+DEFAULT_EXPECTED_OUTPUT_TOKENS = 1024
+BACKOFF_BASE = 2.0
+BACKOFF_MAX = 60.0
+
+# Rough token cost of one image at the API's 1568 px long-edge limit
+IMAGE_TOKENS = 1600
+
+
+def estimate_input_tokens(messages: list, system: Any = None) -> int:
+    """Approximate prompt tokens: ~4 characters per token plus a flat cost per image."""
+    chars = 0
+    images = 0
+    if isinstance(system, str):
+        chars += len(system)
+    elif isinstance(system, list):
+        chars += sum(len(block.get("text", "")) for block in system if isinstance(block, dict))
+    for message in messages:
+        content = message.get("content")
+        if isinstance(content, str):
+            chars += len(content)
+            continue
+        for block in content or []:
+            if block.get("type") == "image":
+                images += 1
+            else:
+                chars += len(block.get("text", ""))
+    return chars // 4 + images * IMAGE_TOKENS
+
+
+def parse_retry_after(value: Any) -> Optional[float]:
+    """Seconds from a retry-after header value (None if absent or not a number)."""
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class TokenBucket:
+    """
+    Continuously refilling bucket: `rate` units per second, up to `capacity`.
+
+    Takes may overdraw (a request larger than the bucket, or usage above its
+    estimate); the debt delays later requests.
+    """
+
+    def __init__(self, per_minute: float, burst_seconds: float = DEFAULT_BURST_SECONDS):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.level = self.capacity
+        self.updated: Optional[float] = None
+
+    def _refill(self, now: float) -> None:
+        if self.updated is not None:
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until amount can be taken (oversized amounts wait for a full bucket)."""
+        self._refill(now)
+        needed = min(amount, self.capacity)
+        if self.level >= needed:
+            return 0.0
+        return (needed - self.level) / self.rate
+
+    def take(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.level -= amount
+
+    def adjust(self, delta: float, now: float) -> None:
+        """Charge (positive) or refund (negative) after the actual usage is known."""
+        self._refill(now)
+        self.level = min(self.capacity, self.level - delta)
+
+
+class RequestScheduler:
+    """
+    Shared admission control and retry policy for API calls.
+
+    Args:
+        requests_per_minute, input_tokens_per_minute, output_tokens_per_minute:
+            Account limits (0 or None disables that bucket)
+        burst_seconds: Bucket capacity, as seconds of refill
+        max_retries: Retries of a rate-limited or failed-with-5xx call
+        expected_output_tokens: Output reserved per request at admission
+        clock: Monotonic time source (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: Optional[float] = DEFAULT_LIMITS["requests_per_minute"],
+        input_tokens_per_minute: Optional[float] = DEFAULT_LIMITS["input_tokens_per_minute"],
+        output_tokens_per_minute: Optional[float] = DEFAULT_LIMITS["output_tokens_per_minute"],
+        burst_seconds: float = DEFAULT_BURST_SECONDS,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        expected_output_tokens: int = DEFAULT_EXPECTED_OUTPUT_TOKENS,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.clock = clock
+        self._cond = threading.Condition()
+        self.buckets: Dict[str, TokenBucket] = {}
+        self.configure(
+            requests_per_minute, input_tokens_per_minute, output_tokens_per_minute,
+            burst_seconds, max_retries, expected_output_tokens
+        )
+        self._queue: List[tuple] = []
+        self._seq = itertools.count()
+        self._paused_until = 0.0
+        self._stats = {
+            "admitted": 0, "retries": 0, "rate_limited": 0,
+            "wait_seconds": 0.0, "max_queue_depth": 0
+        }
+
+    @classmethod
+    def from_config(cls, config: dict) -> "RequestScheduler":
+        """Build from ai.rate_limits (see DEFAULT_LIMITS)."""
+        return cls(**limits_from_config(config))
+
+    def configure(
+        self,
+        requests_per_minute: Optional[float] = DEFAULT_LIMITS["requests_per_minute"],
+        input_tokens_per_minute: Optional[float] = DEFAULT_LIMITS["input_tokens_per_minute"],
+        output_tokens_per_minute: Optional[float] = DEFAULT_LIMITS["output_tokens_per_minute"],
+        burst_seconds: float = DEFAULT_BURST_SECONDS,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        expected_output_tokens: int = DEFAULT_EXPECTED_OUTPUT_TOKENS
+    ) -> None:
+        """
+        Apply new limits in place (queued requests keep their turn).
+
+        A bucket that already existed keeps its current level, capped at
+        the new capacity, so a change never grants a fresh burst.
+        """
+        with self._cond:
+            now = self.clock()
+            buckets = {}
+            for name, limit in (
+                ("requests", requests_per_minute),
+                ("input_tokens", input_tokens_per_minute),
+                ("output_tokens", output_tokens_per_minute)
+            ):
+                if not limit:
+                    continue
+                bucket = TokenBucket(limit, burst_seconds)
+                old = self.buckets.get(name)
+                if old is not None:
+                    old._refill(now)
+                    bucket.level = min(bucket.capacity, old.level)
+                    bucket.updated = now
+                buckets[name] = bucket
+            self.buckets = buckets
+            self.max_retries = max_retries
+            self.expected_output_tokens = expected_output_tokens
+            self._cond.notify_all()
+
+    def _amounts(self, input_tokens: int, output_tokens: int) -> Dict[str, float]:
+        # All three, so a bucket added by configure() while waiting is covered
+        return {"requests": 1, "input_tokens": input_tokens, "output_tokens": output_tokens}
+
+    def admit(self, input_tokens: int = 0, output_tokens: int = 0, priority: int = PRIORITY_INTERACTIVE) -> float:
+        """
+        Block until the request may be sent; returns the seconds waited.
+
+        Only the head of the queue (best lane, then oldest) is admitted,
+        so bulk work never overtakes an interactive request.
+        """
+        amounts = self._amounts(input_tokens, output_tokens)
+        with self._cond:
+            ticket = (priority, next(self._seq))
+            heapq.heappush(self._queue, ticket)
+            self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], len(self._queue))
+            start = self.clock()
+            try:
+                while True:
+                    timeout = None
+                    if self._queue[0] == ticket:
+                        now = self.clock()
+                        timeout = max(
+                            [self._paused_until - now]
+                            + [bucket.wait_time(amounts[name], now) for name, bucket in self.buckets.items()]
+                        )
+                        if timeout <= 0:
+                            for name, bucket in self.buckets.items():
+                                bucket.take(amounts[name], now)
+                            waited = now - start
+                            self._stats["admitted"] += 1
+                            self._stats["wait_seconds"] += waited
+                            return waited
+                    self._cond.wait(timeout)
+            finally:
+                self._queue.remove(ticket)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+
+    def settle(self, input_estimate: int, output_estimate: int, usage: Optional[Dict[str, int]]) -> None:
+        """Correct the token buckets with the actual usage (refund everything when None)."""
+        actual_input = actual_output = 0
+        if usage:
+            actual_input = usage.get("input_tokens", 0) + usage.get("cache_creation_input_tokens", 0)
+            actual_output = usage.get("output_tokens", 0)
+        with self._cond:
+            now = self.clock()
+            if "input_tokens" in self.buckets:
+                self.buckets["input_tokens"].adjust(actual_input - input_estimate, now)
+            if "output_tokens" in self.buckets:
+                self.buckets["output_tokens"].adjust(actual_output - output_estimate, now)
+            self._cond.notify_all()
+
+    def pause(self, seconds: float) -> None:
+        """Stop admitting anything for the given time (account-wide limit hit)."""
+        with self._cond:
+            self._paused_until = max(self._paused_until, self.clock() + seconds)
+            self._cond.notify_all()
+
+    def run(
+        self,
+        call: Callable[[], Optional[Dict[str, Any]]],
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Admit, call and retry a request.
+
+        call() returns the engine's result dict; {"status_code": 429,
+        "retry_after": s} and other RETRY_STATUSES replies are retried up to
+        max_retries times after pausing admission.
+        """
+        for attempt in range(self.max_retries + 1):
+            self.admit(input_tokens, output_tokens, priority)
+            try:
+                result = call()
+            except Exception:
+                self.settle(input_tokens, output_tokens, None)
+                raise
+            status = (result or {}).get("status_code")
+            if status not in RETRY_STATUSES:
+                self.settle(input_tokens, output_tokens, (result or {}).get("usage") if result else None)
+                return result
+
+            self.settle(input_tokens, output_tokens, None)
+            if attempt == self.max_retries:
+                logger.error(f"AI request still failing with {status} after {attempt} retries")
+                return result
+            delay = result.get("retry_after")
+            if delay is None:
+                delay = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt) * random.uniform(0.8, 1.2)
+            with self._cond:
+                self._stats["retries"] += 1
+                if status == 429:
+                    self._stats["rate_limited"] += 1
+            logger.warning(f"AI request got {status}; retrying in {delay:.1f}s (attempt {attempt + 1})")
+            self.pause(delay)
+        return None
+
+    def metrics(self) -> Dict[str, Any]:
+        """Queue depth per lane, admission and retry counters, bucket levels."""
+        with self._cond:
+            queued = {name: 0 for name in LANE_NAMES.values()}
+            for priority, _ in self._queue:
+                lane = LANE_NAMES.get(priority, str(priority))
+                queued[lane] = queued.get(lane, 0) + 1
+            now = self.clock()
+            for bucket in self.buckets.values():
+                bucket._refill(now)
+            return dict(
+                self._stats,
+                wait_seconds=round(self._stats["wait_seconds"], 3),
+                queued=queued,
+                paused_for=round(max(0.0, self._paused_until - now), 3),
+                buckets={name: round(bucket.level, 1) for name, bucket in self.buckets.items()}
+            )
+
+
+def limits_from_config(config: dict) -> Dict[str, Any]:
+    """RequestScheduler arguments from ai.rate_limits (defaults for missing keys)."""
+    limits = config.get("ai", {}).get("rate_limits", {})
+    return {
+        "requests_per_minute": limits.get("requests_per_minute", DEFAULT_LIMITS["requests_per_minute"]),
+        "input_tokens_per_minute": limits.get("input_tokens_per_minute", DEFAULT_LIMITS["input_tokens_per_minute"]),
+        "output_tokens_per_minute": limits.get("output_tokens_per_minute", DEFAULT_LIMITS["output_tokens_per_minute"]),
+        "burst_seconds": float(limits.get("burst_seconds", DEFAULT_BURST_SECONDS)),
+        "max_retries": int(limits.get("max_retries", DEFAULT_MAX_RETRIES)),
+        "expected_output_tokens": int(limits.get("expected_output_tokens", DEFAULT_EXPECTED_OUTPUT_TOKENS))
+    }
+
+
+_scheduler: Optional[RequestScheduler] = None
+_scheduler_key: Optional[str] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler(config: Optional[dict] = None) -> RequestScheduler:
+    """
+    Process-wide scheduler shared by every AIEngine (limits are per account).
+
+    When ai.rate_limits differs from the last config seen (e.g. edited in
+    Settings), the new limits are applied to the same scheduler.
+    """
+    global _scheduler, _scheduler_key
+    limits = limits_from_config(config or {})
+    key = json.dumps(limits, sort_keys=True, default=str)
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = RequestScheduler(**limits)
+        elif key != _scheduler_key:
+            logger.info(f"AI rate limits updated: {limits}")
+            _scheduler.configure(**limits)
+        _scheduler_key = key
+        return _scheduler
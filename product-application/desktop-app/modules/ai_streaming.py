@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+AI Streaming Module
+Streamed Claude responses: text deltas as they are generated.
+
+A full completion takes 10-30 seconds; streaming shows text from the
+first token on. Both transports are covered: the SDK's messages.stream()
+and the raw HTTP server-sent events (SSE) endpoint used as fallback.
+Either can be cancelled between deltas; the connection is closed and the
+partial text returned.
+"""
+
+import json
+import logging
+import re
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional, Tuple, Union
+
+import requests
+
+from .ai_scheduler import parse_retry_after
+from .ai_usage import usage_from_response
+
+logger = logging.getLogger(__name__)
+
+DeltaCallback = Callable[[str], None]
+CancelCheck = Callable[[], bool]
+
+_ESCAPES = {'"': '"', '\\': '\\', '/': '/', 'b': '\b', 'f': '\f', 'n': '\n', 'r': '\r', 't': '\t'}
+
+
+def iter_sse(lines: Iterable[Union[bytes, str]]) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Parse server-sent events.
+
+    Args:
+        lines: Response lines without line endings (e.g. response.iter_lines())
+
+    Yields:
+        (event name, decoded JSON data) per event
+    """
+    event, data = "message", []
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8")
+        if not line:
+            if data:
+                try:
+                    yield event, json.loads("\n".join(data))
+                except ValueError:
+                    logger.debug(f"Skipping undecodable SSE data: {data[:1]}")
+            event, data = "message", []
+        elif line.startswith(":"):
+            continue  # Comment / keep-alive
+        elif line.startswith("event:"):
+            event = line[6:].strip()
+        elif line.startswith("data:"):
+            data.append(line[5:].lstrip())
+    if data:
+        try:
+            yield event, json.loads("\n".join(data))
+        except ValueError:
+            pass
+
+
+def _result(text: str, usage: Dict[str, int], cancelled: bool) -> Dict[str, Any]:
+    return {"success": not cancelled, "text": text, "usage": usage, "cancelled": cancelled}
+
+
+def stream_sdk(
+    client: Any,
+    payload: Dict[str, Any],
+    on_delta: Optional[DeltaCallback] = None,
+    should_cancel: Optional[CancelCheck] = None
+) -> Dict[str, Any]:
+    """
+    Stream a request through the Anthropic SDK.
+
+    Returns:
+        {"success", "text", "usage", "cancelled"}; SDK errors propagate
+    """
+    parts = []
+    with client.messages.stream(**payload) as stream:
+        for delta in stream.text_stream:
+            if should_cancel and should_cancel():
+                return _result("".join(parts), usage_from_response(None), True)
+            parts.append(delta)
+            if on_delta:
+                on_delta(delta)
+        usage = usage_from_response(stream.get_final_message().usage)
+    return _result("".join(parts), usage, False)
+
+
+def stream_http(
+    url: str,
+    headers: Dict[str, str],
+    payload: Dict[str, Any],
+    on_delta: Optional[DeltaCallback] = None,
+    should_cancel: Optional[CancelCheck] = None,
+    verify: Union[bool, str] = True,
+    timeout: float = 120,
+    session: Optional[requests.Session] = None
+) -> Dict[str, Any]:
+    """
+    Stream a request over raw HTTP (SSE), on session's pooled connections
+    when given.
+
+    Returns:
+        {"success", "text", "usage", "cancelled"}, or {"success": False,
+        "error", "status_code", "retry_after"} for an HTTP or stream error
+        before completion
+    """
+    response = (session or requests).post(
+        url, headers=headers, json=dict(payload, stream=True),
+        timeout=timeout, verify=verify, stream=True
+    )
+    try:
+        if response.status_code != 200:
+            return {
+                "success": False,
+                "error": f"API returned {response.status_code}: {response.text[:200]}",
+                "status_code": response.status_code,
+                "retry_after": parse_retry_after(response.headers.get("retry-after"))
+            }
+
+        parts = []
+        usage: Dict[str, Any] = {}
+        for event, data in iter_sse(response.iter_lines()):
+            if should_cancel and should_cancel():
+                return _result("".join(parts), usage_from_response(usage), True)
+            if event == "content_block_delta" and data.get("delta", {}).get("type") == "text_delta":
+                delta = data["delta"].get("text", "")
+                parts.append(delta)
+                if on_delta:
+                    on_delta(delta)
+            elif event == "message_start":
+                usage.update(data.get("message", {}).get("usage") or {})
+            elif event == "message_delta":
+                usage.update(data.get("usage") or {})
+            elif event == "error":
+                message = data.get("error", {}).get("message", "stream error")
+                return {"success": False, "error": message, "text": "".join(parts)}
+        return _result("".join(parts), usage_from_response(usage), False)
+    finally:
+        response.close()
+
+
+def partial_json_string(text: str, key: str) -> Optional[Tuple[str, bool]]:
+    """
+    Decoded value of a JSON string field in a possibly incomplete document.
+
+    Lets a streamed JSON reply show e.g. its "description" while it is
+    still being generated.
+
+    Returns:
+        (value so far, complete) or None if the field has not started
+    """
+    match = re.search(r'"%s"\s*:\s*"' % re.escape(key), text)
+    if not match:
+        return None
+    out = []
+    i = match.end()
+    while i < len(text):
+        ch = text[i]
+        if ch == '"':
+            return "".join(out), True
+        if ch != "\\":
+            out.append(ch)
+            i += 1
+            continue
+        if i + 1 >= len(text):
+            break  # Escape split across deltas
+        code = text[i + 1]
+        if code == "u":
+            digits = text[i + 2:i + 6]
+            if len(digits) < 4:
+                break
+            try:
+                point = int(digits, 16)
+            except ValueError:
+                point = 0xFFFD
+            i += 6
+            if 0xD800 <= point < 0xDC00:  # Surrogate pair: wait for the low half
+                low = text[i:i + 6]
+                if len(low) < 6:
+                    break
+                try:
+                    if not low.startswith("\\u"):
+                        raise ValueError(low)
+                    point = 0x10000 + ((point - 0xD800) << 10) + (int(low[2:], 16) - 0xDC00)
+                    i += 6
+                except ValueError:
+                    point = 0xFFFD
+            out.append(chr(point))
+        else:
+            out.append(_ESCAPES.get(code, code))
+            i += 2
+    return "".join(out), False
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+AI Usage Module
+Prompt-caching markers and token usage accounting for Claude requests.
+
+The system prompts are long and the same product images go out with
+several consecutive requests (fields, description, valuation). Marking
+the system prompt and the last image block with cache_control lets the
+API reuse that prefix for every later request on the same product, which
+cuts time-to-first-token and input cost. Prefixes shorter than the
+model's minimum cacheable length are simply not cached.
+"""
+
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+CACHE_CONTROL = {"type": "ephemeral"}
+
+USAGE_FIELDS = (
+    "input_tokens",
+    "output_tokens",
+    "cache_creation_input_tokens",
+    "cache_read_input_tokens"
+)
+
+
+def add_cache_markers(
+    system: Optional[Union[str, List[Dict[str, Any]]]],
+    messages: List[Dict[str, Any]]
+) -> Tuple[Optional[Union[str, List[Dict[str, Any]]]], List[Dict[str, Any]]]:
+    """
+    Request copies with cache breakpoints on the system prompt and the last image.
+
+    The inputs are not modified (image blocks are shared with the image
+    encoder's cache).
+
+    Args:
+        system: System prompt string (or block list, or None)
+        messages: API messages
+
+    Returns:
+        (system, messages) ready for the request payload
+    """
+    if isinstance(system, str) and system:
+        system = [{"type": "text", "text": system, "cache_control": CACHE_CONTROL}]
+
+    last_image = None
+    for m, message in enumerate(messages):
+        content = message.get("content")
+        if isinstance(content, list):
+            for b, block in enumerate(content):
+                if isinstance(block, dict) and block.get("type") == "image":
+                    last_image = (m, b)
+    if last_image is None:
+        return system, messages
+
+    m, b = last_image
+    messages = list(messages)
+    content = list(messages[m]["content"])
+    content[b] = dict(content[b], cache_control=CACHE_CONTROL)
+    messages[m] = dict(messages[m], content=content)
+    return system, messages
+
+
+def usage_from_response(usage: Any) -> Dict[str, int]:
+    """Token counts from an SDK usage object or a raw JSON usage dict (missing = 0)."""
+    if usage is None:
+        return {field: 0 for field in USAGE_FIELDS}
+    if isinstance(usage, dict):
+        return {field: int(usage.get(field) or 0) for field in USAGE_FIELDS}
+    return {field: int(getattr(usage, field, 0) or 0) for field in USAGE_FIELDS}
+
+
+class UsageTracker:
+    """Thread-safe running totals of token usage across requests."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self._totals = {field: 0 for field in USAGE_FIELDS}
+
+    def add(self, usage: Dict[str, int]) -> None:
+        """Add one response's usage."""
+        with self._lock:
+            self.requests += 1
+            for field in USAGE_FIELDS:
+                self._totals[field] += int(usage.get(field, 0))
+
+    def totals(self) -> Dict[str, Any]:
+        """Summed token counts plus the share of prompt tokens read from cache."""
+        with self._lock:
+            totals = dict(self._totals, requests=self.requests)
+        return _with_cache_ratio(totals)
+
+    def since(self, earlier: Dict[str, Any]) -> Dict[str, Any]:
+        """Usage added after an earlier totals() snapshot."""
+        current = self.totals()
+        keys = list(USAGE_FIELDS) + ["requests"]
+        return _with_cache_ratio({key: current[key] - earlier.get(key, 0) for key in keys})
+
+
+def _with_cache_ratio(totals: Dict[str, Any]) -> Dict[str, Any]:
+    prompt = (
+        totals["input_tokens"]
+        + totals["cache_creation_input_tokens"]
+        + totals["cache_read_input_tokens"]
+    )
+    totals["cache_read_ratio"] = round(totals["cache_read_input_tokens"] / prompt, 3) if prompt else 0.0
+    return totals
@@ -6,20 +6,55 @@ Uses rembg (U2-Net based) for accurate background removal.
 """
 
 import os
+import logging
+import time
 from pathlib import Path
-from typing import Optional, Tuple, Callable
-from PIL import Image, ImageFilter, ImageOps
-import numpy as np
+from typing import Optional, Callable
+from PIL import Image
 
-# Try to import rembg - will be installed separately
-try:
-    from rembg import remove as rembg_remove
-    REMBG_AVAILABLE = True
-    REMBG_ERROR = None
-except ImportError as e:
-    REMBG_AVAILABLE = False
-    REMBG_ERROR = str(e)
-    # Warning will be logged only when background removal is actually used
+from .memory_budget import get_memory_budget, estimate_decode_bytes, draft_for_max_dimension
+from .rembg_session import (
+    get_session_manager, configure_worker, model_for_profile,
+    DEFAULT_PROFILE, DEFAULT_PREVIEW_PROFILE, REMBG_AVAILABLE, REMBG_ERROR
+)
+from .process_pool import run_in_pool, split_cores
+from .mask_refine import make_proxy, refine_alpha, refine_options
+from .compositing import composite_image
+from .mask_cache import MaskCache
+from .classic_segmenter import segment_foreground
+
+logger = logging.getLogger(__name__)
+
+# Per-process remover for pool workers (set by _init_removal_worker)
+_worker_remover: Optional["BackgroundRemover"] = None
+
+
+def _init_removal_worker(config: dict, intra_op_threads: int) -> None:
+    """Pool initializer: pin the ONNX thread count and load this worker's model."""
+    global _worker_remover
+    configure_worker(intra_op_threads)
+    _worker_remover = BackgroundRemover(config)
+    if REMBG_AVAILABLE:
+        try:
+            get_session_manager().get_session(_worker_remover.model_name)
+        except RuntimeError as e:
+            logger.warning(f"rembg session unavailable in worker {os.getpid()}: {e}")
+
+
+def _remove_in_worker(image_path: str, output_path: str, options: dict) -> dict:
+    """Process-pool entry point (must be module-level to be picklable)."""
+    remover = _worker_remover
+    model_stats = get_session_manager().stats().get(remover.model_name, {}) if REMBG_AVAILABLE else {}
+    inference_before = model_stats.get("total_inference_seconds", 0.0)
+    
+    remover.remove_background(image_path, output_path, **options)
+    
+    model_stats = get_session_manager().stats().get(remover.model_name, {}) if REMBG_AVAILABLE else {}
+    return {
+        "output": output_path,
+        "load_seconds": model_stats.get("load_seconds", 0.0),
+        "inference_seconds": model_stats.get("total_inference_seconds", 0.0) - inference_before
+    }
 
 
 class BackgroundRemover:
@@ -41,6 +76,28 @@ class BackgroundRemover:
         self.default_strength = bg_config.get("default_strength", 0.8)
         self.default_bg_color = bg_config.get("background_color", "#FFFFFF")
         self.preserve_shadows = bg_config.get("preserve_shadows", True)
+        # Larger inputs are downscaled before inference; alpha matting
+        # memory grows with pixel count (0 = no limit)
+        self.max_input_dimension = bg_config.get("max_input_dimension", 4000)
+        # Model family per use: a light model for previews, the profile's
+        # model for saved output ("model" still pins an explicit model)
+        self.profile = bg_config.get("profile", DEFAULT_PROFILE)
+        self.model_name = bg_config.get("model") or model_for_profile(self.profile)
+        self.preview_model_name = model_for_profile(
+            bg_config.get("preview_profile", DEFAULT_PREVIEW_PROFILE)
+        )
+        # Long side of the first, coarse progressive-preview stage
+        self.preview_size = bg_config.get("preview_size", 384)
+        # Segment a downscaled proxy and refine the mask at full size
+        self.proxy_inference = bg_config.get("proxy_inference", True)
+        self.proxy_size = bg_config.get("proxy_size", 1024)
+        self.band_width = bg_config.get("band_width", 12)
+        # Batch removal: worker processes x ONNX intra-op threads (0 = auto)
+        self.parallel_workers = bg_config.get("parallel_workers", 0)
+        self.intra_op_threads = bg_config.get("intra_op_threads", 0)
+        self.image_timeout = bg_config.get("image_timeout", 600)
+        # Raw alpha per source image; re-styling skips segmentation
+        self.mask_cache = MaskCache.from_config(self.config)
         
     def remove_background(
         self,
@@ -54,11 +111,15 @@ class BackgroundRemover:
         """
         Remove background from an image.
         
+        Segmentation results are cached per source image, model and
+        strength, so changing only the background, shadows or feathering
+        re-runs compositing alone.
+        
         Args:
             image_path: Path to input image
             output_path: Path for output (auto-generated if not provided)
             strength: Removal strength 0.0-1.0 (higher = more aggressive)
-            bg_color: Background color hex code or "transparent"
+            bg_color: Background color hex code, "gradient:#top,#bottom" or "transparent"
             preserve_shadows: Attempt to preserve natural shadows
             feather_amount: Edge feathering pixels
             
@@ -75,174 +136,182 @@ class BackgroundRemover:
         else:
             output_path = Path(output_path)
         
-        # Open the image
-        with Image.open(input_path) as img:
-            # Convert to RGBA if needed
-            if img.mode != "RGBA":
-                img = img.convert("RGBA")
-            
-            # Use rembg if available
-            if REMBG_AVAILABLE:
-                result = self._remove_with_rembg(img, strength)
-            else:
-                # Log warning instead of showing to user (less intrusive)
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.warning(
-                    "rembg not installed. Using fallback background removal method.\n"
-                    "For best results, install rembg:\n"
-                    "  CPU version: pip install rembg\n"
-                    "  GPU version (NVIDIA): pip install rembg[gpu]\n"
-                    "Note: First run will download the AI model (~170MB)"
-                )
-                result = self._remove_fallback(img, strength)
-            
-            # Apply feathering to edges
-            if feather_amount > 0:
-                result = self._feather_edges(result, feather_amount)
-            
-            # Apply background color
-            if bg_color.lower() != "transparent":
-                result = self._apply_background(result, bg_color, preserve_shadows)
-            
-            # Save result
-            if output_path.suffix.lower() == ".webp":
-                result.save(output_path, format="WEBP", quality=90)
-            elif output_path.suffix.lower() == ".png":
-                result.save(output_path, format="PNG")
-            else:
-                # Convert to RGB for JPEG
-                if result.mode == "RGBA":
-                    background = Image.new("RGB", result.size, self._hex_to_rgb(bg_color))
-                    background.paste(result, mask=result.split()[-1])
-                    result = background
-                result.save(output_path, quality=90)
+        # Cutout with the raw alpha (from the mask cache when possible)
+        result = self._cutout(input_path, strength)
+        
+        # Feather, shadow and background fill in one compositing pass
+        # (RGB out, or RGBA when the background is transparent)
+        result = composite_image(result, bg_color, preserve_shadows, feather_amount)
+        
+        # Save result
+        if output_path.suffix.lower() == ".webp":
+            result.save(output_path, format="WEBP", quality=90)
+        elif output_path.suffix.lower() == ".png":
+            result.save(output_path, format="PNG")
+        else:
+            # JPEG has no alpha: flatten a transparent cutout onto white
+            if result.mode == "RGBA":
+                result = composite_image(result, "#FFFFFF", preserve_shadows=False)
+            result.save(output_path, quality=90)
         
         return str(output_path)
     
-    def _remove_with_rembg(self, img: Image.Image, strength: float) -> Image.Image:
-        """Use rembg for AI-powered background removal."""
-        # rembg works on the raw image
-        result = rembg_remove(
-            img,
-            alpha_matting=True,
-            alpha_matting_foreground_threshold=int(240 * strength),
-            alpha_matting_background_threshold=int(20 * (1 - strength)),
-            alpha_matting_erode_size=int(10 * strength)
-        )
-        return result
-    
-    def _remove_fallback(self, img: Image.Image, strength: float) -> Image.Image:
+    def _cutout(self, image_path: Path, strength: float, model_name: Optional[str] = None) -> Image.Image:
         """
-        Fallback background removal using edge detection.
-        Not as good as AI, but works without additional dependencies.
-        """
-        # Convert to numpy for processing
-        img_array = np.array(img)
-        
-        # Simple edge-based detection
-        # This is a basic fallback - actual edge detection would be more complex
-        
-        # Fallback method - basic edge detection
-        # Warning is shown at call site, not here
-        
-        # Create a simple mask based on color similarity to edges
-        # This is a very basic approach
-        gray = img.convert("L")
-        edges = gray.filter(ImageFilter.FIND_EDGES)
+        RGBA cutout (raw alpha, before feathering) of an image.
         
-        # Threshold the edges
-        threshold = int(128 * strength)
-        mask = edges.point(lambda x: 255 if x > threshold else 0)
+        The alpha is looked up in the mask cache first; on a miss the
+        image is segmented and the mask stored for the next call.
+        model_name defaults to the output model (self.model_name).
+        """
+        model_name = model_name or self.model_name
+        # Decode (capped at max_input_dimension); the source frame is
+        # released before inference so only the working copy stays in memory
+        img = self._load_for_removal(image_path)
         
-        # Dilate the mask
-        mask = mask.filter(ImageFilter.MaxFilter(5))
+        cache_key = None
+        if self.mask_cache:
+            try:
+                cache_key = self.mask_cache.make_key(str(image_path), self._mask_options(strength, model_name))
+                mask = self.mask_cache.get_mask(cache_key, img.size)
+            except OSError as e:
+                logger.warning(f"Mask cache unavailable for {image_path.name}: {e}")
+                cache_key, mask = None, None
+            if mask is not None:
+                logger.debug(f"Mask cache hit for {image_path.name}")
+                img.putalpha(mask)
+                return img
         
-        # Apply mask
-        img.putalpha(mask)
+        if REMBG_AVAILABLE:
+            result = self._remove_with_rembg(img, strength, model_name)
+        else:
+            # Log warning instead of showing to user (less intrusive)
+            logger.warning(
+                "rembg not installed. Using fallback background removal method.\n"
+                "For best results, install rembg:\n"
+                "  CPU version: pip install rembg\n"
+                "  GPU version (NVIDIA): pip install rembg[gpu]\n"
+                "Note: First run will download the AI model (~170MB)"
+            )
+            result = self._remove_fallback(img, strength)
+        del img
         
-        return img
+        if cache_key:
+            self.mask_cache.put_mask(cache_key, result.getchannel("A"), {"source": image_path.name})
+        return result
     
-    def _feather_edges(self, img: Image.Image, amount: int) -> Image.Image:
-        """Apply feathering to image edges for smoother cutout."""
-        if img.mode != "RGBA":
-            return img
-        
-        # Get alpha channel
-        r, g, b, a = img.split()
+    def _mask_options(self, strength: float, model_name: str) -> dict:
+        """Every setting that shapes the raw mask (mask cache key)."""
+        options = {
+            "method": "rembg" if REMBG_AVAILABLE else "fallback",
+            "strength": round(float(strength), 3),
+            "max_input_dimension": self.max_input_dimension
+        }
+        if REMBG_AVAILABLE:
+            options.update({
+                "model": model_name,
+                "proxy_inference": self.proxy_inference,
+                "proxy_size": self.proxy_size if self.proxy_inference else None,
+                "band_width": self.band_width if self.proxy_inference else None
+            })
+        return options
+    
+    def _load_for_removal(self, image_path: Path, max_dimension: Optional[int] = None) -> Image.Image:
+        """
+        Decode an image as RGBA, no larger than max_dimension
+        (default: max_input_dimension).
         
-        # Blur the alpha slightly for feathering
-        a = a.filter(ImageFilter.GaussianBlur(radius=amount))
+        JPEGs are decoded at a reduced scale when possible; other formats
+        are downscaled right after decoding, before any working copies.
+        """
+        max_dimension = self.max_input_dimension if max_dimension is None else max_dimension
+        with Image.open(image_path) as src:
+            draft_for_max_dimension(src, max_dimension)
+            img = src.convert("RGBA")
         
-        # Recombine
-        return Image.merge("RGBA", (r, g, b, a))
+        if max_dimension and max(img.size) > max_dimension:
+            img.thumbnail(
+                (max_dimension, max_dimension),
+                Image.Resampling.LANCZOS,
+                reducing_gap=3.0
+            )
+        return img
     
-    def _apply_background(
+    def _remove_with_rembg(
         self,
         img: Image.Image,
-        bg_color: str,
-        preserve_shadows: bool
+        strength: float,
+        model_name: Optional[str] = None
     ) -> Image.Image:
-        """Apply a solid background color."""
-        if img.mode != "RGBA":
-            return img
-        
-        # Create background
-        rgb_color = self._hex_to_rgb(bg_color)
-        background = Image.new("RGBA", img.size, (*rgb_color, 255))
-        
-        if preserve_shadows:
-            # Blend with slight shadow preservation
-            # Create a shadow layer from the alpha
-            r, g, b, a = img.split()
-            
-            # Invert and darken for shadow
-            shadow = ImageOps.invert(a)
-            shadow = shadow.point(lambda x: int(x * 0.1))  # Subtle shadow
-            
-            # Apply shadow to background
-            shadow_layer = Image.new("RGBA", img.size, (0, 0, 0, 0))
-            shadow_layer.putalpha(shadow)
-            
-            # Composite: background -> shadow -> foreground
-            result = Image.alpha_composite(background, shadow_layer)
-            result = Image.alpha_composite(result, img)
-        else:
-            result = Image.alpha_composite(background, img)
+        """Use rembg for AI-powered background removal."""
+        model_name = model_name or self.model_name
+        if self.proxy_inference:
+            return self._remove_with_proxy(img, strength, model_name)
         
+        # rembg works on the raw image; the shared session keeps the model loaded
+        result = get_session_manager().remove(
+            img,
+            model_name,
+            alpha_matting=True,
+            alpha_matting_foreground_threshold=int(240 * strength),
+            alpha_matting_background_threshold=int(20 * (1 - strength)),
+            alpha_matting_erode_size=int(10 * strength)
+        )
         return result
     
-    def _hex_to_rgb(self, hex_color: str) -> Tuple[int, int, int]:
-        """Convert hex color to RGB tuple with validation."""
-        hex_color = hex_color.lstrip('#')
-        if len(hex_color) != 6:
-            raise ValueError(f"Invalid hex color length: {hex_color}")
-        if not all(c in '0123456789ABCDEFabcdef' for c in hex_color):
-            raise ValueError(f"Invalid hex color characters: {hex_color}")
-        return (
-            int(hex_color[0:2], 16),
-            int(hex_color[2:4], 16),
-            int(hex_color[4:6], 16)
-        )
+    def _remove_with_proxy(self, img: Image.Image, strength: float, model_name: str) -> Image.Image:
+        """
+        Segment a downscaled proxy, then refine the mask at full resolution.
+        
+        The model only sees proxy_size pixels; the mask is upsampled with a
+        guided filter and matting runs only in a thin band along the outline.
+        Strength sets the alpha cutoff, band width and matting thresholds
+        (see refine_options).
+        """
+        proxy = make_proxy(img, self.proxy_size)
+        mask = get_session_manager().remove(proxy, model_name, only_mask=True)
+        del proxy
+        
+        alpha = refine_alpha(img, mask, **refine_options(strength, self.band_width))
+        img.putalpha(alpha)
+        return img
+    
+    def _remove_fallback(self, img: Image.Image, strength: float) -> Image.Image:
+        """
+        Fallback background removal without ML dependencies.
+        
+        Border colour model + border-connected flood fill + morphology
+        (see classic_segmenter.py); works well on plain studio backgrounds.
+        """
+        # Warning is shown at call site, not here
+        img.putalpha(segment_foreground(img, strength))
+        return img
     
     def batch_remove(
         self,
         folder_path: str,
         output_folder: Optional[str] = None,
         progress_callback: Optional[Callable[[int, int, str], None]] = None,
+        workers: Optional[int] = None,
         **kwargs
     ) -> dict:
         """
         Remove backgrounds from all images in a folder.
         
+        With more than one worker, images are processed in a process pool;
+        each worker loads its own model with a fixed ONNX thread count
+        (see process_pool.split_cores), so workers x threads matches the
+        CPU instead of every session claiming all cores.
+        
         Args:
             folder_path: Input folder path
             output_folder: Output folder (creates 'processed' subfolder if not provided)
             progress_callback: Optional callback(current, total, filename) for progress updates
+            workers: Worker processes (default: config parallel_workers, 0 = auto)
             **kwargs: Options passed to remove_background
             
         Returns:
-            Dictionary with results
+            Dictionary with results, including throughput (images_per_minute)
         """
         folder = Path(folder_path)
         
@@ -267,63 +336,154 @@ class BackgroundRemover:
         if not images:
             return results
         
-        # Pre-warm rembg on first image if available (downloads model on first use)
-        if REMBG_AVAILABLE and images:
-            try:
-                # Quick test to trigger model download
-                test_img = Image.open(images[0])
-                if test_img.mode != "RGBA":
-                    test_img = test_img.convert("RGBA")
-                _ = rembg_remove(test_img)
-                test_img.close()
-            except Exception as e:
-                import logging
-                logger = logging.getLogger(__name__)
-                logger.warning(f"rembg pre-warm failed: {e}")
-        
-        for i, img_path in enumerate(images, 1):
-            if progress_callback:
-                progress_callback(i, len(images), img_path.name)
+        worker_count, threads = split_cores(
+            len(images),
+            self.parallel_workers if workers is None else workers,
+            self.intra_op_threads
+        )
+        results["workers"] = worker_count
+        results["threads_per_worker"] = threads
+        
+        budget = get_memory_budget(self.config)
+        output_paths = [output_dir / f"{img_path.stem}-bgremoved.webp" for img_path in images]
+        # Removal holds several RGBA frames (input, matte, composite)
+        costs = [
+            estimate_decode_bytes(str(img_path), self.max_input_dimension, working_copies=4)
+            for img_path in images
+        ]
+        outcomes = []
+        start = time.perf_counter()
+        
+        if worker_count > 1:
+            logger.info(
+                f"Removing backgrounds from {len(images)} images with "
+                f"{worker_count} workers x {threads} threads"
+            )
             
-            try:
-                output_path = output_dir / f"{img_path.stem}-bgremoved.webp"
-                self.remove_background(str(img_path), str(output_path), **kwargs)
+            def pool_progress(completed: int, total: int, index: int) -> None:
+                if progress_callback:
+                    progress_callback(completed, total, images[index].name)
+            
+            outcomes = run_in_pool(
+                _remove_in_worker,
+                [(str(img_path), str(out), kwargs) for img_path, out in zip(images, output_paths)],
+                workers=worker_count,
+                timeout=self.image_timeout,
+                progress_callback=pool_progress,
+                initializer=_init_removal_worker,
+                initargs=(self.config, threads),
+                budget=budget,
+                job_costs=costs
+            )
+        else:
+            # Load the model once up front (shared with later single-image calls)
+            if REMBG_AVAILABLE:
+                try:
+                    get_session_manager().get_session(self.model_name)
+                except RuntimeError as e:
+                    logger.warning(f"rembg session unavailable: {e}")
+            
+            for i, (img_path, output_path, cost) in enumerate(zip(images, output_paths, costs), 1):
+                if progress_callback:
+                    progress_callback(i, len(images), img_path.name)
                 
+                try:
+                    with budget.reserve(cost):
+                        self.remove_background(str(img_path), str(output_path), **kwargs)
+                    outcomes.append({"result": {"output": str(output_path)}, "error": None})
+                except Exception as e:
+                    outcomes.append({"result": None, "error": str(e)})
+        
+        elapsed = time.perf_counter() - start
+        
+        for img_path, outcome in zip(images, outcomes):
+            if outcome["error"] is None:
                 results["processed"] += 1
-                results["files"].append(str(output_path))
-                
-            except Exception as e:
+                results["files"].append(outcome["result"]["output"])
+            else:
                 results["failed"] += 1
                 results["errors"].append({
                     "file": img_path.name,
-                    "error": str(e)
+                    "error": outcome["error"]
                 })
         
+        results["elapsed_seconds"] = round(elapsed, 1)
+        results["images_per_minute"] = round(results["processed"] / elapsed * 60, 1) if elapsed > 0 else 0.0
+        
+        if REMBG_AVAILABLE:
+            if worker_count > 1:
+                results["timing"] = self._pool_timing([o["result"] for o in outcomes if o["result"]])
+            else:
+                results["timing"] = get_session_manager().stats().get(self.model_name, {})
+        if self.mask_cache and worker_count == 1:
+            results["mask_cache_hits"] = self.mask_cache.hits
+        
+        logger.info(
+            f"Background removal: {results['processed']}/{results['total']} images in "
+            f"{results['elapsed_seconds']}s ({results['images_per_minute']} images/min, "
+            f"{worker_count} workers x {threads} threads)"
+        )
         return results
     
+    def _pool_timing(self, worker_results: list) -> dict:
+        """Model load and inference timings summed over pool workers' results."""
+        calls = sum(1 for r in worker_results if r["inference_seconds"] > 0)
+        total_inference = sum(r["inference_seconds"] for r in worker_results)
+        return {
+            "load_seconds": max((r["load_seconds"] for r in worker_results), default=0.0),
+            "calls": calls,
+            "total_inference_seconds": round(total_inference, 2),
+            "avg_inference_seconds": round(total_inference / calls, 3) if calls else 0.0
+        }
+    
     def preview_removal(
         self,
         image_path: str,
-        strength: float = 0.8
+        strength: float = 0.8,
+        final: bool = False
     ) -> Image.Image:
         """
         Preview background removal without saving.
         
+        Uses the light preview model unless final is set, so previews stay
+        fast while photos are still being arranged.
+        
         Args:
             image_path: Path to input image
             strength: Removal strength
+            final: Use the output model instead of the preview model
             
         Returns:
             PIL Image with removed background (RGBA)
         """
-        with Image.open(image_path) as img:
-            if img.mode != "RGBA":
-                img = img.convert("RGBA")
+        model_name = self.model_name if final else self.preview_model_name
+        return self._cutout(Path(image_path), strength, model_name)
+    
+    def quick_preview(
+        self,
+        image_path: str,
+        strength: float = 0.8,
+        max_dimension: int = 0
+    ) -> Image.Image:
+        """
+        First, coarse stage of a progressive preview.
+        
+        Decodes a small proxy (JPEG draft decode where possible) and
+        segments it with the preview model, typically in well under a
+        second. Not cached: it is cheap and superseded by preview_removal().
+        
+        Args:
+            image_path: Path to input image
+            strength: Removal strength
+            max_dimension: Proxy size (default: preview_size from config)
             
-            if REMBG_AVAILABLE:
-                return self._remove_with_rembg(img, strength)
-            else:
-                return self._remove_fallback(img, strength)
+        Returns:
+            Small RGBA cutout
+        """
+        img = self._load_for_removal(Path(image_path), max_dimension or self.preview_size)
+        if REMBG_AVAILABLE:
+            return self._remove_with_rembg(img, strength, self.preview_model_name)
+        return self._remove_fallback(img, strength)
 
 
 def install_rembg(use_gpu: bool = False):
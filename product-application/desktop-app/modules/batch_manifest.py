@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Batch Manifest Module
+Per-folder record of where each image is in an optimization run, so an
+interrupted batch (crash, app closed, power loss) resumes where it stopped.
+
+Each input moves through:
+    pending -> encoded -> verified -> original_deleted
+or ends in "failed". The manifest is rewritten atomically (temp file +
+os.replace) on every state change, so it is never half-written.
+
+Layout:
+    <folder>/processed/.batch_manifest.json
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = ".batch_manifest.json"
+MANIFEST_VERSION = 1
+
+STATE_PENDING = "pending"
+STATE_ENCODED = "encoded"
+STATE_VERIFIED = "verified"
+STATE_ORIGINAL_DELETED = "original_deleted"
+STATE_FAILED = "failed"
+
+# States whose output was checked and can be reused by a re-run
+COMPLETED_STATES = (STATE_VERIFIED, STATE_ORIGINAL_DELETED)
+
+
+def options_fingerprint(options: Dict[str, Any]) -> str:
+    """Short hash of the processing options that affect output bytes."""
+    material = json.dumps(options, sort_keys=True, default=str)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()[:16]
+
+
+class BatchManifest:
+    """
+    Atomic, per-folder processing manifest.
+
+    Entries are keyed by source filename and hold: state, source size and
+    mtime (to notice a replaced file), options fingerprint, output path,
+    the process_image() result once encoded, and the last error.
+    """
+
+    def __init__(self, folder_path: str):
+        self.folder = Path(folder_path)
+        self.path = self.folder / "processed" / MANIFEST_NAME
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable batch manifest {self.path}: {e}")
+            return
+
+        if data.get("version") != MANIFEST_VERSION:
+            logger.info(f"Batch manifest version changed, starting fresh: {self.path}")
+            return
+        self.entries = data.get("entries", {})
+
+    def save(self) -> None:
+        """Write the manifest atomically."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(f".{os.getpid()}.tmp")
+        payload = {"version": MANIFEST_VERSION, "updated": time.time(), "entries": self.entries}
+
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(payload, f, indent=1, default=str)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def get(self, source_path: str) -> Optional[Dict[str, Any]]:
+        """Entry for a source file, or None."""
+        return self.entries.get(Path(source_path).name)
+
+    def mark(self, source_path: str, state: str, save: bool = True, **fields: Any) -> None:
+        """
+        Record a new state for a source file.
+
+        Args:
+            source_path: Source image path
+            state: One of the STATE_* constants
+            save: Write the manifest now (False when batching updates)
+            **fields: Extra entry fields (fingerprint, output_path, result, error)
+        """
+        name = Path(source_path).name
+        entry = self.entries.setdefault(name, {})
+
+        if state == STATE_PENDING:
+            entry.clear()
+            try:
+                stat = Path(source_path).stat()
+                entry.update({"source_size": stat.st_size, "source_mtime_ns": stat.st_mtime_ns})
+            except OSError:
+                pass
+
+        entry.update(fields)
+        entry["state"] = state
+        entry["updated"] = time.time()
+        if state != STATE_FAILED:
+            entry.pop("error", None)
+
+        if save:
+            self.save()
+
+    def completed_entry(self, source_path: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the entry if this source was already fully processed with the
+        same options and its output is still on disk, else None.
+        """
+        entry = self.get(source_path)
+        if not entry or entry.get("state") not in COMPLETED_STATES:
+            return None
+        if entry.get("fingerprint") != fingerprint:
+            return None
+        if not entry.get("output_path") or not Path(entry["output_path"]).exists():
+            return None
+
+        source = Path(source_path)
+        if source.exists():
+            # Same name but different file (re-shot photo) -> process again
+            stat = source.stat()
+            if (stat.st_size, stat.st_mtime_ns) != (entry.get("source_size"), entry.get("source_mtime_ns")):
+                return None
+        elif entry["state"] != STATE_ORIGINAL_DELETED:
+            return None
+
+        return entry
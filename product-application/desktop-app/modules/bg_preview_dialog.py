@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Background Preview Dialog Module
+Interactive, progressive background-removal preview with a strength slider.
+
+Each slider change (debounced) starts a new ProgressivePreviewThread: a
+coarse proxy result appears almost immediately and is swapped for the
+full-quality result when it is ready. Older jobs are interrupted, skip
+their full-resolution stage and have late results ignored, so only the
+latest strength is ever shown or refined.
+"""
+
+import logging
+import os
+from typing import Any, Dict, List, Set
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QSlider
+)
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QPixmap, QImage
+
+from .theme_modern import ModernPalette
+from .workers import ProgressivePreviewThread
+
+logger = logging.getLogger(__name__)
+
+# Slider changes are coalesced for this long before a job starts (ms)
+DEBOUNCE_MS = 200
+
+# Threads whose dialog closed before they finished; kept referenced until
+# they do (a QThread destroyed while running aborts the process)
+_detached_threads: Set[ProgressivePreviewThread] = set()
+
+
+class BackgroundPreviewDialog(QDialog):
+    """Tune background-removal strength on one image before saving."""
+
+    def __init__(
+        self,
+        image_path: str,
+        config: Dict[str, Any],
+        strength: float = 0.8,
+        bg_color: str = "#FFFFFF",
+        parent=None
+    ):
+        super().__init__(parent)
+        self.image_path = image_path
+        self.config = config
+        self.bg_color = bg_color
+        self._generation = 0
+        # Raised as soon as the slider moves, before the debounced job starts
+        self._requested_generation = 0
+        self._threads: List[ProgressivePreviewThread] = []
+
+        self.setWindowTitle(f"Remove Background - {os.path.basename(image_path)}")
+        try:
+            self.setWindowFlags(self.windowFlags() & ~Qt.WindowContextHelpButtonHint)
+        except Exception:
+            pass
+        self.setMinimumSize(800, 650)
+        self.setStyleSheet(ModernPalette.get_stylesheet())
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(DEBOUNCE_MS)
+        self._debounce.timeout.connect(self._start_preview)
+
+        self.setup_ui(strength)
+        self._start_preview()
+
+    def setup_ui(self, strength: float):
+        layout = QVBoxLayout(self)
+
+        self.image_label = QLabel("Preparing preview...")
+        self.image_label.setAlignment(Qt.AlignCenter)
+        self.image_label.setMinimumSize(780, 540)
+        layout.addWidget(self.image_label)
+
+        controls = QHBoxLayout()
+        controls.addWidget(QLabel("Strength:"))
+        self.slider = QSlider(Qt.Horizontal)
+        self.slider.setRange(1, 100)
+        self.slider.setValue(int(round(strength * 100)))
+        self.slider.valueChanged.connect(self._on_strength_changed)
+        controls.addWidget(self.slider)
+        self.strength_label = QLabel(f"{self.slider.value()}%")
+        self.strength_label.setFixedWidth(48)
+        controls.addWidget(self.strength_label)
+        layout.addLayout(controls)
+
+        self.status_label = QLabel("")
+        self.status_label.setStyleSheet(f"color: {ModernPalette.TEXT_MUTED};")
+        layout.addWidget(self.status_label)
+
+        buttons = QHBoxLayout()
+        buttons.addStretch()
+        cancel_btn = QPushButton("Cancel")
+        cancel_btn.clicked.connect(self.reject)
+        buttons.addWidget(cancel_btn)
+        self.apply_btn = QPushButton("Remove Background")
+        self.apply_btn.setProperty("variant", "primary")
+        self.apply_btn.clicked.connect(self.accept)
+        buttons.addWidget(self.apply_btn)
+        layout.addLayout(buttons)
+
+    def strength(self) -> float:
+        """Currently selected strength (0.01-1.0)."""
+        return self.slider.value() / 100
+
+    def _on_strength_changed(self, value: int) -> None:
+        self.strength_label.setText(f"{value}%")
+        self._requested_generation = self._generation + 1
+        self._debounce.start()
+
+    def _start_preview(self) -> None:
+        """Supersede any running job and start one for the current strength."""
+        self._cancel_running()
+        self._generation += 1
+        self._requested_generation = self._generation
+
+        thread = ProgressivePreviewThread(
+            self.image_path, self.config, self.strength(), self._generation, self.bg_color,
+            latest_generation=lambda: self._requested_generation
+        )
+        thread.stage_ready.connect(self._on_stage_ready)
+        thread.error.connect(self._on_error)
+        thread.finished.connect(lambda t=thread: self._on_thread_finished(t))
+        self._threads.append(thread)
+        self.status_label.setText("Segmenting preview...")
+        thread.start()
+
+    def _cancel_running(self) -> None:
+        for thread in self._threads:
+            thread.requestInterruption()
+
+    def _on_stage_ready(self, generation: int, stage: str, image) -> None:
+        if generation != self._generation:
+            return  # Stale result from a superseded strength
+        self._show(image)
+        if stage == "final":
+            self.status_label.setText("Full-quality preview")
+        else:
+            self.status_label.setText("Quick preview - refining...")
+
+    def _on_error(self, generation: int, message: str) -> None:
+        if generation == self._generation:
+            self.status_label.setText(f"Preview failed: {message}")
+
+    def _on_thread_finished(self, thread: ProgressivePreviewThread) -> None:
+        if thread in self._threads:
+            self._threads.remove(thread)
+        _detached_threads.discard(thread)
+
+    def _show(self, image) -> None:
+        """Display a composited RGB PIL image scaled to the label."""
+        image = image.convert("RGB")
+        qimage = QImage(
+            image.tobytes("raw", "RGB"),
+            image.width, image.height, image.width * 3,
+            QImage.Format_RGB888
+        ).copy()
+        pixmap = QPixmap.fromImage(qimage).scaled(
+            self.image_label.width(), self.image_label.height(),
+            Qt.KeepAspectRatio, Qt.SmoothTransformation
+        )
+        self.image_label.setPixmap(pixmap)
+
+    def done(self, result: int) -> None:
+        """Stop pending work; running threads finish detached."""
+        self._debounce.stop()
+        self._cancel_running()
+        _detached_threads.update(t for t in self._threads if t.isRunning())
+        super().done(result)
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Compositing Module
+NumPy compositing for background-removed cutouts: alpha feathering,
+shadow synthesis and solid or vertical-gradient background fill.
+
+Feathering blurs only the tiles that contain an alpha edge, the shadow
+mask is a single uint8 lookup, and the result is built in one RGB buffer
+with two in-place masked pastes, instead of the split/merge, point()
+callbacks and several full-size RGBA intermediates used before. Results
+match the previous output within +/-1 per channel.
+
+Background specs:
+    "#RRGGBB"                   solid color
+    "gradient:#RRGGBB,#RRGGBB"  vertical gradient, top to bottom
+    "transparent"               keep the alpha channel
+"""
+
+import logging
+from typing import Optional, Tuple, Union
+
+import numpy as np
+from PIL import Image, ImageFilter
+
+logger = logging.getLogger(__name__)
+
+# Fraction of inverse coverage used to darken the background (shadow)
+SHADOW_STRENGTH = 0.1
+
+# Feathering and compositing work on tiles of this size (pixels)
+FEATHER_TILE = 256
+COMPOSITE_TILE = 256
+
+RGB = Tuple[int, int, int]
+
+
+def hex_to_rgb(hex_color: str) -> RGB:
+    """Convert hex color to RGB tuple with validation."""
+    hex_color = hex_color.strip().lstrip('#')
+    if len(hex_color) != 6:
+        raise ValueError(f"Invalid hex color length: {hex_color}")
+    if not all(c in '0123456789ABCDEFabcdef' for c in hex_color):
+        raise ValueError(f"Invalid hex color characters: {hex_color}")
+    return (
+        int(hex_color[0:2], 16),
+        int(hex_color[2:4], 16),
+        int(hex_color[4:6], 16)
+    )
+
+
+def parse_background(spec: str) -> Optional[Union[RGB, Tuple[RGB, RGB]]]:
+    """
+    Parse a background spec.
+
+    Returns:
+        None for "transparent", an RGB tuple for a solid color, or a
+        (top, bottom) pair of RGB tuples for a gradient
+    """
+    spec = spec.strip()
+    if spec.lower() == "transparent":
+        return None
+    if spec.lower().startswith("gradient:"):
+        top, _, bottom = spec[len("gradient:"):].partition(",")
+        return hex_to_rgb(top), hex_to_rgb(bottom)
+    return hex_to_rgb(spec)
+
+
+def feather_alpha(alpha: np.ndarray, amount: int) -> np.ndarray:
+    """
+    Gaussian-blur an alpha plane (uint8).
+
+    Only tiles whose neighbourhood contains an alpha edge are blurred;
+    a constant region blurs to itself. Each tile is blurred with a margin
+    wider than the kernel, so the result equals a full-frame blur.
+    """
+    if amount <= 0:
+        return alpha
+
+    height, width = alpha.shape
+    margin = 4 * amount + 4
+    blur = ImageFilter.GaussianBlur(radius=amount)
+    out = alpha.copy()
+
+    for top in range(0, height, FEATHER_TILE):
+        for left in range(0, width, FEATHER_TILE):
+            y0, y1 = max(0, top - margin), min(height, top + FEATHER_TILE + margin)
+            x0, x1 = max(0, left - margin), min(width, left + FEATHER_TILE + margin)
+            region = alpha[y0:y1, x0:x1]
+            if region.min() == region.max():
+                continue
+            blurred = np.asarray(Image.fromarray(region, "L").filter(blur))
+            bottom, right = min(height, top + FEATHER_TILE), min(width, left + FEATHER_TILE)
+            out[top:bottom, left:right] = blurred[top - y0:bottom - y0, left - x0:right - x0]
+
+    return out
+
+
+def shadow_lut() -> np.ndarray:
+    """uint8 lookup: alpha -> shadow mask floor((255 - a) * SHADOW_STRENGTH)."""
+    return ((255 - np.arange(256)) * SHADOW_STRENGTH).astype(np.uint8)
+
+
+def _full_shadow_lut() -> np.ndarray:
+    """
+    Channel lookup for fully transparent pixels: what pasting black through
+    the alpha-0 shadow mask does to a background value (PIL's own rounding).
+    """
+    ramp = Image.frombytes("L", (256, 1), bytes(range(256)))
+    ramp.paste(0, mask=Image.new("L", (256, 1), int(shadow_lut()[0])))
+    return np.asarray(ramp)[0]
+
+
+def background_column(background: Union[RGB, Tuple[RGB, RGB]], height: int) -> np.ndarray:
+    """Background color per row, (height, 3) uint8 (solid or vertical gradient)."""
+    if isinstance(background[0], tuple):
+        top, bottom = (np.asarray(c, dtype=np.float32) for c in background)
+        t = np.linspace(0.0, 1.0, height, dtype=np.float32)[:, None]
+        return np.clip(top + (bottom - top) * t + 0.5, 0, 255).astype(np.uint8)
+    return np.tile(np.asarray(background, dtype=np.uint8), (height, 1))
+
+
+def _stretch(column: np.ndarray, width: int) -> Image.Image:
+    """RGB image whose every row is one color of column (stretched in C)."""
+    if (column == column[0]).all():
+        return Image.new("RGB", (width, column.shape[0]), tuple(int(v) for v in column[0]))
+    return Image.fromarray(np.ascontiguousarray(column[:, None, :]), "RGB").resize(
+        (width, column.shape[0]), Image.Resampling.NEAREST
+    )
+
+
+def _classify_tiles(alpha8: np.ndarray):
+    """Yield ((left, top, right, bottom), kind) with kind "clear", "opaque" or "edge"."""
+    height, width = alpha8.shape
+    for top in range(0, height, COMPOSITE_TILE):
+        for left in range(0, width, COMPOSITE_TILE):
+            bottom, right = min(height, top + COMPOSITE_TILE), min(width, left + COMPOSITE_TILE)
+            tile = alpha8[top:bottom, left:right]
+            low, high = tile.min(), tile.max()
+            if high == 0:
+                kind = "clear"
+            elif low == 255:
+                kind = "opaque"
+            else:
+                kind = "edge"
+            yield (left, top, right, bottom), kind
+
+
+def composite(
+    img: Image.Image,
+    background: Optional[Union[RGB, Tuple[RGB, RGB]]],
+    preserve_shadows: bool = True,
+    feather_amount: int = 0
+) -> Image.Image:
+    """
+    Feather the alpha and composite the cutout over a background.
+
+    The frame is handled in tiles: fully transparent tiles keep the
+    (uniformly darkened) background, fully opaque tiles copy the cutout,
+    and only edge tiles run the shadow and alpha blends. Single-plane math
+    is NumPy; three-channel blends use PIL's C paste-through-mask, which
+    measured faster than NumPy on interleaved RGB.
+
+    Args:
+        img: RGBA cutout
+        background: From parse_background(); None keeps transparency
+        preserve_shadows: Darken the background by the inverse coverage
+        feather_amount: Alpha blur radius in pixels
+
+    Returns:
+        RGB image (opaque background) or RGBA (transparent)
+    """
+    if img.mode != "RGBA":
+        img = img.convert("RGBA")
+
+    alpha8 = np.asarray(img.getchannel("A"))
+    if feather_amount > 0:
+        alpha8 = feather_alpha(alpha8, feather_amount)
+
+    if background is None:
+        result = img.copy()
+        result.putalpha(Image.fromarray(alpha8, "L"))
+        return result
+
+    column = background_column(background, img.height)
+    # Start from the background as it looks under fully transparent pixels
+    result = _stretch(_full_shadow_lut()[column] if preserve_shadows else column, img.width)
+    lut = shadow_lut()
+
+    for box, kind in _classify_tiles(alpha8):
+        if kind == "clear":
+            continue
+        if kind == "opaque":
+            result.paste(img.crop(box).convert("RGB"), box[:2])
+            continue
+
+        left, top, right, bottom = box
+        tile_alpha = alpha8[top:bottom, left:right]
+        tile = _stretch(column[top:bottom], right - left)
+        if preserve_shadows:
+            tile.paste((0, 0, 0), mask=Image.fromarray(lut[tile_alpha], "L"))
+        tile.paste(img.crop(box), mask=Image.fromarray(np.ascontiguousarray(tile_alpha), "L"))
+        result.paste(tile, box[:2])
+
+    return result
+
+
+def composite_image(
+    img: Image.Image,
+    bg_spec: str,
+    preserve_shadows: bool = True,
+    feather_amount: int = 0
+) -> Image.Image:
+    """composite() with a background spec string ("#RRGGBB", "gradient:...", "transparent")."""
+    return composite(img, parse_background(bg_spec), preserve_shadows, feather_amount)
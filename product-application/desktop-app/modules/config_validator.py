@@ -105,6 +105,21 @@ class ConfigValidator:
         
         # Model validation removed - models update frequently and strict validation is too brittle
         # The AI engine will handle invalid models gracefully
+        
+        ttl_hours = ai.get("cache", {}).get("ttl_hours", 168)
+        if not isinstance(ttl_hours, (int, float)) or ttl_hours <= 0:
+            self.warnings.append("AI: cache.ttl_hours should be a positive number of hours")
+        
+        concurrency = ai.get("max_concurrent_requests", 4)
+        if not isinstance(concurrency, int) or concurrency < 1:
+            self.warnings.append("AI: max_concurrent_requests should be a positive integer")
+        
+        if ai.get("listing_mode", "single") not in ("single", "parallel"):
+            self.warnings.append("AI: listing_mode should be 'single' or 'parallel'")
+        
+        for key, value in ai.get("rate_limits", {}).items():
+            if key.endswith("_per_minute") and (not isinstance(value, (int, float)) or value < 0):
+                self.warnings.append(f"AI: rate_limits.{key} should be a non-negative number (0 = no limit)")
     
     def _validate_categories(self):
         """Validate categories configuration."""
@@ -144,6 +159,36 @@ class ConfigValidator:
         quality = img.get("webp_quality", 88)
         if not (50 <= quality <= 100):
             self.warnings.append("Image Processing: webp_quality should be between 50 and 100")
+        
+        listing_widths = img.get("listing_widths", [])
+        if not isinstance(listing_widths, list) or not all(
+            isinstance(w, int) and w > 0 for w in listing_widths
+        ):
+            self.warnings.append("Image Processing: listing_widths should be a list of positive pixel widths")
+        
+        workers = img.get("parallel_workers", 1)
+        if not isinstance(workers, int) or workers < 0:
+            self.warnings.append("Image Processing: parallel_workers should be 0 (auto) or a positive number")
+        
+        bg_removal = img.get("background_removal", {})
+        for key in ("parallel_workers", "intra_op_threads"):
+            value = bg_removal.get(key, 0)
+            if not isinstance(value, int) or value < 0:
+                self.warnings.append(f"Background Removal: {key} should be 0 (auto) or a positive number")
+        
+        bg_timeout = bg_removal.get("image_timeout", 600)
+        if not isinstance(bg_timeout, (int, float)) or bg_timeout <= 0:
+            self.warnings.append("Background Removal: image_timeout should be a positive number of seconds")
+        
+        budget_mb = img.get("memory_budget_mb", 1024)
+        if not isinstance(budget_mb, int) or budget_mb < 256:
+            self.warnings.append("Image Processing: memory_budget_mb should be at least 256")
+        
+        encode_mode = img.get("adaptive_encoding", {}).get("mode", "fixed")
+        if encode_mode not in ("fixed", "target_size", "quality_floor"):
+            self.warnings.append(
+                "Image Processing: adaptive_encoding.mode should be 'fixed', 'target_size' or 'quality_floor'"
+            )
     
     def _check_common_issues(self):
         """Check for common configuration issues."""
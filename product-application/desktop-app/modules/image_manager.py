@@ -8,9 +8,12 @@ import os
 import shutil
 from pathlib import Path
 from typing import List, Optional, Callable, Dict, Any
-from PIL import Image, ImageOps, ExifTags
+from PIL import ExifTags, Image, ImageOps
 from datetime import datetime
 
+from .image_metadata import get_metadata_service, TRANSPOSED_ORIENTATIONS
+from .memory_budget import get_memory_budget, estimate_decode_bytes, draft_for_max_dimension
+
 
 # Supported image extensions
 IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.tiff', '.bmp'}
@@ -163,34 +166,20 @@ class ImageManager:
         Returns:
             Dict with width, height, format, size_kb, needs_rotation
         """
-        try:
-            with Image.open(image_path) as img:
-                width, height = img.size
-                file_size = Path(image_path).stat().st_size / 1024
-                
-                # Check for EXIF orientation
-                needs_rotation = False
-                try:
-                    exif = img._getexif()
-                    if exif:
-                        for tag, value in exif.items():
-                            if ExifTags.TAGS.get(tag) == 'Orientation':
-                                needs_rotation = value != 1
-                                break
-                except (AttributeError, KeyError):
-                    pass
-                
-                return {
-                    'width': width,
-                    'height': height,
-                    'format': img.format,
-                    'size_kb': round(file_size, 1),
-                    'needs_rotation': needs_rotation,
-                    'is_landscape': width > height,
-                    'is_small': width < 800 or height < 800
-                }
-        except Exception as e:
-            return {'error': str(e)}
+        info = get_metadata_service().get(image_path)
+        if not info['valid']:
+            return {'error': info['error']}
+
+        width, height = info['width'], info['height']
+        return {
+            'width': width,
+            'height': height,
+            'format': info['format'],
+            'size_kb': round(info['file_size'] / 1024, 1),
+            'needs_rotation': info['orientation'] != 1,
+            'is_landscape': width > height,
+            'is_small': width < 800 or height < 800
+        }
 
 
 def apply_exif_orientation(image_path: str) -> Image.Image:
@@ -246,8 +235,17 @@ def optimize_image(
         Dict with success status and details
     """
     try:
-        # Load with EXIF orientation
-        img = apply_exif_orientation(input_path)
+        # Load with EXIF orientation; JPEGs decode at a reduced scale when
+        # the output is much smaller than the source
+        with Image.open(input_path) as src:
+            original_size = src.size
+            if src.getexif().get(ExifTags.Base.Orientation, 1) in TRANSPOSED_ORIENTATIONS:
+                original_size = original_size[::-1]
+            draft_for_max_dimension(src, max_dimension)
+            try:
+                img = ImageOps.exif_transpose(src)
+            except Exception:
+                img = src.copy()
         
         # Convert to RGB if necessary (for WebP compatibility)
         if img.mode in ('RGBA', 'P'):
@@ -258,7 +256,6 @@ def optimize_image(
             img = img.convert('RGB')
         
         # Resize if needed
-        original_size = img.size
         if max(img.size) > max_dimension:
             img.thumbnail((max_dimension, max_dimension), Image.LANCZOS)
         
@@ -352,6 +349,7 @@ def batch_optimize(
     }
     
     total = len(image_paths)
+    budget = get_memory_budget()
     
     for i, input_path in enumerate(image_paths):
         # Generate output filename: SKU-001.webp, SKU-002.webp, etc.
@@ -361,13 +359,15 @@ def batch_optimize(
         if progress_callback:
             progress_callback(i + 1, total, Path(input_path).name)
         
-        result = optimize_image(
-            input_path,
-            output_path,
-            max_dimension=max_dimension,
-            quality=quality,
-            delete_original=delete_originals
-        )
+        # Wait for room under the shared decoded-memory budget
+        with budget.reserve(estimate_decode_bytes(input_path, max_dimension)):
+            result = optimize_image(
+                input_path,
+                output_path,
+                max_dimension=max_dimension,
+                quality=quality,
+                delete_original=delete_originals
+            )
         
         if result['success']:
             results['processed'] += 1
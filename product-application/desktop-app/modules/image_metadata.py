@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Image Metadata Module
+Shared, header-only image metadata reader with an in-memory cache.
+
+Pillow's Image.open() only parses the file header (plus the EXIF segment);
+pixels are never decoded here. Results are cached per path and reused while
+the file's (size, mtime) are unchanged, so grid refreshes, validation and
+upload checks answer repeat queries from memory after a single stat().
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from PIL import Image, ExifTags
+
+logger = logging.getLogger(__name__)
+
+# EXIF tags worth keeping (the rest stay in the file)
+KEY_EXIF_TAGS = {
+    ExifTags.Base.Make: "Make",
+    ExifTags.Base.Model: "Model",
+    ExifTags.Base.Software: "Software",
+    ExifTags.Base.DateTime: "DateTime",
+    ExifTags.Base.Orientation: "Orientation",
+    ExifTags.Base.Artist: "Artist",
+    ExifTags.Base.Copyright: "Copyright",
+}
+KEY_EXIF_IFD_TAGS = {
+    ExifTags.Base.DateTimeOriginal: "DateTimeOriginal",
+    ExifTags.Base.ExposureTime: "ExposureTime",
+    ExifTags.Base.FNumber: "FNumber",
+    ExifTags.Base.ISOSpeedRatings: "ISOSpeedRatings",
+    ExifTags.Base.FocalLength: "FocalLength",
+    ExifTags.Base.LensModel: "LensModel",
+}
+
+# Orientations 5-8 swap width and height when displayed
+TRANSPOSED_ORIENTATIONS = {5, 6, 7, 8}
+
+
+class ImageMetadataService:
+    """
+    Header-only metadata reader with a (path, size, mtime) keyed cache.
+
+    Every entry is a dict with: path, filename, format, mode, width, height,
+    size, display_size, orientation, exif, has_transparency, file_size,
+    mtime, valid (and error when valid is False).
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._cache: "OrderedDict[str, Tuple[Tuple[int, int], Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, image_path: str) -> Dict[str, Any]:
+        """
+        Metadata for one image.
+
+        Returns:
+            Metadata dict (a copy; safe to modify)
+        """
+        try:
+            stat = os.stat(image_path)
+        except OSError as e:
+            return self._invalid(image_path, f"File not found: {e}")
+        return self._get_with_stat(str(image_path), stat)
+
+    def get_many(self, image_paths: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """Metadata for several images, keyed by path."""
+        return {str(path): self.get(str(path)) for path in image_paths}
+
+    def scan_folder(
+        self,
+        folder_path: str,
+        extensions: Optional[Iterable[str]] = None
+    ) -> Dict[str, Dict[str, Any]]:
+        """
+        Metadata for every image in a folder in one call.
+
+        Uses os.scandir, whose entries carry stat data from the directory
+        listing on Windows, so unchanged files cost no extra disk access.
+
+        Args:
+            folder_path: Folder to scan (not recursive)
+            extensions: Lower-case suffixes to include (default: common image types)
+
+        Returns:
+            {path: metadata} sorted by filename
+        """
+        extensions = set(extensions or {'.jpg', '.jpeg', '.png', '.webp', '.tiff', '.tif', '.bmp', '.gif'})
+        results: Dict[str, Dict[str, Any]] = {}
+
+        try:
+            entries = sorted(os.scandir(folder_path), key=lambda e: e.name)
+        except OSError as e:
+            logger.warning(f"Cannot scan {folder_path}: {e}")
+            return results
+
+        for entry in entries:
+            if not entry.is_file() or Path(entry.name).suffix.lower() not in extensions:
+                continue
+            try:
+                results[entry.path] = self._get_with_stat(entry.path, entry.stat())
+            except OSError as e:
+                results[entry.path] = self._invalid(entry.path, str(e))
+
+        return results
+
+    def invalidate(self, image_path: Optional[str] = None) -> None:
+        """Forget one path, or everything when image_path is None."""
+        with self._lock:
+            if image_path is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(str(image_path), None)
+
+    def stats(self) -> Dict[str, int]:
+        """Cache counters."""
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._cache)}
+
+    def _get_with_stat(self, path: str, stat: os.stat_result) -> Dict[str, Any]:
+        """Return cached metadata if (size, mtime) still match, else read the header."""
+        signature = (stat.st_size, stat.st_mtime_ns)
+
+        with self._lock:
+            cached = self._cache.get(path)
+            if cached and cached[0] == signature:
+                self._cache.move_to_end(path)
+                self.hits += 1
+                return dict(cached[1])
+            self.misses += 1
+
+        info = self._read_header(path, stat)
+
+        with self._lock:
+            self._cache[path] = (signature, info)
+            self._cache.move_to_end(path)
+            while len(self._cache) > self.max_entries:
+                self._cache.popitem(last=False)
+
+        return dict(info)
+
+    def _read_header(self, path: str, stat: os.stat_result) -> Dict[str, Any]:
+        """Parse format, size, mode and key EXIF tags without decoding pixels."""
+        try:
+            with Image.open(path) as img:
+                width, height = img.size
+                exif = img.getexif()
+                orientation = int(exif.get(ExifTags.Base.Orientation, 1) or 1)
+
+                exif_data: Dict[str, str] = {}
+                for tag, name in KEY_EXIF_TAGS.items():
+                    if tag in exif:
+                        exif_data[name] = _exif_str(exif[tag])
+                try:
+                    exif_ifd = exif.get_ifd(ExifTags.IFD.Exif)
+                except Exception:
+                    exif_ifd = {}
+                for tag, name in KEY_EXIF_IFD_TAGS.items():
+                    if tag in exif_ifd:
+                        exif_data[name] = _exif_str(exif_ifd[tag])
+
+                display_size = (height, width) if orientation in TRANSPOSED_ORIENTATIONS else (width, height)
+
+                return {
+                    "path": path,
+                    "filename": Path(path).name,
+                    "format": img.format,
+                    "mode": img.mode,
+                    "width": width,
+                    "height": height,
+                    "size": (width, height),
+                    "display_size": display_size,
+                    "orientation": orientation,
+                    "exif": exif_data,
+                    "has_transparency": img.mode in ("RGBA", "LA", "P") or "transparency" in img.info,
+                    "file_size": stat.st_size,
+                    "mtime": stat.st_mtime,
+                    "valid": True
+                }
+        except Exception as e:
+            info = self._invalid(path, str(e))
+            info.update({"file_size": stat.st_size, "mtime": stat.st_mtime})
+            return info
+
+    @staticmethod
+    def _invalid(path: str, error: str) -> Dict[str, Any]:
+        return {"path": str(path), "filename": Path(path).name, "valid": False, "error": error}
+
+
+def _exif_str(value: Any) -> str:
+    """EXIF value as a short display string."""
+    if isinstance(value, bytes):
+        value = value.decode(errors="ignore")
+    return str(value).strip("\x00 ")[:100]  # Truncate long values
+
+
+_service: Optional[ImageMetadataService] = None
+_service_lock = threading.Lock()
+
+
+def get_metadata_service() -> ImageMetadataService:
+    """Process-wide shared metadata service."""
+    global _service
+    with _service_lock:
+        if _service is None:
+            _service = ImageMetadataService()
+        return _service
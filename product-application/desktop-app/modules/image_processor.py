@@ -4,18 +4,36 @@ Image Processor Module
 Handles image optimization, resizing, WebP conversion, and EXIF stripping.
 
 Updated: Deletes original files after successful optimization.
+Updated: Decodes each source once and derives every rendition (full-size,
+listing widths, thumbnail) from a reduce() pyramid of that single decode.
+Updated: Batch runs keep a resumable per-folder manifest (batch_manifest.py).
 """
 
 import os
 from pathlib import Path
-from typing import Optional, Dict, Any, Tuple, List
-from PIL import Image, ImageOps, ExifTags
+from typing import Optional, Dict, Any, Tuple, List, Callable
+from PIL import Image, ImageOps
 import io
 import logging
 
+from .process_pool import resolve_worker_count, run_in_pool
+from .processing_cache import ProcessingCache
+from .adaptive_encoder import AdaptiveWebPEncoder
+from .image_metadata import get_metadata_service
+from .memory_budget import get_memory_budget, estimate_decode_bytes, draft_for_max_dimension
+from .batch_manifest import (
+    BatchManifest, options_fingerprint,
+    STATE_PENDING, STATE_ENCODED, STATE_VERIFIED, STATE_ORIGINAL_DELETED, STATE_FAILED
+)
+
 logger = logging.getLogger(__name__)
 
 
+def _process_image_in_worker(config: dict, input_path: str, options: Dict[str, Any]) -> Dict[str, Any]:
+    """Process-pool entry point (must be module-level to be picklable)."""
+    return ImageProcessor(config).process_image(input_path, options)
+
+
 class ImageProcessor:
     """
     Process images for web optimization.
@@ -26,6 +44,7 @@ class ImageProcessor:
     - Strip EXIF metadata
     - Optimize file size with quality settings
     - Apply color profile normalization
+    - Listing-width renditions and thumbnail from a single decode
     - DELETE ORIGINALS after successful optimization (optional)
     """
     
@@ -36,6 +55,12 @@ class ImageProcessor:
         self.webp_quality = self.image_config.get("webp_quality", 88)
         self.strip_exif = self.image_config.get("strip_exif", True)
         self.thumbnail_size = self.image_config.get("thumbnail_size", 400)
+        self.listing_widths = self.image_config.get("listing_widths", [])
+        self.parallel_workers = self.image_config.get("parallel_workers", 1)  # 0 = auto
+        self.image_timeout = self.image_config.get("image_timeout", 300)
+        self.resume_batches = self.image_config.get("resume_batches", True)
+        self.cache = ProcessingCache.from_config(config)
+        self.encoder = AdaptiveWebPEncoder(self.image_config)
         
     def process_image(
         self,
@@ -52,7 +77,12 @@ class ImageProcessor:
                 - quality: WebP quality 1-100 (default: 88)
                 - strip_exif: Remove EXIF data (default: True)
                 - output_format: Output format (default: "webp")
+                - listing_widths: Extra widths to render, e.g. [1200, 800] (default: config)
                 - delete_originals: Delete source file after success (default: True)
+                - use_cache: Reuse cached output for identical source + options (default: True)
+                - encode_mode: "fixed", "target_size" or "quality_floor" (default: config)
+                - target_kb: Size budget for "target_size" mode
+                - ssim_floor: Minimum SSIM (0-1) for "quality_floor" mode
             
         Returns:
             Dictionary with processed image info
@@ -64,6 +94,7 @@ class ImageProcessor:
         quality = options.get("quality", self.webp_quality)
         strip = options.get("strip_exif", self.strip_exif)
         output_format = options.get("output_format", "webp")
+        listing_widths = options.get("listing_widths", self.listing_widths)
         delete_originals = options.get("delete_originals", True)  # NEW: Default True
         
         input_path = Path(input_path)
@@ -78,12 +109,115 @@ class ImageProcessor:
         
         # Track if we should delete original
         original_deleted = False
+        original_file_size = input_path.stat().st_size
+        
+        # ============================================
+        # CACHE: identical bytes + options -> reuse earlier output
+        # ============================================
+        cache_key = None
+        cached = None
+        if self.cache and options.get("use_cache", True):
+            try:
+                cache_key = self.cache.make_key(str(input_path), self._output_options(options))
+                cached = self.cache.get(cache_key)
+            except OSError as e:
+                logger.warning(f"Processing cache unavailable for {input_path.name}: {e}")
+        
+        if cached:
+            encoded = self._restore_cached(cached, output_path, output_dir, input_path.stem)
+            logger.info(f"Cache hit: {input_path.name}")
+        else:
+            encoded = self._encode_renditions(
+                input_path, output_path, output_dir, max_dim, quality, strip, listing_widths, options
+            )
+            if cache_key:
+                self._store_cached(cache_key, encoded, output_path)
+        
+        new_file_size = output_path.stat().st_size
+        thumb_path = encoded["thumbnail_path"]
+        
+        # ============================================
+        # DELETE ORIGINAL after successful optimization
+        # ============================================
+        if delete_originals and output_path.exists():
+            original_deleted = self._delete_original(input_path)
+        
+        return {
+            "input_path": str(input_path),
+            "output_path": str(output_path),
+            "thumbnail_path": str(thumb_path) if thumb_path else None,
+            "listing_renditions": encoded["listing"],
+            "original_size": encoded["original_size"],
+            "new_size": encoded["new_size"],
+            "original_format": encoded["original_format"],
+            "new_format": "WEBP",
+            "original_file_size": original_file_size,
+            "new_file_size": new_file_size,
+            "compression_ratio": round(new_file_size / original_file_size, 3),
+            "savings_percent": round((1 - new_file_size / original_file_size) * 100, 1),
+            "original_deleted": original_deleted,  # NEW: Track deletion status
+            "cache_hit": cached is not None,
+            **encoded["encoding"]
+        }
+    
+    def _output_options(self, options: Dict[str, Any]) -> Dict[str, Any]:
+        """Every effective option that affects the output bytes (cache key / manifest fingerprint)."""
+        return {
+            "pipeline": "image_processor",
+            "max_dimension": options.get("max_dimension", self.max_dimension),
+            "quality": options.get("quality", self.webp_quality),
+            "strip_exif": options.get("strip_exif", self.strip_exif),
+            "output_format": options.get("output_format", "webp"),
+            "listing_widths": sorted({int(w) for w in options.get("listing_widths", self.listing_widths) or []}),
+            "thumbnail_size": self.thumbnail_size,
+            "encoding": self.encoder.settings(options)
+        }
+    
+    def _delete_original(self, input_path: Path) -> bool:
+        """Delete a source file after its output exists. Returns True if deleted."""
+        try:
+            input_path.unlink()
+            logger.info(f"Deleted original: {input_path.name}")
+            print(f"[OPTIMIZE] 🗑 Deleted original: {input_path.name}")
+            return True
+        except PermissionError as e:
+            logger.warning(f"Permission denied deleting {input_path.name}: {e}")
+            print(f"[OPTIMIZE] ⚠ Could not delete (in use?): {input_path.name}")
+        except Exception as e:
+            logger.warning(f"Could not delete original {input_path.name}: {e}")
+            print(f"[OPTIMIZE] ⚠ Delete failed: {input_path.name} - {e}")
+        return False
+    
+    def _encode_renditions(
+        self,
+        input_path: Path,
+        output_path: Path,
+        output_dir: Path,
+        max_dim: int,
+        quality: int,
+        strip: bool,
+        listing_widths: List[int],
+        options: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Decode the source once and write the full WebP plus every rendition.
         
-        # Open and process image
+        Returns:
+            Dict with original_size, original_format, new_size, listing,
+            thumbnail_path and encoding (the encoder's per-image choice)
+        """
+        # Open and process image - this is the ONLY decode of the source;
+        # every rendition below is derived from these pixels.
         with Image.open(input_path) as img:
             original_size = img.size
             original_format = img.format
             
+            # JPEG: decode at a reduced DCT scale when the output is much smaller
+            draft_for_max_dimension(img, max_dim)
+            
+            # Auto-orient based on EXIF (before any conversion drops the EXIF block)
+            img = ImageOps.exif_transpose(img)
+            
             # Convert to RGB if necessary (handles RGBA, P mode, etc.)
             if img.mode in ("RGBA", "P"):
                 # Create white background for transparency
@@ -95,9 +229,6 @@ class ImageProcessor:
             elif img.mode != "RGB":
                 img = img.convert("RGB")
             
-            # Auto-orient based on EXIF
-            img = ImageOps.exif_transpose(img)
-            
             # Resize if needed
             if max(img.size) > max_dim:
                 img = self._resize_image(img, max_dim)
@@ -106,56 +237,80 @@ class ImageProcessor:
             
             # Strip EXIF if requested
             if strip:
-                # Create clean image without EXIF
+                # Create clean image without EXIF (pixel copy in C, no metadata)
                 clean_img = Image.new(img.mode, img.size)
-                clean_img.putdata(list(img.getdata()))
+                clean_img.paste(img)
                 img = clean_img
             
-            # Save as WebP
-            img.save(
-                output_path,
-                format="WEBP",
-                quality=quality,
-                method=6,  # Highest compression method
-                optimize=True
-            )
+            # Save as WebP (fixed quality, or searched per image by the encoder)
+            encoding = self.encoder.save(img, output_path, quality, options)
             
-            # Get file sizes
-            original_file_size = input_path.stat().st_size
-            new_file_size = output_path.stat().st_size
-            
-            # Generate thumbnail
-            thumb_path = self._create_thumbnail(img, output_dir, input_path.stem)
-        
-        # ============================================
-        # DELETE ORIGINAL after successful optimization
-        # ============================================
-        if delete_originals and output_path.exists():
-            try:
-                input_path.unlink()
-                original_deleted = True
-                logger.info(f"Deleted original: {input_path.name}")
-                print(f"[OPTIMIZE] 🗑 Deleted original: {input_path.name}")
-            except PermissionError as e:
-                logger.warning(f"Permission denied deleting {input_path.name}: {e}")
-                print(f"[OPTIMIZE] ⚠ Could not delete (in use?): {input_path.name}")
-            except Exception as e:
-                logger.warning(f"Could not delete original {input_path.name}: {e}")
-                print(f"[OPTIMIZE] ⚠ Delete failed: {input_path.name} - {e}")
+            # Generate listing widths + thumbnail from the same decoded pixels
+            renditions = self._create_renditions(
+                img, output_dir, input_path.stem, listing_widths,
+                encoding["encode_quality"] if encoding["encode_choice"] == "lossy" else quality
+            )
         
         return {
-            "input_path": str(input_path),
-            "output_path": str(output_path),
-            "thumbnail_path": str(thumb_path) if thumb_path else None,
             "original_size": original_size,
-            "new_size": new_size,
             "original_format": original_format,
-            "new_format": "WEBP",
-            "original_file_size": original_file_size,
-            "new_file_size": new_file_size,
-            "compression_ratio": round(new_file_size / original_file_size, 3),
-            "savings_percent": round((1 - new_file_size / original_file_size) * 100, 1),
-            "original_deleted": original_deleted  # NEW: Track deletion status
+            "new_size": new_size,
+            "listing": renditions["listing"],
+            "thumbnail_path": renditions["thumbnail_path"],
+            "encoding": encoding
+        }
+    
+    def _store_cached(self, cache_key: str, encoded: Dict[str, Any], output_path: Path) -> None:
+        """Copy freshly encoded outputs into the processing cache."""
+        files = {"output": str(output_path)}
+        if encoded["thumbnail_path"]:
+            files["thumbnail"] = str(encoded["thumbnail_path"])
+        for rendition in encoded["listing"]:
+            files[f"listing_{rendition['width']}"] = rendition["path"]
+        
+        meta = {
+            "original_size": list(encoded["original_size"]),
+            "original_format": encoded["original_format"],
+            "new_size": list(encoded["new_size"]),
+            "listing": [{"width": r["width"], "height": r["height"]} for r in encoded["listing"]],
+            "encoding": encoded["encoding"]
+        }
+        try:
+            self.cache.put(cache_key, files, meta)
+        except OSError as e:
+            logger.warning(f"Could not store processing cache entry: {e}")
+    
+    def _restore_cached(
+        self,
+        cached: Dict[str, Any],
+        output_path: Path,
+        output_dir: Path,
+        base_name: str
+    ) -> Dict[str, Any]:
+        """Copy a cache entry's files to this source's output paths."""
+        meta = cached["meta"]
+        destinations = {"output": str(output_path)}
+        
+        thumb_path = None
+        if "thumbnail" in cached["files"]:
+            thumb_path = output_dir / f"{base_name}_thumb.webp"
+            destinations["thumbnail"] = str(thumb_path)
+        
+        listing = []
+        for rendition in meta.get("listing", []):
+            path = output_dir / f"{base_name}_w{rendition['width']}.webp"
+            destinations[f"listing_{rendition['width']}"] = str(path)
+            listing.append({"width": rendition["width"], "height": rendition["height"], "path": str(path)})
+        
+        self.cache.restore(cached, destinations)
+        
+        return {
+            "original_size": tuple(meta["original_size"]),
+            "original_format": meta.get("original_format"),
+            "new_size": tuple(meta["new_size"]),
+            "listing": listing,
+            "thumbnail_path": thumb_path,
+            "encoding": meta.get("encoding", {})
         }
     
     def _resize_image(self, img: Image.Image, max_dim: int) -> Image.Image:
@@ -171,33 +326,81 @@ class ImageProcessor:
             new_height = max_dim
             new_width = int(width * (max_dim / height))
         
-        return img.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        # reducing_gap lets Pillow box-reduce() by an integer factor first and
+        # only run LANCZOS on the remainder - visually identical at gap >= 3
+        return img.resize(
+            (new_width, new_height),
+            Image.Resampling.LANCZOS,
+            reducing_gap=3.0
+        )
     
-    def _create_thumbnail(
+    def _create_renditions(
         self,
         img: Image.Image,
         output_dir: Path,
-        base_name: str
-    ) -> Optional[Path]:
-        """
-        Create a thumbnail version of the image.
+        base_name: str,
+        listing_widths: List[int],
+        quality: int
+    ) -> Dict[str, Any]:
         """
-        try:
-            thumb = img.copy()
-            thumb.thumbnail((self.thumbnail_size, self.thumbnail_size), Image.Resampling.LANCZOS)
-            
-            thumb_path = output_dir / f"{base_name}_thumb.webp"
-            thumb.save(thumb_path, format="WEBP", quality=80, optimize=True)
+        Create listing-width renditions and the thumbnail from one decoded image.
+        
+        Sizes are produced largest first as a pyramid: each rendition is
+        downscaled from the previous (next larger) one instead of from the
+        full-resolution pixels, so the cost of each step shrinks with it.
+        
+        Args:
+            img: Oriented, resized full rendition (already saved)
+            output_dir: Directory for the renditions
+            base_name: Source file stem
+            listing_widths: Target widths; widths >= the full width are skipped
+            quality: WebP quality for listing renditions
             
-            return thumb_path
-        except Exception as e:
-            print(f"Thumbnail creation failed: {e}")
-            return None
+        Returns:
+            Dict with 'listing' (list of {width, height, path}) and 'thumbnail_path'
+        """
+        width, height = img.size
+        targets = []
+        for target_width in sorted({int(w) for w in listing_widths or []}, reverse=True):
+            if 0 < target_width < width:
+                target_height = max(1, round(height * target_width / width))
+                targets.append(("listing", (target_width, target_height)))
+        
+        # Thumbnail fits inside a thumbnail_size box (same math as Image.thumbnail)
+        scale = min(self.thumbnail_size / width, self.thumbnail_size / height, 1.0)
+        thumb_dims = (max(1, round(width * scale)), max(1, round(height * scale)))
+        targets.append(("thumbnail", thumb_dims))
+        
+        renditions: Dict[str, Any] = {"listing": [], "thumbnail_path": None}
+        current = img
+        
+        for kind, size in targets:
+            try:
+                if size != current.size:
+                    current = current.resize(size, Image.Resampling.LANCZOS, reducing_gap=2.0)
+                
+                if kind == "listing":
+                    path = output_dir / f"{base_name}_w{size[0]}.webp"
+                    current.save(path, format="WEBP", quality=quality, method=6, optimize=True)
+                    renditions["listing"].append({
+                        "width": size[0],
+                        "height": size[1],
+                        "path": str(path)
+                    })
+                else:
+                    thumb_path = output_dir / f"{base_name}_thumb.webp"
+                    current.save(thumb_path, format="WEBP", quality=80, optimize=True)
+                    renditions["thumbnail_path"] = thumb_path
+            except Exception as e:
+                logger.warning(f"{kind.title()} rendition {size} failed for {base_name}: {e}")
+        
+        return renditions
     
     def batch_process(
         self,
         folder_path: str,
-        options: Optional[Dict[str, Any]] = None
+        options: Optional[Dict[str, Any]] = None,
+        progress_callback: Optional[Callable[[int, int, str], None]] = None
     ) -> Dict[str, Any]:
         """
         Process all images in a folder.
@@ -205,33 +408,148 @@ class ImageProcessor:
         Args:
             folder_path: Path to folder containing images
             options: Processing options (including delete_originals)
+            progress_callback: Optional callback(current, total, filename)
             
         Returns:
             Dictionary with batch processing results
         """
         folder = Path(folder_path)
-        options = options or {}
         
         image_extensions = {'.jpg', '.jpeg', '.png', '.webp', '.tiff', '.bmp', '.gif'}
         images = [
-            f for f in folder.iterdir()
+            str(f) for f in folder.iterdir()
             if f.suffix.lower() in image_extensions
         ]
         
+        return self.process_images(images, options, progress_callback)
+    
+    def process_images(
+        self,
+        image_paths: List[str],
+        options: Optional[Dict[str, Any]] = None,
+        progress_callback: Optional[Callable[[int, int, str], None]] = None,
+        workers: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Process a list of images, in parallel when more than one worker is configured.
+        
+        Progress is recorded in a per-folder batch manifest (see
+        batch_manifest.py); images already verified with the same options
+        are skipped on a re-run (options["resume"], default: config resume_batches).
+        
+        Args:
+            image_paths: Images to process
+            options: Processing options passed to process_image
+            progress_callback: Optional callback(current, total, filename),
+                called as each image finishes
+            workers: Worker processes (default: config parallel_workers, 0 = auto)
+            
+        Returns:
+            Dictionary with batch processing results, images in input order
+        """
+        options = options or {}
+        delete_originals = options.get("delete_originals", True)
+        resume = options.get("resume", self.resume_batches)
+        
+        # Workers only encode; verification and deletion happen in this
+        # process, which is the single writer of the batch manifests.
+        worker_options = dict(options, delete_originals=False)
+        fingerprint = options_fingerprint(self._output_options(options))
+        
         results = {
-            "total": len(images),
+            "total": len(image_paths),
             "processed": 0,
             "failed": 0,
             "deleted": 0,  # NEW: Track deleted count
+            "resumed": 0,
             "images": [],
             "errors": [],
             "total_original_size": 0,
-            "total_new_size": 0
+            "total_new_size": 0,
+            "cache_hits": 0
         }
         
-        for img_path in images:
-            try:
-                result = self.process_image(str(img_path), options)
+        total = len(image_paths)
+        completed = 0
+        outcomes: List[Dict[str, Any]] = [{"result": None, "error": None} for _ in image_paths]
+        
+        manifests: Dict[Path, BatchManifest] = {}
+        
+        def manifest_for(img_path: str) -> Optional[BatchManifest]:
+            if not resume:
+                return None
+            folder = Path(img_path).parent
+            if folder not in manifests:
+                manifests[folder] = BatchManifest(str(folder))
+            return manifests[folder]
+        
+        def finish(index: int, outcome: Dict[str, Any]) -> None:
+            nonlocal completed
+            img_path = image_paths[index]
+            outcomes[index] = self._finish_batch_item(
+                img_path, outcome, manifest_for(img_path), delete_originals
+            )
+            completed += 1
+            if progress_callback:
+                progress_callback(completed, total, Path(img_path).name)
+        
+        # Resume: anything already verified with the same options is reused
+        to_run = []
+        for index, img_path in enumerate(image_paths):
+            manifest = manifest_for(img_path)
+            entry = manifest.completed_entry(img_path, fingerprint) if manifest else None
+            if entry:
+                to_run.append(None)
+                outcomes[index] = {"result": dict(entry["result"], resumed=True), "error": None}
+            else:
+                to_run.append(index)
+                if manifest:
+                    manifest.mark(img_path, STATE_PENDING, save=False, fingerprint=fingerprint)
+        for manifest in manifests.values():
+            manifest.save()
+        
+        for index, outcome in enumerate(outcomes):
+            if to_run[index] is None:
+                finish(index, outcome)
+        pending = [index for index in to_run if index is not None]
+        if total - len(pending):
+            logger.info(f"Resuming batch: {total - len(pending)} of {total} images already done")
+        
+        worker_count = resolve_worker_count(
+            self.parallel_workers if workers is None else workers
+        )
+        worker_count = min(worker_count, max(len(pending), 1))
+        
+        # Streaming admission: each image reserves its estimated decoded
+        # size, so only as many run at once as fit in memory_budget_mb
+        budget = get_memory_budget(self.config)
+        max_dim = options.get("max_dimension", self.max_dimension)
+        costs = [estimate_decode_bytes(image_paths[index], max_dim) for index in pending]
+        
+        if worker_count > 1:
+            logger.info(f"Processing {len(pending)} images with {worker_count} worker processes")
+            run_in_pool(
+                _process_image_in_worker,
+                [(self.config, image_paths[index], worker_options) for index in pending],
+                workers=worker_count,
+                timeout=self.image_timeout,
+                result_callback=lambda i, outcome: finish(pending[i], outcome),
+                budget=budget,
+                job_costs=costs
+            )
+        else:
+            for index, cost in zip(pending, costs):
+                try:
+                    with budget.reserve(cost):
+                        result = self.process_image(image_paths[index], worker_options)
+                    outcome = {"result": result, "error": None}
+                except Exception as e:
+                    outcome = {"result": None, "error": str(e)}
+                finish(index, outcome)
+        
+        for img_path, outcome in zip(image_paths, outcomes):
+            result = outcome["result"]
+            if outcome["error"] is None and result is not None:
                 results["images"].append(result)
                 results["processed"] += 1
                 results["total_original_size"] += result["original_file_size"]
@@ -240,12 +558,15 @@ class ImageProcessor:
                 # Track deletions
                 if result.get("original_deleted", False):
                     results["deleted"] += 1
-                    
-            except Exception as e:
+                if result.get("resumed", False):
+                    results["resumed"] += 1
+                elif result.get("cache_hit", False):
+                    results["cache_hits"] += 1
+            else:
                 results["failed"] += 1
                 results["errors"].append({
-                    "file": img_path.name,
-                    "error": str(e)
+                    "file": Path(img_path).name,
+                    "error": outcome["error"]
                 })
         
         if results["total_original_size"] > 0:
@@ -257,10 +578,65 @@ class ImageProcessor:
             results["total_savings_percent"] = 0
         
         # Log summary
-        logger.info(f"Batch processing complete: {results['processed']} optimized, {results['deleted']} originals deleted")
+        logger.info(
+            f"Batch processing complete: {results['processed']} optimized "
+            f"({results['cache_hits']} from cache, {results['resumed']} resumed), "
+            f"{results['deleted']} originals deleted"
+        )
             
         return results
     
+    def _finish_batch_item(
+        self,
+        img_path: str,
+        outcome: Dict[str, Any],
+        manifest: Optional[BatchManifest],
+        delete_originals: bool
+    ) -> Dict[str, Any]:
+        """
+        Verify one finished image, delete its original if requested, and
+        record each step in the manifest before moving to the next.
+        
+        Returns:
+            The outcome to report ({"result", "error"})
+        """
+        result = outcome["result"]
+        if outcome["error"] is not None or result is None:
+            if manifest:
+                manifest.mark(img_path, STATE_FAILED, error=outcome["error"])
+            return outcome
+        
+        if not result.get("resumed"):
+            if manifest:
+                manifest.mark(img_path, STATE_ENCODED, output_path=result["output_path"], result=result)
+            error = self._verify_output(result)
+            if error:
+                if manifest:
+                    manifest.mark(img_path, STATE_FAILED, error=error)
+                return {"result": None, "error": error}
+            if manifest:
+                manifest.mark(img_path, STATE_VERIFIED, result=result)
+        
+        source = Path(img_path)
+        if delete_originals and source.exists():
+            result["original_deleted"] = self._delete_original(source)
+            if result["original_deleted"] and manifest:
+                manifest.mark(img_path, STATE_ORIGINAL_DELETED, result=result)
+        
+        return {"result": result, "error": None}
+    
+    def _verify_output(self, result: Dict[str, Any]) -> Optional[str]:
+        """Decode the written output and check its dimensions. Returns an error or None."""
+        output_path = Path(result["output_path"])
+        try:
+            with Image.open(output_path) as img:
+                if tuple(img.size) != tuple(result["new_size"]):
+                    return f"Output size {img.size} does not match expected {tuple(result['new_size'])}"
+                img.load()
+        except Exception as e:
+            return f"Output verification failed for {output_path.name}: {e}"
+        return None
+    
     def get_image_info(self, image_path: str) -> Dict[str, Any]:
         """
         Get detailed information about an image.
@@ -271,31 +647,23 @@ class ImageProcessor:
         Returns:
             Dictionary with image metadata
         """
-        path = Path(image_path)
-        
-        with Image.open(path) as img:
-            # Get EXIF data
-            exif_data = {}
-            if hasattr(img, '_getexif') and img._getexif():
-                for tag_id, value in img._getexif().items():
-                    tag = ExifTags.TAGS.get(tag_id, tag_id)
-                    if isinstance(value, bytes):
-                        value = value.decode(errors='ignore')
-                    exif_data[tag] = str(value)[:100]  # Truncate long values
-            
-            return {
-                "path": str(path),
-                "filename": path.name,
-                "format": img.format,
-                "mode": img.mode,
-                "size": img.size,
-                "width": img.size[0],
-                "height": img.size[1],
-                "file_size": path.stat().st_size,
-                "file_size_mb": round(path.stat().st_size / (1024 * 1024), 2),
-                "exif": exif_data,
-                "has_transparency": img.mode in ("RGBA", "LA", "P")
-            }
+        info = get_metadata_service().get(image_path)
+        if not info["valid"]:
+            raise OSError(f"Cannot read image {image_path}: {info['error']}")
+
+        return {
+            "path": info["path"],
+            "filename": info["filename"],
+            "format": info["format"],
+            "mode": info["mode"],
+            "size": info["size"],
+            "width": info["width"],
+            "height": info["height"],
+            "file_size": info["file_size"],
+            "file_size_mb": round(info["file_size"] / (1024 * 1024), 2),
+            "exif": info["exif"],
+            "has_transparency": info["has_transparency"]
+        }
     
     def auto_rename_images(
         self,
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Incremental JSON Module
+Streaming-tolerant parser for a JSON object arriving in pieces.
+
+Claude's field suggestions are one JSON object generated token by token.
+IncrementalJSONParser is fed each text delta and reports every top-level
+field as soon as its value is complete, so the form can fill in the
+title while the long description is still being generated. Text before
+the opening brace (markdown fences, a stray sentence) is skipped.
+"""
+
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = " \t\r\n"
+
+# Marker for a value json.loads rejected
+_INVALID = object()
+
+
+class IncrementalJSONParser:
+    """
+    Single-pass scanner over the top level of a streamed JSON object.
+
+    Only nesting depth, string and escape state are tracked per character;
+    each completed top-level value is decoded once with json.loads.
+
+    Example:
+        parser = IncrementalJSONParser()
+        for delta in stream:
+            for key, value in parser.feed(delta):
+                fill_widget(key, value)
+    """
+
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self.done = False
+        self._buffer = ""
+        self._pos = 0
+        self._depth = 0
+        self._state = "start"  # start, key, colon, value, comma
+        self._in_string = False
+        self._escape = False
+        self._key: Optional[str] = None
+        self._token_start: Optional[int] = None
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        """
+        Add the next piece of the reply.
+
+        Returns:
+            (key, value) for each top-level field completed by this piece
+        """
+        self._buffer += text
+        completed: List[Tuple[str, Any]] = []
+        buf = self._buffer
+        for i in range(self._pos, len(buf)):
+            if self.done:
+                break
+            self._step(buf, i, buf[i], completed)
+        self._pos = len(buf)
+        return completed
+
+    def in_progress(self) -> Optional[Tuple[str, str]]:
+        """(key, raw text so far) of a top-level value still being generated."""
+        if self._state == "value" and self._token_start is not None and self._key is not None:
+            return self._key, self._buffer[self._token_start:]
+        return None
+
+    def _step(self, buf: str, i: int, ch: str, completed: List[Tuple[str, Any]]) -> None:
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"':
+                self._in_string = False
+                if self._depth == 1:
+                    if self._state == "key":
+                        key = self._decode(buf[self._token_start:i + 1])
+                        self._key = key if isinstance(key, str) else None
+                        self._token_start = None
+                        self._state = "colon"
+                    elif self._state == "value":
+                        self._complete(buf[self._token_start:i + 1], completed)
+            return
+
+        if self._state == "start":
+            if ch == "{":
+                self._depth = 1
+                self._state = "key"
+            return
+
+        if ch == '"':
+            self._in_string = True
+            if self._depth == 1 and self._state in ("key", "value"):
+                self._token_start = i
+            return
+
+        if ch in "{[":
+            if self._depth == 1 and self._state == "value" and self._token_start is None:
+                self._token_start = i
+            self._depth += 1
+            return
+
+        if ch in "}]":
+            if self._depth == 1:
+                # End of the object; a bare scalar may end right at the brace
+                self._end_scalar(buf, i, completed)
+                self._depth = 0
+                self.done = True
+                return
+            self._depth -= 1
+            if self._depth == 1 and self._state == "value":
+                self._complete(buf[self._token_start:i + 1], completed)
+            return
+
+        if self._depth != 1:
+            return
+
+        if ch == ":" and self._state == "colon":
+            self._state = "value"
+            self._token_start = None
+        elif ch == ",":
+            self._end_scalar(buf, i, completed)
+            self._state = "key"
+        elif ch in _WHITESPACE:
+            self._end_scalar(buf, i, completed)
+        elif self._state == "value" and self._token_start is None:
+            self._token_start = i  # Number, true, false or null
+
+    def _end_scalar(self, buf: str, i: int, completed: List[Tuple[str, Any]]) -> None:
+        """Complete a bare number/literal value ended by a delimiter at i."""
+        if self._state == "value" and self._token_start is not None:
+            self._complete(buf[self._token_start:i], completed)
+
+    def _complete(self, raw: str, completed: List[Tuple[str, Any]]) -> None:
+        value = self._decode(raw)
+        if self._key is not None and value is not _INVALID:
+            self.fields[self._key] = value
+            completed.append((self._key, value))
+        self._key = None
+        self._token_start = None
+        self._state = "comma"
+
+    @staticmethod
+    def _decode(raw: str) -> Any:
+        try:
+            return json.loads(raw)
+        except ValueError:
+            logger.debug(f"Skipping undecodable JSON value: {raw[:60]}")
+            return _INVALID
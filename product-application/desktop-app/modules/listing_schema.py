@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Listing Schema Module
+Shape and validation of a single-request "full listing" AI reply.
+
+AIEngine.generate_listing asks for one JSON document with every section
+of a listing (fields, description, valuation, keywords). Each section is
+validated on its own, so a reply with, say, an implausible valuation only
+costs one extra valuation request instead of the whole listing.
+"""
+
+from typing import Any, Dict, List, Optional
+
+CONDITIONS = ["Mint", "Near Mint", "Excellent", "Very Good", "Good", "Fair", "Poor"]
+
+# Sections in reply order; each maps to the dedicated AIEngine call used as fallback
+SECTIONS = ("fields", "description", "valuation", "keywords")
+
+MIN_DESCRIPTION_CHARS = 200
+MIN_KEYWORDS = 5
+
+# Skeleton shown to the model (values describe the expected content)
+LISTING_TEMPLATE = {
+    "fields": {
+        "title": "Descriptive product title (50-80 chars)",
+        "category_id": "one of the category keys",
+        "subcategory": "Specific subcategory from the list",
+        "condition": "One of: " + ", ".join(CONDITIONS),
+        "era": "Time period (e.g. 'WWII', '1800s', 'Victorian')",
+        "origin": "Country or region of origin"
+    },
+    "description": {
+        "description": "Professional 2-3 paragraph description (200-400 words)",
+        "condition_notes": "Honest condition assessment",
+        "materials": ["identified", "materials"],
+        "seo_title": "SEO optimized title (max 70 chars)",
+        "seo_description": "Meta description (max 160 chars)"
+    },
+    "valuation": {
+        "low": "conservative_estimate_usd (number)",
+        "high": "optimistic_estimate_usd (number)",
+        "recommended": "recommended_listing_price_usd (number)",
+        "confidence": "Tier 1 (Verified Market) / Tier 2 (Strong Analog) / Tier 3 (Speculative)",
+        "notes": "Pricing rationale - if over $500, must cite evidence"
+    },
+    "keywords": ["8-15 relevant search keywords"]
+}
+
+
+def _non_empty_str(value: Any) -> bool:
+    return isinstance(value, str) and bool(value.strip())
+
+
+def _number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def validate_listing(doc: Any, categories: Optional[Dict[str, Any]] = None) -> Dict[str, List[str]]:
+    """
+    Check each section of a full-listing reply.
+
+    Args:
+        doc: Parsed reply
+        categories: Allowed category_id keys (not checked when empty)
+
+    Returns:
+        {section: [problems]} - an empty list means the section is usable
+    """
+    if not isinstance(doc, dict):
+        return {section: ["reply is not a JSON object"] for section in SECTIONS}
+
+    problems: Dict[str, List[str]] = {section: [] for section in SECTIONS}
+    for section in SECTIONS:
+        expected = list if section == "keywords" else dict
+        if not isinstance(doc.get(section), expected):
+            problems[section].append(f"missing or not a {expected.__name__}")
+
+    fields = doc.get("fields")
+    if isinstance(fields, dict):
+        if not _non_empty_str(fields.get("title")):
+            problems["fields"].append("title is empty")
+        category_id = fields.get("category_id")
+        if categories and category_id not in categories:
+            problems["fields"].append(f"unknown category_id {category_id!r}")
+
+    description = doc.get("description")
+    if isinstance(description, dict):
+        text = description.get("description")
+        if not _non_empty_str(text) or len(text.strip()) < MIN_DESCRIPTION_CHARS:
+            problems["description"].append(f"description shorter than {MIN_DESCRIPTION_CHARS} chars")
+
+    valuation = doc.get("valuation")
+    if isinstance(valuation, dict):
+        low, high, recommended = (valuation.get(k) for k in ("low", "high", "recommended"))
+        if not all(_number(v) for v in (low, high, recommended)):
+            problems["valuation"].append("low/high/recommended must be numbers")
+        elif not 0 <= low <= recommended <= high:
+            problems["valuation"].append("expected 0 <= low <= recommended <= high")
+
+    keywords = doc.get("keywords")
+    if isinstance(keywords, list):
+        usable = [k for k in keywords if _non_empty_str(k)]
+        if len(usable) < MIN_KEYWORDS:
+            problems["keywords"].append(f"fewer than {MIN_KEYWORDS} keywords")
+
+    return problems
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Mask Cache Module
+Persistent store of background-removal alpha masks.
+
+Segmentation is the only expensive step of background removal; colour,
+shadow, feathering and transparent/white output are all applied to the
+cutout afterwards. The raw alpha (before feathering) is stored per source
+image, keyed by the source content hash, model, strength and the settings
+that shape the mask, so re-styling a product only re-runs compositing.
+
+Layout (same entry format as the rendition cache):
+    cache/masks/<key>/meta.json
+    cache/masks/<key>/mask.png
+"""
+
+import logging
+import os
+import tempfile
+from typing import Optional, Dict, Any
+
+from PIL import Image
+
+from .paths import CACHE_DIR
+from .processing_cache import ProcessingCache
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_SIZE_MB = 512
+
+
+class MaskCache(ProcessingCache):
+    """
+    Size-bounded LRU cache of "L" alpha masks.
+
+    Masks are stored as PNG (lossless, usually a few hundred KB since
+    most pixels are 0 or 255).
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_SIZE_MB * 1024 * 1024):
+        super().__init__(cache_dir or str(CACHE_DIR / "masks"), max_bytes)
+
+    @classmethod
+    def from_config(cls, config: dict) -> Optional["MaskCache"]:
+        """Build the cache from background_removal.mask_cache, or None when disabled."""
+        cache_config = (
+            config.get("image_processing", {}).get("background_removal", {}).get("mask_cache", {})
+        )
+        if not cache_config.get("enabled", True):
+            return None
+        return cls(
+            cache_dir=cache_config.get("dir"),
+            max_bytes=int(cache_config.get("max_size_mb", DEFAULT_MAX_SIZE_MB)) * 1024 * 1024
+        )
+
+    def get_mask(self, key: str, size: Optional[tuple] = None) -> Optional[Image.Image]:
+        """
+        Load a cached mask.
+
+        Args:
+            key: Key from make_key()
+            size: Expected (width, height); a mismatching entry is a miss
+
+        Returns:
+            "L" image, or None on a miss
+        """
+        entry = self.get(key)
+        if entry is None:
+            return None
+        try:
+            with Image.open(entry["files"]["mask"]) as f:
+                mask = f.convert("L")
+        except (OSError, KeyError) as e:
+            logger.debug(f"Unreadable mask cache entry {key[:12]}: {e}")
+            self.hits -= 1
+            self.misses += 1
+            return None
+        if size is not None and mask.size != tuple(size):
+            self.hits -= 1
+            self.misses += 1
+            return None
+        return mask
+
+    def put_mask(self, key: str, mask: Image.Image, meta: Optional[Dict[str, Any]] = None) -> bool:
+        """Store an alpha mask under a key. Returns True if stored."""
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix=".png", prefix=".mask-", dir=self.cache_dir)
+        os.close(fd)
+        try:
+            mask.convert("L").save(tmp_path, format="PNG", compress_level=1)
+            return self.put(key, {"mask": tmp_path}, meta)
+        except OSError as e:
+            logger.debug(f"Mask cache put skipped for {key[:12]}: {e}")
+            return False
+        finally:
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
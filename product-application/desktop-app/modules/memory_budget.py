@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Memory Budget Module
+Bounds how many decoded pixels batch jobs hold at once.
+
+Every batch (optimize, background removal) estimates the decoded size of
+each source from its header and reserves that many bytes from a shared
+PixelBudget before decoding it. A new image is only admitted when it fits
+under the budget, so a folder of 300 MP TIFF scans runs one or two at a
+time while ordinary JPEGs still fill every worker. A single image larger
+than the whole budget is admitted alone rather than never.
+
+JPEG sources are decoded at a reduced DCT scale (1/2, 1/4, 1/8) when the
+output is much smaller than the source, which cuts decode memory and time.
+"""
+
+import logging
+import math
+import threading
+from contextlib import contextmanager
+from typing import Iterator, Optional, Tuple
+
+from PIL import Image
+
+from .image_metadata import get_metadata_service
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET_MB = 1024
+
+# Decoded bytes per pixel assumed for estimates (RGBA worst case)
+BYTES_PER_PIXEL = 4
+
+
+class PixelBudget:
+    """
+    Thread-safe admission control for decoded image memory.
+
+    Costs are in bytes. try_acquire() never blocks (for schedulers that
+    wait on other events); acquire() blocks until the cost fits.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.in_use = 0
+        self.peak = 0
+        self._cond = threading.Condition()
+
+    def _fits(self, cost: int) -> bool:
+        # An idle budget always admits, so oversized images still run (alone)
+        return self.in_use == 0 or self.in_use + cost <= self.max_bytes
+
+    def _take(self, cost: int) -> None:
+        self.in_use += cost
+        self.peak = max(self.peak, self.in_use)
+
+    def try_acquire(self, cost: int) -> bool:
+        """Reserve cost bytes if they fit now. Returns True if reserved."""
+        with self._cond:
+            if not self._fits(cost):
+                return False
+            self._take(cost)
+            return True
+
+    def acquire(self, cost: int, timeout: Optional[float] = None) -> bool:
+        """Block until cost bytes fit, then reserve them. Returns False on timeout."""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._fits(cost), timeout):
+                return False
+            self._take(cost)
+            return True
+
+    def release(self, cost: int) -> None:
+        """Return previously reserved bytes."""
+        with self._cond:
+            self.in_use = max(0, self.in_use - cost)
+            self._cond.notify_all()
+
+    @contextmanager
+    def reserve(self, cost: int) -> Iterator[None]:
+        """Context manager around acquire()/release()."""
+        self.acquire(cost)
+        try:
+            yield
+        finally:
+            self.release(cost)
+
+
+_budget: Optional[PixelBudget] = None
+_budget_lock = threading.Lock()
+
+
+def get_memory_budget(config: Optional[dict] = None) -> PixelBudget:
+    """
+    Process-wide budget shared by every batch job, sized from
+    image_processing.memory_budget_mb on first use.
+    """
+    global _budget
+    with _budget_lock:
+        if _budget is None:
+            budget_mb = (config or {}).get("image_processing", {}).get("memory_budget_mb", DEFAULT_BUDGET_MB)
+            _budget = PixelBudget(int(budget_mb) * 1024 * 1024)
+            logger.debug(f"Image memory budget: {budget_mb} MB")
+        return _budget
+
+
+def reduced_decode_size(size: Tuple[int, int], max_dimension: Optional[int]) -> Tuple[int, int]:
+    """
+    Size a JPEG decodes to after draft() for the given output max dimension.
+
+    Mirrors Pillow's DCT scale choice (largest of 8/4/2/1 that still keeps
+    the image at least as large as requested).
+    """
+    width, height = size
+    if not max_dimension or max(size) <= max_dimension:
+        return size
+    request = _draft_request(size, max_dimension)
+    scale = min(width // request[0], height // request[1])
+    for s in (8, 4, 2, 1):
+        if scale >= s:
+            return (width + s - 1) // s, (height + s - 1) // s
+    return size
+
+
+def draft_for_max_dimension(img: Image.Image, max_dimension: Optional[int]) -> None:
+    """
+    Ask the decoder for a reduced-size decode when the output only needs
+    max_dimension. Must be called before the pixels are loaded; a no-op
+    for formats without reduced decoding (everything but JPEG).
+    """
+    if not max_dimension or max(img.size) <= max_dimension:
+        return
+    try:
+        img.draft(None, _draft_request(img.size, max_dimension))
+    except Exception as e:
+        logger.debug(f"draft() not applied: {e}")
+
+
+def _draft_request(size: Tuple[int, int], max_dimension: int) -> Tuple[int, int]:
+    ratio = max_dimension / max(size)
+    return max(1, math.ceil(size[0] * ratio)), max(1, math.ceil(size[1] * ratio))
+
+
+def estimate_decode_bytes(
+    image_path: str,
+    max_dimension: Optional[int] = None,
+    working_copies: int = 2
+) -> int:
+    """
+    Estimate peak decoded memory for processing one image.
+
+    Args:
+        image_path: Source image (only its header is read)
+        max_dimension: Output max dimension; JPEGs decode reduced to about this
+        working_copies: Full-size frames the pipeline holds at once
+            (decoded frame + converted/composited copies)
+
+    Returns:
+        Estimated bytes (0 if the header cannot be read)
+    """
+    info = get_metadata_service().get(image_path)
+    if not info.get("valid"):
+        return 0
+
+    size = info["size"]
+    if info.get("format") == "JPEG":
+        size = reduced_decode_size(size, max_dimension)
+    return size[0] * size[1] * BYTES_PER_PIXEL * working_copies
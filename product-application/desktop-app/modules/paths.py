@@ -18,6 +18,7 @@ CONFIG_DIR = DESKTOP_APP_DIR / "config"
 LOGS_DIR = DESKTOP_APP_DIR / "logs"
 TESTS_DIR = DESKTOP_APP_DIR / "tests"
 PATCHES_DIR = DESKTOP_APP_DIR / "patches"
+CACHE_DIR = DESKTOP_APP_DIR / "cache"  # Created on demand by the cache modules
 
 # Main repo resources (for shared env files)
 MAIN_ENV_LOCAL = REPO_ROOT / ".env.local"
@@ -79,6 +80,7 @@ if __name__ == "__main__":
     print(f"TEMPLATES_DIR:   {TEMPLATES_DIR}")
     print(f"CONFIG_DIR:      {CONFIG_DIR}")
     print(f"LOGS_DIR:        {LOGS_DIR}")
+    print(f"CACHE_DIR:       {CACHE_DIR}")
     print()
     print("Validation:")
     for name, exists in validate_paths().items():
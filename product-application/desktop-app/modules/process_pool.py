@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Process Pool Module
+Runs CPU-heavy per-file jobs (image encoding, background removal) across
+worker processes while keeping results in input order.
+
+Pillow and onnxruntime release the GIL only in parts of their pipelines, so
+threads do not scale for these workloads; separate processes do.
+"""
+
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .memory_budget import PixelBudget
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_worker_count(requested: Optional[int]) -> int:
+    """
+    Turn a configured worker count into a concrete number of processes.
+
+    Args:
+        requested: Configured count. 0 or None means "auto" (all cores but one).
+
+    Returns:
+        Worker count >= 1
+    """
+    cpu_count = os.cpu_count() or 1
+    if not requested or requested < 0:
+        return max(1, cpu_count - 1)
+    return max(1, min(int(requested), cpu_count))
+
+
+def split_cores(
+    job_count: int,
+    workers: Optional[int] = None,
+    threads: Optional[int] = None
+) -> Tuple[int, int]:
+    """
+    Choose worker processes x threads per worker for jobs that are
+    themselves multi-threaded (ONNX inference).
+
+    Auto values keep workers * threads at the core count: a few intra-op
+    threads per worker (inference scales sub-linearly past ~4 threads) and
+    as many workers as that leaves room for, but never more than jobs.
+
+    Args:
+        job_count: Number of jobs to run
+        workers: Configured worker count (0 or None = auto)
+        threads: Configured threads per worker (0 or None = auto)
+
+    Returns:
+        (workers, threads_per_worker), both >= 1
+    """
+    cpu_count = os.cpu_count() or 1
+    if threads and threads > 0:
+        threads = min(int(threads), cpu_count)
+    if not workers or workers < 0:
+        per_worker = threads or min(4, max(1, cpu_count // 4))
+        workers = max(1, cpu_count // per_worker)
+    workers = max(1, min(int(workers), cpu_count, max(job_count, 1)))
+    if not threads or threads <= 0:
+        threads = max(1, cpu_count // workers)
+    return workers, threads
+
+
+def run_in_pool(
+    func: Callable[..., Any],
+    arg_list: Sequence[Tuple],
+    workers: int,
+    timeout: Optional[float] = None,
+    progress_callback: Optional[Callable[[int, int, int], None]] = None,
+    initializer: Optional[Callable[..., None]] = None,
+    initargs: Tuple = (),
+    result_callback: Optional[Callable[[int, Dict[str, Any]], None]] = None,
+    budget: Optional["PixelBudget"] = None,
+    job_costs: Optional[Sequence[int]] = None
+) -> List[Dict[str, Any]]:
+    """
+    Run func(*args) for every entry of arg_list in a process pool.
+
+    At most `workers` jobs are submitted at once, so a job's timeout clock
+    starts when a worker is actually free to run it. With a budget, a job is
+    also held back until its cost fits (jobs are admitted in input order).
+    A job that times out gets its worker terminated; the pool is replaced
+    and the other unfinished jobs are rerun, so one hang does not time out
+    the jobs queued behind it.
+
+    Args:
+        func: Module-level (picklable) function to run in the workers
+        arg_list: One argument tuple per job
+        workers: Number of worker processes
+        timeout: Per-job timeout in seconds (None = no limit)
+        progress_callback: Called in the calling thread with
+            (completed, total, index) as each job finishes
+        initializer: Optional per-worker setup function
+        initargs: Arguments for initializer
+        result_callback: Called in the calling thread with (index, outcome)
+            as each job finishes, before progress_callback
+        budget: Optional PixelBudget limiting decoded memory across workers
+        job_costs: Budget cost in bytes per job (same order as arg_list)
+
+    Returns:
+        List in input order of {"result": value, "error": None} or
+        {"result": None, "error": message}
+    """
+    total = len(arg_list)
+    outcomes: List[Dict[str, Any]] = [{"result": None, "error": None} for _ in range(total)]
+    if total == 0:
+        return outcomes
+
+    pending = deque(enumerate(arg_list))
+    in_flight: Dict[Any, Tuple[int, Optional[float]]] = {}
+    costs: Dict[int, int] = {}
+    completed = 0
+
+    def _finish(index: int, result: Any = None, error: Optional[str] = None) -> None:
+        nonlocal completed
+        outcomes[index] = {"result": result, "error": error}
+        completed += 1
+        if budget and index in costs:
+            budget.release(costs.pop(index))
+        if result_callback:
+            result_callback(index, outcomes[index])
+        if progress_callback:
+            progress_callback(completed, total, index)
+
+    def _collect(future: Any) -> None:
+        index, _ = in_flight.pop(future)
+        try:
+            _finish(index, result=future.result())
+        except Exception as e:
+            _finish(index, error=str(e) or e.__class__.__name__)
+
+    def _new_executor() -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=initializer,
+            initargs=initargs
+        )
+
+    executor = _new_executor()
+    try:
+        while pending or in_flight:
+            while pending and len(in_flight) < workers:
+                index, args = pending[0]
+                if budget and index not in costs:
+                    cost = job_costs[index] if job_costs else 0
+                    # Nothing of ours running: wait for other users of the budget
+                    admitted = budget.acquire(cost) if not in_flight else budget.try_acquire(cost)
+                    if not admitted:
+                        break
+                    costs[index] = cost
+                pending.popleft()
+                deadline = time.monotonic() + timeout if timeout else None
+                in_flight[executor.submit(func, *args)] = (index, deadline)
+
+            wait_for = None
+            deadlines = [d for _, d in in_flight.values() if d is not None]
+            if deadlines:
+                wait_for = max(0.0, min(deadlines) - time.monotonic())
+
+            done, _ = wait(list(in_flight), timeout=wait_for, return_when=FIRST_COMPLETED)
+            for future in done:
+                _collect(future)
+
+            now = time.monotonic()
+            expired = [
+                future for future, (_, deadline) in in_flight.items()
+                if deadline is not None and now >= deadline and not future.done()
+            ]
+            if not expired:
+                continue
+
+            for future in expired:
+                index, _ = in_flight.pop(future)
+                logger.warning(f"Pool job {index} timed out after {timeout}s")
+                _finish(index, error=f"Timed out after {timeout}s")
+            # A hung job keeps its worker busy and cannot be interrupted, so
+            # replace the pool; jobs that were sharing it run again on the new
+            # one with fresh deadlines (their budget reservation is kept).
+            for future in [f for f in in_flight if f.done()]:
+                _collect(future)
+            for index in sorted((index for index, _ in in_flight.values()), reverse=True):
+                pending.appendleft((index, arg_list[index]))
+            in_flight.clear()
+            _terminate(executor)
+            executor = _new_executor()
+    finally:
+        if budget:
+            for cost in costs.values():
+                budget.release(cost)
+        if in_flight:
+            _terminate(executor)
+        else:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    return outcomes
+
+
+def _terminate(executor: ProcessPoolExecutor) -> None:
+    """
+    Stop a pool's worker processes and discard the pool.
+
+    Its futures are left as they are (not cancelled): the executor fails
+    them with BrokenProcessPool once it notices the dead workers.
+    """
+    # Grab the worker handles first - shutdown() clears them
+    processes = list((getattr(executor, "_processes", None) or {}).values())
+    for process in processes:
+        try:
+            process.terminate()
+        except Exception:
+            pass
+    executor.shutdown(wait=False)
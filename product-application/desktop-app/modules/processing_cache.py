@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Processing Cache Module
+Persistent, content-addressed cache of optimized image renditions.
+
+Entries are keyed by the SHA-256 of the source bytes plus the effective
+processing options, so re-running "Optimize" only re-encodes images whose
+pixels or settings actually changed (e.g. the one image that was cropped).
+
+Layout (one directory per entry, safe for several worker processes):
+    cache/renditions/<key>/meta.json
+    cache/renditions/<key>/<role>.<ext>
+"""
+
+import json
+import logging
+import os
+import shutil
+import hashlib
+import uuid
+from pathlib import Path
+from typing import Optional, Dict, Any
+
+from .paths import CACHE_DIR
+from .utils import file_content_hash
+
+logger = logging.getLogger(__name__)
+
+# Bump when the encoder pipeline changes output for the same options
+CACHE_VERSION = 2  # 2: JPEG sources decoded via draft() (reduced-size DCT)
+
+DEFAULT_MAX_SIZE_MB = 2048
+
+
+class ProcessingCache:
+    """
+    Size-bounded LRU cache of processed image files.
+
+    Features:
+    - Content-hash + options keys (renames and re-drops still hit)
+    - LRU eviction by last access time once max_bytes is exceeded; a
+      running size total means the cache directory is only scanned on
+      the first put and when the total crosses max_bytes
+    - Hit/miss counters for the current process
+    """
+
+    META_FILE = "meta.json"
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: int = DEFAULT_MAX_SIZE_MB * 1024 * 1024):
+        self.cache_dir = Path(cache_dir) if cache_dir else CACHE_DIR / "renditions"
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # On-disk size as of the last scan plus this process's puts
+        self._size_bytes: Optional[int] = None
+
+    @classmethod
+    def from_config(cls, config: dict) -> Optional["ProcessingCache"]:
+        """Build the cache from image_processing.cache, or None when disabled."""
+        cache_config = config.get("image_processing", {}).get("cache", {})
+        if not cache_config.get("enabled", True):
+            return None
+        return cls(
+            cache_dir=cache_config.get("dir"),
+            max_bytes=int(cache_config.get("max_size_mb", DEFAULT_MAX_SIZE_MB)) * 1024 * 1024
+        )
+
+    def make_key(self, source_path: str, options: Dict[str, Any]) -> str:
+        """
+        Build the cache key for a source file and its effective options.
+
+        Args:
+            source_path: Source image (its bytes are hashed, not its name)
+            options: Every option that affects the output bytes
+
+        Returns:
+            Hex key string
+        """
+        material = json.dumps(
+            {
+                "version": CACHE_VERSION,
+                "source": file_content_hash(source_path),
+                "options": options
+            },
+            sort_keys=True,
+            default=str
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up an entry and mark it as recently used.
+
+        Returns:
+            {"meta": dict, "files": {role: cached_path}} or None on a miss
+        """
+        entry_dir = self.cache_dir / key
+        meta_path = entry_dir / self.META_FILE
+
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            files = {role: entry_dir / name for role, name in meta.get("files", {}).items()}
+            if not all(path.exists() for path in files.values()):
+                raise FileNotFoundError("incomplete cache entry")
+            os.utime(meta_path)  # LRU: last access = meta mtime
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return {"meta": meta.get("meta", {}), "files": files}
+
+    def put(self, key: str, files: Dict[str, str], meta: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Store output files under a key.
+
+        Args:
+            key: Key from make_key()
+            files: {role: path} of files to copy into the cache
+            meta: JSON-serializable data returned with the entry
+
+        Returns:
+            True if stored
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry_dir = self.cache_dir / key
+        tmp_dir = self.cache_dir / f".tmp-{key[:16]}-{uuid.uuid4().hex[:8]}"
+
+        try:
+            tmp_dir.mkdir()
+            names = {}
+            for role, path in files.items():
+                name = f"{role}{Path(path).suffix}"
+                shutil.copyfile(path, tmp_dir / name)
+                names[role] = name
+
+            with open(tmp_dir / self.META_FILE, "w", encoding="utf-8") as f:
+                json.dump({"files": names, "meta": meta or {}}, f, default=str)
+            added = self._dir_size(tmp_dir)
+
+            if entry_dir.exists():
+                added -= self._dir_size(entry_dir)
+                shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+        except OSError as e:
+            # Another worker may have stored the same key concurrently
+            logger.debug(f"Cache put skipped for {key[:12]}: {e}")
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            return False
+
+        if self._size_bytes is None:
+            self._size_bytes = sum(size for _, size, _ in self._entries())
+        else:
+            self._size_bytes += added
+        if self._size_bytes > self.max_bytes:
+            self._evict()
+        return True
+
+    def restore(self, entry: Dict[str, Any], destinations: Dict[str, str]) -> None:
+        """Copy cached files for the given roles to their destination paths."""
+        for role, destination in destinations.items():
+            Path(destination).parent.mkdir(parents=True, exist_ok=True)
+            shutil.copyfile(entry["files"][role], destination)
+
+    @staticmethod
+    def _dir_size(entry_dir: Path) -> int:
+        """Total size of the files directly inside entry_dir."""
+        return sum(f.stat().st_size for f in entry_dir.iterdir())
+
+    def _entries(self):
+        """Yield (last_access, size_bytes, entry_dir) for every complete entry."""
+        if not self.cache_dir.exists():
+            return
+        for entry_dir in self.cache_dir.iterdir():
+            meta_path = entry_dir / self.META_FILE
+            if not entry_dir.is_dir() or entry_dir.name.startswith(".tmp-"):
+                continue
+            try:
+                last_access = meta_path.stat().st_mtime
+                size = self._dir_size(entry_dir)
+            except OSError:
+                continue
+            yield last_access, size, entry_dir
+
+    def _evict(self) -> None:
+        """Remove least recently used entries until the cache fits max_bytes."""
+        entries = sorted(self._entries(), key=lambda e: e[0])
+        total = sum(size for _, size, _ in entries)
+
+        for _, size, entry_dir in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total -= size
+            self.evictions += 1
+            logger.debug(f"Evicted cache entry {entry_dir.name[:12]}")
+        self._size_bytes = total
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current on-disk size."""
+        entries = list(self._entries())
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "entries": len(entries),
+            "size_bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes
+        }
+
+    def clear(self) -> None:
+        """Delete every cached entry."""
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+        self._size_bytes = 0
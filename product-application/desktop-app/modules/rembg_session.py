@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Rembg Session Module
+Keeps rembg ONNX sessions loaded for the lifetime of the process.
+
+rembg.remove() without a session builds a new onnxruntime session (and
+checks/downloads the model) on every call. The manager loads each model
+once, can do so in a background thread at startup, and shares the session
+between single-image removal, previews and batches. Load time and
+per-call inference time are recorded for the status/log output.
+"""
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+try:
+    from rembg import new_session, remove as rembg_remove
+    REMBG_AVAILABLE = True
+    REMBG_ERROR = None
+except ImportError as e:
+    REMBG_AVAILABLE = False
+    REMBG_ERROR = str(e)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL = "u2net"
+
+# Quality profiles -> rembg model names, fastest first. "draft" is a
+# ~4.7 MB distilled U2-Net for previews; "quality" is the IS-Net general
+# model (~170 MB, slower but cleaner hair/fabric edges) for export.
+MODEL_PROFILES = {
+    "draft": "u2netp",
+    "balanced": "u2net",
+    "quality": "isnet-general-use"
+}
+DEFAULT_PROFILE = "balanced"
+DEFAULT_PREVIEW_PROFILE = "draft"
+
+
+def model_for_profile(profile: str) -> str:
+    """
+    Resolve a profile name to a rembg model name.
+
+    Unknown names are passed through, so a profile setting may also name
+    a model directly (e.g. "birefnet-general").
+    """
+    return MODEL_PROFILES.get(profile, profile or DEFAULT_MODEL)
+
+
+def model_home() -> Path:
+    """Folder rembg downloads its .onnx models to (U2NET_HOME)."""
+    return Path(os.environ.get("U2NET_HOME", Path.home() / ".u2net"))
+
+
+def installed_models() -> List[str]:
+    """Profile models whose weights are already downloaded, fastest first."""
+    home = model_home()
+    return [name for name in MODEL_PROFILES.values() if (home / f"{name}.onnx").exists()]
+
+
+class RembgSessionManager:
+    """
+    Process-wide cache of rembg sessions, keyed by model name.
+
+    Thread-safe: concurrent callers asking for a model that is still loading
+    wait for that load instead of starting a second one.
+    """
+
+    def __init__(self):
+        self._sessions: Dict[str, Any] = {}
+        self._loading: Dict[str, threading.Event] = {}
+        self._errors: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def get_session(self, model_name: str = DEFAULT_MODEL) -> Any:
+        """
+        Return the loaded session for a model, loading it if needed.
+
+        Raises:
+            RuntimeError: If rembg is not installed or the model failed to load
+        """
+        if not REMBG_AVAILABLE:
+            raise RuntimeError("rembg is not installed")
+
+        with self._lock:
+            session = self._sessions.get(model_name)
+            if session is not None:
+                return session
+            event = self._loading.get(model_name)
+            owner = event is None
+            if owner:
+                event = threading.Event()
+                self._loading[model_name] = event
+                self._errors.pop(model_name, None)
+
+        if owner:
+            self._load(model_name, event)
+        else:
+            event.wait()
+
+        with self._lock:
+            if model_name in self._sessions:
+                return self._sessions[model_name]
+            raise RuntimeError(f"rembg model '{model_name}' failed to load: {self._errors.get(model_name)}")
+
+    def _load(self, model_name: str, event: threading.Event) -> None:
+        start = time.perf_counter()
+        try:
+            session = new_session(model_name)
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._sessions[model_name] = session
+                self._model_stats(model_name)["load_seconds"] = round(elapsed, 2)
+            logger.info(f"rembg model '{model_name}' loaded in {elapsed:.1f}s")
+        except Exception as e:
+            with self._lock:
+                self._errors[model_name] = str(e)
+            logger.error(f"rembg model '{model_name}' failed to load: {e}")
+        finally:
+            with self._lock:
+                self._loading.pop(model_name, None)
+            event.set()
+
+    def warm_up(self, model_name: str = DEFAULT_MODEL) -> Optional[threading.Thread]:
+        """
+        Start loading a model in a background thread (no-op if loaded or
+        rembg is missing).
+
+        Returns:
+            The loader thread, or None if nothing needed loading
+        """
+        if not REMBG_AVAILABLE or self.is_loaded(model_name):
+            return None
+
+        def _warm() -> None:
+            try:
+                self.get_session(model_name)
+            except RuntimeError:
+                pass  # Already logged by _load
+
+        thread = threading.Thread(target=_warm, name=f"rembg-warmup-{model_name}", daemon=True)
+        thread.start()
+        return thread
+
+    def is_loaded(self, model_name: str = DEFAULT_MODEL) -> bool:
+        """True once the model's session is ready."""
+        with self._lock:
+            return model_name in self._sessions
+
+    def remove(self, img: Any, model_name: str = DEFAULT_MODEL, **kwargs: Any) -> Any:
+        """
+        rembg.remove() with the shared session; records inference time.
+
+        Args:
+            img: PIL image (or bytes/ndarray, as rembg accepts)
+            model_name: rembg model name
+            **kwargs: Passed to rembg.remove (alpha_matting, only_mask, ...)
+        """
+        session = self.get_session(model_name)
+        start = time.perf_counter()
+        result = rembg_remove(img, session=session, **kwargs)
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            stats = self._model_stats(model_name)
+            stats["calls"] += 1
+            stats["total_inference_seconds"] += elapsed
+            stats["last_inference_seconds"] = round(elapsed, 3)
+        logger.debug(f"rembg '{model_name}' inference: {elapsed:.2f}s")
+        return result
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        """Per-model load time, call count and inference timings."""
+        with self._lock:
+            report = {}
+            for model_name, stats in self._stats.items():
+                entry = dict(stats)
+                entry["avg_inference_seconds"] = (
+                    round(stats["total_inference_seconds"] / stats["calls"], 3) if stats["calls"] else 0.0
+                )
+                entry["total_inference_seconds"] = round(stats["total_inference_seconds"], 2)
+                report[model_name] = entry
+            return report
+
+    def _model_stats(self, model_name: str) -> Dict[str, float]:
+        return self._stats.setdefault(model_name, {
+            "load_seconds": 0.0,
+            "calls": 0,
+            "total_inference_seconds": 0.0,
+            "last_inference_seconds": 0.0
+        })
+
+
+_manager: Optional[RembgSessionManager] = None
+_manager_lock = threading.Lock()
+
+
+def get_session_manager() -> RembgSessionManager:
+    """Process-wide shared session manager."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = RembgSessionManager()
+        return _manager
+
+
+def configure_worker(intra_op_threads: int) -> None:
+    """
+    Per-process setup for background-removal pool workers.
+
+    rembg sizes onnxruntime's intra/inter-op thread pools from
+    OMP_NUM_THREADS when it builds a session, so this must run before the
+    worker's first session load. Sessions inherited from a forked parent
+    are dropped; each worker loads its own model.
+    """
+    global _manager
+    os.environ["OMP_NUM_THREADS"] = str(max(1, int(intra_op_threads)))
+    with _manager_lock:
+        _manager = RembgSessionManager()
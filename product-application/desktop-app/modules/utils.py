@@ -5,6 +5,7 @@ General-purpose helper functions for validation and file operations.
 """
 
 import os
+import hashlib
 from pathlib import Path
 from typing import List, Tuple
 
@@ -15,6 +16,23 @@ MAX_FILE_SIZE = 10 * 1024 * 1024
 # Supported formats for ImageKit
 SUPPORTED_FORMATS = {'.jpg', '.jpeg', '.png', '.webp', '.gif', '.tiff', '.bmp'}
 
+# Read size for content hashing (1 MB)
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def file_content_hash(file_path: str) -> str:
+    """
+    SHA-256 of a file's bytes, used as a content address by the caches.
+    
+    Returns:
+        Hex digest string
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
 
 def validate_image_for_upload(image_path: str) -> Tuple[bool, str]:
     """
@@ -26,7 +44,9 @@ def validate_image_for_upload(image_path: str) -> Tuple[bool, str]:
     path = Path(image_path)
     
     # Check file exists
-    if not path.exists():
+    try:
+        stat = path.stat()
+    except OSError:
         return False, f"File not found: {path.name}"
     
     # Check file is readable
@@ -38,20 +58,18 @@ def validate_image_for_upload(image_path: str) -> Tuple[bool, str]:
         return False, f"Unsupported format: {path.suffix}"
     
     # Check file size
-    size = path.stat().st_size
+    size = stat.st_size
     if size == 0:
         return False, f"Empty file: {path.name}"
     if size > MAX_FILE_SIZE:
         size_mb = size / (1024 * 1024)
         return False, f"File too large ({size_mb:.1f} MB): {path.name}"
     
-    # Try to verify it's actually an image
-    try:
-        from PIL import Image
-        with Image.open(image_path) as img:
-            img.verify()
-    except Exception as e:
-        return False, f"Invalid image file: {path.name} ({e})"
+    # Header parse (cached by size/mtime) instead of a full verify() pass
+    from .image_metadata import get_metadata_service
+    info = get_metadata_service().get(image_path)
+    if not info['valid'] or not info.get('width') or not info.get('height'):
+        return False, f"Invalid image file: {path.name} ({info.get('error', 'no dimensions')})"
     
     return True, ""
 
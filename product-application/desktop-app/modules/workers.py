@@ -5,9 +5,10 @@ Background processing threads for the Kollect-It Product Manager.
 """
 
 import logging
+import threading
 import traceback
 from pathlib import Path
-from typing import Dict, Any
+from typing import Callable, Dict, Any, Optional
 
 from PyQt5.QtCore import QThread, pyqtSignal
 
@@ -20,6 +21,10 @@ logger = logging.getLogger("KollectIt.workers")
 # Supported image extensions
 IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.tiff', '.bmp'}
 
+# One full-resolution preview inference at a time; previews superseded
+# while waiting for it skip the final stage instead of stacking up
+_final_preview_lock = threading.Lock()
+
 
 class ProcessingThread(QThread):
     """Background thread for image processing tasks."""
@@ -42,7 +47,7 @@ class ProcessingThread(QThread):
 
             # Get all images in folder
             images = [
-                f for f in Path(self.folder_path).iterdir()
+                str(f) for f in Path(self.folder_path).iterdir()
                 if f.suffix.lower() in IMAGE_EXTENSIONS
             ]
 
@@ -53,25 +58,18 @@ class ProcessingThread(QThread):
                 self.finished.emit(results)
                 return
 
-            for i, img_path in enumerate(images):
-                # Use i+1 to properly show progress (e.g., 1/3, 2/3, 3/3 = 100%)
-                progress_pct = int(((i + 1) / total) * 100)
+            def progress_callback(current: int, count: int, filename: str) -> None:
+                # Called as each image finishes (in completion order when parallel)
                 self.progress.emit(
-                    progress_pct,
-                    f"Processing: {img_path.name} ({i + 1}/{total})"
+                    int((current / count) * 100),
+                    f"Processing: {filename} ({current}/{count})"
                 )
 
-                try:
-                    result = processor.process_image(
-                        str(img_path),
-                        self.options
-                    )
-                    results["images"].append(result)
-                except Exception as e:
-                    results["errors"].append({
-                        "file": img_path.name,
-                        "error": str(e)
-                    })
+            results = processor.process_images(
+                images,
+                self.options,
+                progress_callback=progress_callback
+            )
 
             self.progress.emit(100, f"Processing complete! ({total} images)")
             self.finished.emit(results)
@@ -95,13 +93,15 @@ class BackgroundRemovalThread(QThread):
         folder_path: str, 
         config: Dict[str, Any], 
         strength: float = 0.8,
-        bg_color: str = "#FFFFFF"
+        bg_color: str = "#FFFFFF",
+        workers: Optional[int] = None
     ):
         super().__init__()
         self.folder_path = folder_path
         self.config = config
         self.strength = strength
         self.bg_color = bg_color
+        self.workers = workers  # None = config parallel_workers (0 = auto)
 
     def run(self) -> None:
         """Execute the background removal task."""
@@ -117,11 +117,15 @@ class BackgroundRemovalThread(QThread):
             results = remover.batch_remove(
                 self.folder_path,
                 progress_callback=progress_callback,
+                workers=self.workers,
                 strength=self.strength,
                 bg_color=self.bg_color
             )
 
-            self.progress.emit(100, "Background removal complete!")
+            self.progress.emit(
+                100,
+                f"Background removal complete! ({results.get('images_per_minute', 0)} images/min)"
+            )
             self.finished.emit(results)
 
         except Exception as e:
@@ -183,3 +187,212 @@ class UploadThread(QThread):
             error_msg = f"UploadThread error: {str(e)}"
             logger.error(error_msg, exc_info=True)
             self.error.emit(str(e))
+
+
+class GenerateAllThread(QThread):
+    """Background thread generating a complete listing (AIEngine.generate_listing / generate_all)."""
+
+    progress = pyqtSignal(int, str)
+    finished = pyqtSignal(dict)
+    error = pyqtSignal(str)
+
+    def __init__(
+        self,
+        config: Dict[str, Any],
+        product_data: Dict[str, Any],
+        categories: Dict[str, Any],
+        use_cache: bool = True
+    ):
+        super().__init__()
+        self.config = config
+        self.product_data = product_data
+        self.categories = categories
+        self.use_cache = use_cache
+
+    def run(self) -> None:
+        """Run every listing request concurrently and emit the merged result."""
+        try:
+            from .ai_engine import get_ai_engine
+
+            engine = get_ai_engine(self.config)
+
+            def progress_callback(completed: int, total: int, step: str) -> None:
+                self.progress.emit(int((completed / total) * 100), f"AI {step} ready ({completed}/{total})")
+
+            # "single": one request for the whole listing; "parallel": one per section
+            if self.config.get("ai", {}).get("listing_mode", "single") == "parallel":
+                generate = engine.generate_all
+            else:
+                generate = engine.generate_listing
+
+            self.progress.emit(5, "AI generating listing...")
+            result = generate(
+                self.product_data,
+                self.categories,
+                use_cache=self.use_cache,
+                progress_callback=progress_callback
+            )
+            self.finished.emit(result)
+
+        except Exception as e:
+            logger.error(f"GenerateAllThread error: {str(e)}", exc_info=True)
+            self.error.emit(str(e))
+
+
+class DescriptionStreamThread(QThread):
+    """
+    Background thread streaming an AI description.
+
+    The reply is JSON; the decoded "description" value is emitted piece by
+    piece as it arrives. requestInterruption() stops the stream (finished
+    then carries {"cancelled": True}).
+    """
+
+    delta = pyqtSignal(str)
+    finished = pyqtSignal(dict)
+    error = pyqtSignal(str)
+
+    def __init__(self, config: Dict[str, Any], product_data: Dict[str, Any]):
+        super().__init__()
+        self.config = config
+        self.product_data = product_data
+
+    def run(self) -> None:
+        """Stream the description, emitting newly decoded text."""
+        try:
+            from .ai_engine import get_ai_engine
+            from .ai_streaming import partial_json_string
+
+            engine = get_ai_engine(self.config)
+            raw = []
+            shown = [0]
+
+            def on_delta(piece: str) -> None:
+                raw.append(piece)
+                partial = partial_json_string("".join(raw), "description")
+                if partial and len(partial[0]) > shown[0]:
+                    self.delta.emit(partial[0][shown[0]:])
+                    shown[0] = len(partial[0])
+
+            result = engine.stream_description(
+                self.product_data,
+                on_delta=on_delta,
+                should_cancel=self.isInterruptionRequested
+            )
+            if result is None:
+                self.error.emit("No response from AI. Check your API key configuration.")
+            else:
+                self.finished.emit(result)
+
+        except Exception as e:
+            logger.error(f"DescriptionStreamThread error: {str(e)}", exc_info=True)
+            self.error.emit(str(e))
+
+
+class SuggestFieldsStreamThread(QThread):
+    """
+    Background thread streaming AI field suggestions.
+
+    Each top-level field (title, category_id, condition, ...) is emitted as
+    soon as its value is complete; finished carries the full result.
+    """
+
+    field_ready = pyqtSignal(str, object)
+    finished = pyqtSignal(dict)
+    error = pyqtSignal(str)
+
+    def __init__(self, config: Dict[str, Any], product_data: Dict[str, Any], categories: Dict[str, Any]):
+        super().__init__()
+        self.config = config
+        self.product_data = product_data
+        self.categories = categories
+
+    def run(self) -> None:
+        """Stream the suggestion, emitting fields as they complete."""
+        try:
+            from .ai_engine import get_ai_engine
+
+            engine = get_ai_engine(self.config)
+            result = engine.stream_suggest_fields(
+                self.product_data,
+                self.categories,
+                on_field=self.field_ready.emit,
+                should_cancel=self.isInterruptionRequested
+            )
+            if result is None:
+                self.error.emit("AI analysis returned no results")
+            else:
+                self.finished.emit(result)
+
+        except Exception as e:
+            logger.error(f"SuggestFieldsStreamThread error: {str(e)}", exc_info=True)
+            self.error.emit(str(e))
+
+
+class ProgressivePreviewThread(QThread):
+    """
+    Background thread for a two-stage background-removal preview.
+
+    Emits a coarse cutout from a small proxy first, then the full-quality
+    cutout (which also fills the mask cache, so saving the same strength
+    afterwards skips inference). A preview superseded by a newer one is
+    stopped with requestInterruption(): inference itself cannot be
+    interrupted, but nothing is emitted after it. The final stage is
+    skipped once interrupted or once latest_generation() reports a newer
+    request, so only the latest settings pay for full-resolution inference.
+    """
+
+    # generation, stage ("proxy" or "final"), composited RGB PIL image
+    stage_ready = pyqtSignal(int, str, object)
+    error = pyqtSignal(int, str)
+
+    def __init__(
+        self,
+        image_path: str,
+        config: Dict[str, Any],
+        strength: float,
+        generation: int,
+        bg_color: str = "#FFFFFF",
+        latest_generation: Optional[Callable[[], int]] = None
+    ):
+        super().__init__()
+        self.image_path = image_path
+        self.config = config
+        self.strength = strength
+        self.generation = generation
+        self.bg_color = bg_color
+        self.latest_generation = latest_generation
+
+    def is_superseded(self) -> bool:
+        """True once interrupted or a newer preview has been requested."""
+        if self.isInterruptionRequested():
+            return True
+        return self.latest_generation is not None and self.latest_generation() > self.generation
+
+    def run(self) -> None:
+        """Run the proxy stage, then the full-quality stage."""
+        try:
+            from .background_remover import BackgroundRemover
+            from .compositing import composite_image
+
+            remover = BackgroundRemover(self.config)
+            if self.isInterruptionRequested():
+                return
+            cutout = remover.quick_preview(self.image_path, self.strength)
+            if self.isInterruptionRequested():
+                return
+            self.stage_ready.emit(self.generation, "proxy", composite_image(cutout, self.bg_color))
+
+            if self.is_superseded():
+                return
+            with _final_preview_lock:
+                if self.is_superseded():
+                    return
+                cutout = remover.preview_removal(self.image_path, self.strength, final=True)
+            if self.isInterruptionRequested():
+                return
+            self.stage_ready.emit(self.generation, "final", composite_image(cutout, self.bg_color))
+
+        except Exception as e:
+            logger.error(f"ProgressivePreviewThread error: {e}", exc_info=True)
+            self.error.emit(self.generation, str(e))
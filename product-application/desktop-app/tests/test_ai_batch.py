@@ -0,0 +1,152 @@
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from PIL import Image
+
+from modules.ai_batch import BatchJobStore, BulkGenerator, MessageBatchClient
+from modules.ai_engine import AIEngine
+from modules.ai_scheduler import PRIORITY_BULK, RequestScheduler
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "tools"))
+from batch_stub_server import BatchStubServer, canned_reply  # noqa: E402
+
+
+def make_products(root, count):
+    folders = []
+    for i in range(count):
+        folder = Path(root) / f"COLL-{i:03d}"
+        folder.mkdir()
+        Image.new("RGB", (64, 48), (30 * i % 255, 90, 120)).save(folder / "front.jpg")
+        with open(folder / "product_info.json", "w") as f:
+            json.dump({"sku": f"COLL-{i:03d}", "title": f"Item {i}", "category": "collectibles",
+                       "images": ["front.jpg"]}, f)
+        folders.append(str(folder))
+    return folders
+
+
+class TestBulkGenerator(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        (self.root / "products").mkdir()
+        with mock.patch.dict(os.environ, {"ANTHROPIC_API_KEY": "sk-ant-test"}):
+            self.engine = AIEngine({"ai": {"cache": {"enabled": False}}})
+        self.sleeps = []
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def bulk(self, server, **kwargs):
+        return BulkGenerator(
+            self.engine,
+            client=MessageBatchClient("sk-ant-test", base_url=server.url),
+            store=BatchJobStore(self.root / "batches"),
+            poll_initial=1.0, poll_max=2.0, **kwargs
+        )
+
+    def info(self, folder):
+        with open(Path(folder) / "product_info.json") as f:
+            return json.load(f)
+
+    def test_submit_wait_collect(self):
+        folders = make_products(self.root / "products", 3)
+        with BatchStubServer(polls_until_done=4) as server:
+            bulk = self.bulk(server)
+            batch_ids = bulk.submit(folders)
+            self.assertEqual(len(batch_ids), 1)
+
+            batch = bulk.wait(batch_ids[0], sleep=self.sleeps.append)
+            counts = bulk.collect(batch_ids[0], batch)
+
+            requests = server.batches[batch_ids[0]]["requests"]
+        self.assertEqual(counts, {"succeeded": 6, "failed": 0})
+        self.assertEqual(self.sleeps, [1.0, 1.5, 2.0])
+
+        # Prompts are the interactive ones, images included
+        params = {r["custom_id"]: r["params"] for r in requests}
+        expected, _ = self.engine._valuation_request({"title": "Item 1", "category": "collectibles",
+                                                      "images": [str(Path(folders[1]) / "front.jpg")]})
+        self.assertEqual(params["p00001-valuation"]["messages"][0]["content"][-1], expected[0]["content"][-1])
+        self.assertEqual(params["p00001-valuation"]["messages"][0]["content"][0]["type"], "image")
+
+        info = self.info(folders[2])
+        self.assertEqual(info["sku"], "COLL-002")
+        self.assertEqual(info["description"], "Stand-in description for p00002-description.")
+        self.assertEqual(info["valuation"]["recommended"], 180)
+        self.assertEqual(info["ai_batch"]["valuation"]["status"], "succeeded")
+        self.assertEqual(BatchJobStore(self.root / "batches").pending(), [])
+
+    def test_large_runs_split_and_resume(self):
+        folders = make_products(self.root / "products", 4)
+        with BatchStubServer() as server:
+            # Room for three of the largest requests per batch
+            product = {"title": "Item 0", "category": "collectibles", "images": [folders[0] + "/front.jpg"]}
+            size = max(
+                len(json.dumps({"custom_id": "p00000-" + kind, "params": bulk_params}))
+                for kind, bulk_params in (
+                    (kind, self.bulk(server).build_request(product, kind)) for kind in ("description", "valuation")
+                )
+            )
+            batch_ids = self.bulk(server, max_batch_bytes=size * 3).submit(folders)
+            self.assertGreater(len(batch_ids), 1)
+            self.assertEqual(sum(len(server.batches[b]["requests"]) for b in batch_ids), 8)
+
+            # A new generator (e.g. after a restart) finds and finishes them
+            totals = self.bulk(server).resume()
+        self.assertEqual(totals, {"succeeded": 8, "failed": 0})
+        self.assertTrue(all("valuation" in self.info(f) for f in folders))
+
+    def test_errored_requests_are_recorded(self):
+        folders = make_products(self.root / "products", 2)
+
+        def responder(custom_id, params):
+            return None if custom_id == "p00001-valuation" else canned_reply(custom_id, params)
+
+        with BatchStubServer(responder=responder) as server:
+            bulk = self.bulk(server)
+            counts = bulk.wait_and_collect(bulk.submit(folders))
+        self.assertEqual(counts, {"succeeded": 3, "failed": 1})
+        info = self.info(folders[1])
+        self.assertNotIn("valuation", info)
+        self.assertIn("stand-in error", info["ai_batch"]["valuation"]["status"])
+
+    def test_wait_timeout(self):
+        folders = make_products(self.root / "products", 1)
+        with BatchStubServer(polls_until_done=100) as server:
+            bulk = self.bulk(server)
+            batch_id = bulk.submit(folders, kinds=["description"])[0]
+            with self.assertRaises(TimeoutError):
+                bulk.wait(batch_id, timeout=0.5, sleep=self.sleeps.append)
+
+    def test_generate_direct_uses_bulk_lane(self):
+        folders = make_products(self.root / "products", 2)
+        self.engine.scheduler = RequestScheduler(None, None, None)
+        lanes = []
+        admit = self.engine.scheduler.admit
+
+        def spy(input_tokens=0, output_tokens=0, priority=None):
+            lanes.append(priority)
+            return admit(input_tokens, output_tokens, priority)
+
+        def fake_call(messages, system=None):
+            kind = "valuation" if "valuation" in json.dumps(messages).lower() else "description"
+            return {"success": True, "text": canned_reply(kind, {}), "usage": None}
+
+        with mock.patch.object(self.engine.scheduler, "admit", side_effect=spy), \
+                mock.patch.object(self.engine, "_call_api", side_effect=fake_call):
+            counts = BulkGenerator(self.engine, store=BatchJobStore(self.root / "batches")).generate_direct(folders)
+
+        self.assertEqual(counts, {"succeeded": 4, "failed": 0})
+        self.assertEqual(lanes, [PRIORITY_BULK] * 4)
+        info = self.info(folders[0])
+        self.assertEqual(info["valuation"]["recommended"], 180)
+        self.assertEqual(info["ai_batch"]["description"], {"status": "succeeded", "batch_id": "direct"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from modules.ai_cache import AIResponseCache
+
+
+def image_message(data, text="Describe this item"):
+    return [{"role": "user", "content": [
+        {"type": "image", "source": {"type": "base64", "media_type": "image/jpeg", "data": data}},
+        {"type": "text", "text": text}
+    ]}]
+
+
+class TestAIResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = AIResponseCache(db_path=os.path.join(self.tmp.name, "ai.sqlite3"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_key_covers_model_prompt_and_image_bytes(self):
+        key = self.cache.make_key("model-a", "system", image_message("AAAA"), temperature=0.3)
+        self.assertEqual(key, self.cache.make_key("model-a", "system", image_message("AAAA"), temperature=0.3))
+        for other in (
+            self.cache.make_key("model-b", "system", image_message("AAAA"), temperature=0.3),
+            self.cache.make_key("model-a", "other", image_message("AAAA"), temperature=0.3),
+            self.cache.make_key("model-a", "system", image_message("BBBB"), temperature=0.3),
+            self.cache.make_key("model-a", "system", image_message("AAAA", "Value it"), temperature=0.3),
+            self.cache.make_key("model-a", "system", image_message("AAAA"), temperature=0.7),
+        ):
+            self.assertNotEqual(key, other)
+
+    def test_fetch_caches_successes_only(self):
+        calls = []
+
+        def call(result):
+            calls.append(result)
+            return result
+
+        self.assertEqual(self.cache.fetch("k1", lambda: call({"success": False, "error": "x"})), {"success": False, "error": "x"})
+        self.cache.fetch("k1", lambda: call({"success": True, "text": "hello"}))
+        cached = self.cache.fetch("k1", lambda: call({"success": True, "text": "again"}))
+        self.assertEqual(cached, {"success": True, "text": "hello", "cached": True})
+        self.assertEqual(len(calls), 2)
+
+        fresh = self.cache.fetch("k1", lambda: call({"success": True, "text": "fresh"}), bypass=True)
+        self.assertEqual(fresh["text"], "fresh")
+        self.assertEqual(self.cache.get("k1")["text"], "fresh")
+
+    def test_ttl_expiry(self):
+        cache = AIResponseCache(db_path=os.path.join(self.tmp.name, "ttl.sqlite3"), ttl_seconds=0.05)
+        cache.put("k", {"success": True, "text": "t"})
+        self.assertIsNotNone(cache.get("k"))
+        time.sleep(0.1)
+        self.assertIsNone(cache.get("k"))
+
+    def test_size_cap_evicts_least_recently_used(self):
+        cache = AIResponseCache(db_path=os.path.join(self.tmp.name, "cap.sqlite3"), max_bytes=2500)
+        for i in range(3):
+            cache.put(f"k{i}", {"success": True, "text": "x" * 1000})
+            time.sleep(0.01)
+        self.assertIsNone(cache.get("k0"))
+        self.assertIsNotNone(cache.get("k2"))
+        self.assertLessEqual(cache.stats()["size_bytes"], 2500)
+
+    def test_concurrent_identical_requests_share_one_call(self):
+        calls = []
+
+        def slow_call():
+            calls.append(1)
+            time.sleep(0.2)
+            return {"success": True, "text": "shared"}
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(self.cache.fetch("same", slow_call)))
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual([r["text"] for r in results], ["shared"] * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
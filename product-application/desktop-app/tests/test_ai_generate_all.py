@@ -0,0 +1,176 @@
+import json
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+
+from modules.ai_engine import AIEngine
+from modules.ai_usage import usage_from_response
+from modules.listing_schema import validate_listing
+
+DELAY = 0.3
+
+
+class TimedEngine(AIEngine):
+    """AIEngine whose requests just sleep, recording what they were asked."""
+
+    def __init__(self):
+        with mock.patch.dict(os.environ, {"ANTHROPIC_API_KEY": "sk-ant-test"}):
+            super().__init__({"ai": {"cache": {"enabled": False}}})
+        self.client = None
+        self.calls = {}
+        self.fields_done = threading.Event()
+        self.listing_reply = None
+        self.requests = 0
+
+    def _encode_image(self, image_path):
+        return {"type": "image", "source": {"type": "base64", "media_type": "image/jpeg", "data": "AAAA"}}
+
+    def _make_api_request(self, messages, system=None, use_cache=True):
+        self.requests += 1
+        time.sleep(DELAY)
+        return self._record_usage({
+            "success": True, "text": json.dumps(self.listing_reply),
+            "usage": usage_from_response({"input_tokens": 1000, "output_tokens": 400})
+        })
+
+    def _record(self, step, product_data):
+        self.calls[step] = {"title": product_data.get("title"), "fields_done": self.fields_done.is_set()}
+        time.sleep(DELAY)
+
+    def suggest_fields(self, product_data, categories, use_cache=True):
+        time.sleep(DELAY)
+        self.fields_done.set()
+        return {
+            "title": "Victorian Brass Carriage Clock",
+            "category_id": "collectibles",
+            "era": "1880s",
+            "description": "From the field suggestion",
+            "keywords": ["fallback"]
+        }
+
+    def generate_description(self, product_data, use_cache=True):
+        self._record("description", product_data)
+        return {"description": "Full description", "seo_title": "Brass Carriage Clock"}
+
+    def generate_valuation(self, product_data, use_cache=True):
+        self._record("valuation", product_data)
+        return {"low": 100, "high": 200, "recommended": 150}
+
+    def generate_seo_keywords(self, product_data, count=15, use_cache=True):
+        self._record("keywords", product_data)
+        return ["carriage clock", "brass clock"]
+
+
+class TestGenerateAll(unittest.TestCase):
+    def test_independent_requests_run_concurrently(self):
+        engine = TimedEngine()
+        result = engine.generate_all({"title": "Brass clock", "images": ["a.jpg"]}, {})
+
+        self.assertEqual(result["errors"], {})
+        # Every step has a title, so nothing waits on suggest_fields
+        for step in ("description", "valuation", "keywords"):
+            self.assertFalse(engine.calls[step]["fields_done"], step)
+        self.assertLess(result["elapsed_seconds"], 2 * DELAY)
+        self.assertGreaterEqual(sum(result["timings"].values()), 4 * DELAY * 0.9)
+
+    def test_title_dependent_requests_wait_for_suggestion(self):
+        engine = TimedEngine()
+        progress = []
+        result = engine.generate_all(
+            {"title": "", "images": ["a.jpg"]}, {},
+            progress_callback=lambda done, total, step: progress.append((done, total, step))
+        )
+
+        self.assertFalse(engine.calls["description"]["fields_done"])
+        for step in ("valuation", "keywords"):
+            self.assertTrue(engine.calls[step]["fields_done"], step)
+            self.assertEqual(engine.calls[step]["title"], "Victorian Brass Carriage Clock")
+        # Longest chain is suggest_fields -> valuation
+        self.assertLess(result["elapsed_seconds"], 3 * DELAY)
+        self.assertEqual([p[0] for p in progress], [1, 2, 3, 4])
+
+    def test_merged_result(self):
+        engine = TimedEngine()
+        result = engine.generate_all({"title": "", "images": ["a.jpg"]}, {})
+
+        self.assertEqual(result["title"], "Victorian Brass Carriage Clock")
+        self.assertEqual(result["era"], "1880s")
+        self.assertEqual(result["description"], "Full description")
+        self.assertEqual(result["seo_title"], "Brass Carriage Clock")
+        self.assertEqual(result["keywords"], ["carriage clock", "brass clock"])
+        self.assertEqual(result["valuation"]["recommended"], 150)
+
+    def test_failed_step_is_reported(self):
+        engine = TimedEngine()
+        with mock.patch.object(engine, "generate_valuation", side_effect=RuntimeError("timeout")):
+            result = engine.generate_all({"title": "Brass clock", "images": ["a.jpg"]}, {})
+
+        self.assertEqual(result["errors"], {"valuation": "timeout"})
+        self.assertEqual(result["description"], "Full description")
+        self.assertEqual(result["valuation"], {})
+
+
+def full_listing(**overrides):
+    listing = {
+        "fields": {"title": "Brass Carriage Clock", "category_id": "collectibles", "era": "1880s"},
+        "description": {"description": "A fine French carriage clock. " * 10, "seo_title": "Carriage Clock"},
+        "valuation": {"low": 300, "high": 500, "recommended": 420, "confidence": "Tier 2"},
+        "keywords": ["carriage clock", "brass clock", "french clock", "antique clock", "mantel clock"]
+    }
+    listing.update(overrides)
+    return listing
+
+
+class TestGenerateListing(unittest.TestCase):
+    categories = {"collectibles": {}, "militaria": {}}
+
+    def test_valid_reply_needs_one_request(self):
+        engine = TimedEngine()
+        engine.listing_reply = full_listing()
+        result = engine.generate_listing({"title": "", "images": ["a.jpg"]}, self.categories)
+
+        self.assertEqual(engine.requests, 1)
+        self.assertEqual(engine.calls, {})
+        self.assertEqual(result["fallbacks"], [])
+        self.assertEqual(result["title"], "Brass Carriage Clock")
+        self.assertEqual(result["seo_title"], "Carriage Clock")
+        self.assertEqual(result["valuation"]["recommended"], 420)
+        self.assertEqual(len(result["keywords"]), 5)
+
+    def test_only_invalid_sections_fall_back(self):
+        engine = TimedEngine()
+        engine.listing_reply = full_listing(valuation={"low": 900, "high": 500, "recommended": 700})
+        result = engine.generate_listing({"title": "", "images": ["a.jpg"]}, self.categories)
+
+        self.assertEqual(result["fallbacks"], ["valuation"])
+        self.assertEqual(list(engine.calls), ["valuation"])
+        # Title comes from the validated reply, not a second suggest_fields call
+        self.assertEqual(engine.calls["valuation"]["title"], "Brass Carriage Clock")
+        self.assertEqual(result["valuation"]["recommended"], 150)
+        self.assertEqual(result["description"], full_listing()["description"]["description"])
+
+    def test_usage_is_per_listing_on_a_shared_engine(self):
+        engine = TimedEngine()
+        engine.listing_reply = full_listing()
+        engine.generate_listing({"title": "", "images": ["a.jpg"]}, self.categories)
+        result = engine.generate_listing({"title": "", "images": ["b.jpg"]}, self.categories)
+
+        self.assertEqual((result["usage"]["requests"], result["usage"]["input_tokens"]), (1, 1000))
+        self.assertEqual((result["session_usage"]["requests"], result["session_usage"]["input_tokens"]), (2, 2000))
+
+    def test_validate_listing(self):
+        self.assertEqual(validate_listing(full_listing(), self.categories),
+                         {"fields": [], "description": [], "valuation": [], "keywords": []})
+        problems = validate_listing(
+            full_listing(fields={"title": "x", "category_id": "toys"}, keywords=["one"], description="text"),
+            self.categories
+        )
+        self.assertTrue(problems["fields"] and problems["keywords"] and problems["description"])
+        self.assertFalse(problems["valuation"])
+        self.assertTrue(all(validate_listing(None).values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
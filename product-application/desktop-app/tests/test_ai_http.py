@@ -0,0 +1,102 @@
+import json
+import os
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from modules import ai_engine
+from modules.ai_engine import AIEngine, get_ai_engine
+from modules.ai_http import AIHttpTransport
+from modules.ai_scheduler import RequestScheduler
+
+MESSAGE = json.dumps({
+    "id": "msg_1", "type": "message", "role": "assistant", "model": "m",
+    "content": [{"type": "text", "text": "pong"}], "stop_reason": "end_turn",
+    "usage": {"input_tokens": 5, "output_tokens": 1}
+}).encode("utf-8")
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.connections.add(self.client_address)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(MESSAGE)))
+        self.end_headers()
+        self.wfile.write(MESSAGE)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestPooledTransport(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+        self.server.connections = set()
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.transport = AIHttpTransport(pool_size=2)
+
+    def tearDown(self):
+        self.transport.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_http_fallback_reuses_connection(self):
+        with mock.patch.dict(os.environ, {"ANTHROPIC_API_KEY": "sk-ant-test"}):
+            engine = AIEngine({"ai": {"cache": {"enabled": False}}})
+        engine.client = None
+        engine.http = self.transport
+        engine.scheduler = RequestScheduler(None, None, None)
+        engine.api_url = self.base_url + "/v1/messages"
+
+        for _ in range(3):
+            result = engine._make_api_request([{"role": "user", "content": "ping"}])
+            self.assertEqual(result["text"], "pong")
+            # Per-call payload stats come back with the result, not on the shared engine
+            self.assertEqual(result["request_stats"]["images"], 0)
+
+        self.assertEqual(len(self.server.connections), 1)
+        self.assertEqual(self.transport.stats.snapshot()["http"], {
+            "requests": 3, "new_connections": 1, "reused": 2, "reuse_ratio": 0.667
+        })
+
+    def test_sdk_client_reuses_connection(self):
+        from anthropic import Anthropic
+
+        client = Anthropic(api_key="sk-ant-test", base_url=self.base_url,
+                           http_client=self.transport.sdk_http_client(), max_retries=0)
+        for _ in range(3):
+            client.messages.create(model="m", max_tokens=1, messages=[{"role": "user", "content": "ping"}])
+
+        self.assertEqual(len(self.server.connections), 1)
+        stats = self.transport.stats.snapshot()["sdk"]
+        self.assertEqual((stats["requests"], stats["new_connections"]), (3, 1))
+
+
+class TestAppEngine(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(ai_engine, "_engine", None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_engine_is_reused_until_ai_config_changes(self):
+        config = {"ai": {"cache": {"enabled": False}, "model": "a"}}
+        with mock.patch.dict(os.environ, {"ANTHROPIC_API_KEY": "sk-ant-test"}):
+            first = get_ai_engine(config)
+            self.assertIs(get_ai_engine(config), first)
+            self.assertIs(first.http, get_ai_engine(config).http)
+
+            config["ai"]["model"] = "b"
+            second = get_ai_engine(config)
+        self.assertIsNot(second, first)
+        self.assertEqual(second.model, "b")
+        self.assertIs(second.http, first.http)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import base64
+import io
+import os
+import tempfile
+import unittest
+
+from PIL import Image
+
+from modules.ai_image_encoder import ImagePayloadEncoder, measure_request
+
+
+def decode(block):
+    return Image.open(io.BytesIO(base64.b64decode(block["source"]["data"])))
+
+
+class TestImagePayloadEncoder(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.encoder = ImagePayloadEncoder(max_edge=800)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_large_image_is_downsized(self):
+        path = os.path.join(self.tmp.name, "camera.png")
+        Image.effect_noise((3000, 2000), 40).convert("RGB").save(path)
+
+        block = self.encoder.encode(path)
+        self.assertEqual(block["source"]["media_type"], "image/jpeg")
+        self.assertEqual(decode(block).size, (800, 533))
+
+        stats = measure_request([{"role": "user", "content": [block, {"type": "text", "text": "hi"}]}], self.encoder)
+        self.assertEqual(stats["images"], 1)
+        self.assertEqual(stats["original_image_bytes"], os.path.getsize(path))
+        self.assertLess(stats["image_bytes"], stats["original_image_bytes"] / 4)
+
+    def test_exif_orientation_applied(self):
+        path = os.path.join(self.tmp.name, "rotated.jpg")
+        exif = Image.Exif()
+        exif[0x0112] = 6  # Rotated 90 degrees
+        Image.new("RGB", (1200, 600), (200, 100, 50)).save(path, exif=exif)
+        self.assertEqual(decode(self.encoder.encode(path)).size, (400, 800))
+
+    def test_small_original_sent_as_is(self):
+        path = os.path.join(self.tmp.name, "small.jpg")
+        Image.effect_noise((300, 200), 60).convert("RGB").save(path, quality=40)
+        block = self.encoder.encode(path)
+        with open(path, "rb") as f:
+            self.assertEqual(base64.b64decode(block["source"]["data"]), f.read())
+
+    def test_payload_cached_by_content(self):
+        first = os.path.join(self.tmp.name, "a.png")
+        Image.new("RGB", (1000, 1000), (1, 2, 3)).save(first)
+        copy = os.path.join(self.tmp.name, "b.png")
+        with open(first, "rb") as src, open(copy, "wb") as dst:
+            dst.write(src.read())
+
+        block = self.encoder.encode(first)
+        self.assertIs(self.encoder.encode(copy), block)
+        self.assertEqual((self.encoder.hits, self.encoder.misses), (1, 1))
+
+        Image.new("RGB", (1000, 1000), (9, 9, 9)).save(first)
+        self.assertIsNot(self.encoder.encode(first), block)
+        self.assertIsNone(self.encoder.encode(os.path.join(self.tmp.name, "missing.jpg")))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,166 @@
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+
+from modules import ai_scheduler
+from modules.ai_engine import AIEngine
+from modules.ai_scheduler import (
+    PRIORITY_BULK, PRIORITY_INTERACTIVE, RequestScheduler, TokenBucket, estimate_input_tokens, get_scheduler
+)
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_refill_and_wait_time(self):
+        bucket = TokenBucket(per_minute=60, burst_seconds=5)  # 1/s, capacity 5
+        self.assertEqual(bucket.wait_time(5, now=0.0), 0.0)
+        bucket.take(5, now=0.0)
+        self.assertAlmostEqual(bucket.wait_time(2, now=0.0), 2.0)
+        self.assertAlmostEqual(bucket.wait_time(2, now=1.5), 0.5)
+        # Never refills past capacity
+        self.assertEqual(bucket.wait_time(5, now=100.0), 0.0)
+        self.assertEqual(bucket.level, 5)
+
+    def test_oversized_request_overdraws(self):
+        bucket = TokenBucket(per_minute=60, burst_seconds=5)
+        self.assertEqual(bucket.wait_time(8, now=0.0), 0.0)
+        bucket.take(8, now=0.0)
+        self.assertAlmostEqual(bucket.wait_time(1, now=0.0), 4.0)
+
+    def test_adjust_refunds_up_to_capacity(self):
+        bucket = TokenBucket(per_minute=60, burst_seconds=5)
+        bucket.take(4, now=0.0)
+        bucket.adjust(-10, now=0.0)
+        self.assertEqual(bucket.level, 5)
+
+
+class TestRequestScheduler(unittest.TestCase):
+    def test_request_rate_is_capped(self):
+        # 20 requests/s, bursts of 2
+        scheduler = RequestScheduler(1200, None, None, burst_seconds=0.1)
+        start = time.monotonic()
+        threads = [threading.Thread(target=scheduler.admit) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        # 2 immediately, then 6 more at 20/s
+        self.assertGreaterEqual(time.monotonic() - start, 0.28)
+        metrics = scheduler.metrics()
+        self.assertEqual(metrics["admitted"], 8)
+        self.assertGreater(metrics["max_queue_depth"], 1)
+        self.assertEqual(metrics["queued"], {"interactive": 0, "bulk": 0})
+
+    def test_token_estimates_are_settled_with_usage(self):
+        scheduler = RequestScheduler(None, 6000, 600, burst_seconds=10)  # capacity 1000 / 100
+        result = scheduler.run(
+            lambda: {"success": True, "usage": {"input_tokens": 200, "output_tokens": 20}},
+            input_tokens=900, output_tokens=100
+        )
+        self.assertTrue(result["success"])
+        levels = scheduler.metrics()["buckets"]
+        self.assertAlmostEqual(levels["input_tokens"], 800, delta=2)
+        self.assertAlmostEqual(levels["output_tokens"], 80, delta=2)
+
+    def test_interactive_lane_goes_first(self):
+        scheduler = RequestScheduler(600, None, None, burst_seconds=0.1)  # 10/s, bursts of 1
+        scheduler.admit()  # Empty the bucket
+        order = []
+
+        def request(priority, name):
+            scheduler.admit(priority=priority)
+            order.append(name)
+
+        bulk = [threading.Thread(target=request, args=(PRIORITY_BULK, f"bulk{i}")) for i in range(3)]
+        for t in bulk:
+            t.start()
+        while scheduler.metrics()["queued"]["bulk"] < 3:
+            time.sleep(0.005)
+        interactive = threading.Thread(target=request, args=(PRIORITY_INTERACTIVE, "interactive"))
+        interactive.start()
+        for t in bulk + [interactive]:
+            t.join()
+        self.assertEqual(order[0], "interactive")
+        self.assertEqual(sorted(order[1:]), ["bulk0", "bulk1", "bulk2"])
+
+    def test_retry_after_pauses_and_retries(self):
+        scheduler = RequestScheduler(None, None, None)
+        replies = [
+            {"success": False, "status_code": 429, "retry_after": 0.2},
+            {"success": True, "text": "ok"}
+        ]
+        start = time.monotonic()
+        result = scheduler.run(lambda: replies.pop(0))
+        self.assertEqual(result["text"], "ok")
+        self.assertGreaterEqual(time.monotonic() - start, 0.19)
+        metrics = scheduler.metrics()
+        self.assertEqual((metrics["retries"], metrics["rate_limited"], metrics["admitted"]), (1, 1, 2))
+
+    def test_gives_up_after_max_retries(self):
+        scheduler = RequestScheduler(None, None, None, max_retries=2)
+        calls = []
+
+        def call():
+            calls.append(1)
+            return {"success": False, "status_code": 529, "retry_after": 0}
+
+        self.assertEqual(scheduler.run(call)["status_code"], 529)
+        self.assertEqual(len(calls), 3)
+
+    def test_from_config(self):
+        scheduler = RequestScheduler.from_config({"ai": {"rate_limits": {
+            "requests_per_minute": 120, "input_tokens_per_minute": 0, "max_retries": 1
+        }}})
+        self.assertEqual(sorted(scheduler.buckets), ["output_tokens", "requests"])
+        self.assertEqual(scheduler.buckets["requests"].rate, 2)
+        self.assertEqual(scheduler.max_retries, 1)
+
+    def test_changed_limits_apply_to_the_shared_scheduler(self):
+        with mock.patch.object(ai_scheduler, "_scheduler", None):
+            config = {"ai": {"rate_limits": {"requests_per_minute": 60, "burst_seconds": 5}}}
+            scheduler = get_scheduler(config)
+            scheduler.admit()
+            scheduler.admit()
+            self.assertIs(get_scheduler(config), scheduler)
+            self.assertAlmostEqual(scheduler.buckets["requests"].level, 3, delta=0.1)
+
+            config["ai"]["rate_limits"] = {"requests_per_minute": 120, "input_tokens_per_minute": 0}
+            self.assertIs(get_scheduler(config), scheduler)
+        self.assertEqual(scheduler.buckets["requests"].rate, 2)
+        self.assertNotIn("input_tokens", scheduler.buckets)
+        # Level carried over: no fresh burst from the change
+        self.assertAlmostEqual(scheduler.buckets["requests"].level, 3, delta=0.1)
+
+
+class TestEngineRateLimits(unittest.TestCase):
+    def setUp(self):
+        with mock.patch.dict(os.environ, {"ANTHROPIC_API_KEY": "sk-ant-test"}):
+            self.engine = AIEngine({"ai": {"cache": {"enabled": False}}})
+        self.engine.client = None
+        self.engine.scheduler = RequestScheduler(None, None, None)
+
+    def test_429_from_http_is_retried(self):
+        responses = [
+            mock.Mock(status_code=429, headers={"retry-after": "0"}, text="rate limited"),
+            mock.Mock(status_code=200, json=lambda: {
+                "content": [{"type": "text", "text": "hello"}],
+                "usage": {"input_tokens": 10, "output_tokens": 2}
+            })
+        ]
+        with mock.patch.object(self.engine.http.session, "post", side_effect=responses) as post:
+            result = self.engine._make_api_request([{"role": "user", "content": "hi"}])
+        self.assertEqual(post.call_count, 2)
+        self.assertEqual(result["text"], "hello")
+        self.assertEqual(self.engine.scheduler.metrics()["rate_limited"], 1)
+
+    def test_estimate_counts_images(self):
+        messages = [{"role": "user", "content": [
+            {"type": "image", "source": {}},
+            {"type": "text", "text": "x" * 400}
+        ]}]
+        self.assertEqual(estimate_input_tokens(messages, "y" * 40), 1600 + 110)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,108 @@
+import json
+import os
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from modules.ai_engine import AIEngine
+from modules.ai_streaming import iter_sse, partial_json_string, stream_http
+
+REPLY = json.dumps({"title": "Brass clock", "description": "Line one.\nA \"fine\" clock é"})
+
+
+def sse_events(text, pieces=8):
+    step = max(1, len(text) // pieces)
+    yield "message_start", {"type": "message_start", "message": {"usage": {
+        "input_tokens": 40, "cache_read_input_tokens": 1200, "output_tokens": 1}}}
+    for i in range(0, len(text), step):
+        yield "content_block_delta", {"type": "content_block_delta", "index": 0,
+                                      "delta": {"type": "text_delta", "text": text[i:i + step]}}
+    yield "message_delta", {"type": "message_delta", "usage": {"output_tokens": 25}}
+    yield "message_stop", {"type": "message_stop"}
+
+
+class SSEHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append(body)
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for event, data in sse_events(REPLY):
+            self.wfile.write(f"event: {event}\ndata: {json.dumps(data)}\n\n".encode("utf-8"))
+            self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+class TestStreaming(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), SSEHandler)
+        self.server.requests = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/v1/messages"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_iter_sse(self):
+        lines = [b"event: ping", b"data: {}", b"", b": keep-alive", b"event: x", b'data: {"a":', b"data: 1}", b""]
+        self.assertEqual(list(iter_sse(lines)), [("ping", {}), ("x", {"a": 1})])
+
+    def test_stream_http_deltas_and_usage(self):
+        deltas = []
+        result = stream_http(self.url, {}, {"model": "m", "messages": []}, deltas.append)
+
+        self.assertTrue(result["success"])
+        self.assertEqual(result["text"], REPLY)
+        self.assertGreater(len(deltas), 4)
+        self.assertEqual(result["usage"]["cache_read_input_tokens"], 1200)
+        self.assertEqual(result["usage"]["output_tokens"], 25)
+        self.assertTrue(self.server.requests[0]["stream"])
+
+    def test_cancel_mid_stream(self):
+        deltas = []
+        result = stream_http(
+            self.url, {}, {"model": "m", "messages": []}, deltas.append,
+            should_cancel=lambda: len(deltas) >= 2
+        )
+        self.assertTrue(result["cancelled"])
+        self.assertFalse(result["success"])
+        self.assertEqual(result["text"], "".join(deltas))
+        self.assertLess(len(result["text"]), len(REPLY))
+
+    def test_engine_stream_description_uses_http_fallback(self):
+        with mock.patch.dict(os.environ, {"ANTHROPIC_API_KEY": "sk-ant-test"}):
+            engine = AIEngine({"ai": {"cache": {"enabled": False}}})
+        engine.client = None
+        engine.api_url = self.url
+
+        deltas = []
+        result = engine.stream_description({"title": "Brass clock"}, on_delta=deltas.append)
+
+        self.assertEqual(result["description"], "Line one.\nA \"fine\" clock é")
+        self.assertEqual("".join(deltas), REPLY)
+        self.assertEqual(engine.usage.totals()["cache_read_input_tokens"], 1200)
+
+
+class TestPartialJsonString(unittest.TestCase):
+    def test_prefixes_decode_progressively(self):
+        text = json.dumps({"title": "x", "description": "Tab\there \"quoted\" é \U0001F600 end"})
+        previous = ""
+        for n in range(len(text) + 1):
+            partial = partial_json_string(text[:n], "description")
+            if partial is None:
+                continue
+            self.assertTrue(partial[0].startswith(previous))
+            previous = partial[0]
+        self.assertEqual(partial, ("Tab\there \"quoted\" é \U0001F600 end", True))
+
+    def test_missing_field(self):
+        self.assertIsNone(partial_json_string('{"title": "x"', "description"))
+
+
+if __name__ == "__main__":
+    unittest.main()
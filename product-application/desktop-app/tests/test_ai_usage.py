@@ -0,0 +1,69 @@
+import unittest
+from types import SimpleNamespace
+
+from modules.ai_usage import UsageTracker, add_cache_markers, usage_from_response
+
+
+def image_block(data):
+    return {"type": "image", "source": {"type": "base64", "media_type": "image/jpeg", "data": data}}
+
+
+class TestCacheMarkers(unittest.TestCase):
+    def test_marks_system_and_last_image_without_mutating(self):
+        first, second = image_block("AAAA"), image_block("BBBB")
+        messages = [{"role": "user", "content": [first, second, {"type": "text", "text": "Describe"}]}]
+
+        system, marked = add_cache_markers("Long system prompt", messages)
+
+        self.assertEqual(system[0]["text"], "Long system prompt")
+        self.assertEqual(system[0]["cache_control"], {"type": "ephemeral"})
+        content = marked[0]["content"]
+        self.assertNotIn("cache_control", content[0])
+        self.assertEqual(content[1]["cache_control"], {"type": "ephemeral"})
+        self.assertNotIn("cache_control", content[2])
+        # Originals (shared with the image encoder cache) are untouched
+        self.assertNotIn("cache_control", second)
+        self.assertNotIn("cache_control", messages[0]["content"][1])
+
+    def test_text_only_request(self):
+        messages = [{"role": "user", "content": [{"type": "text", "text": "Keywords"}]}]
+        system, marked = add_cache_markers(None, messages)
+        self.assertIsNone(system)
+        self.assertIs(marked, messages)
+
+
+class TestUsage(unittest.TestCase):
+    def test_usage_from_sdk_object_and_json(self):
+        sdk = SimpleNamespace(
+            input_tokens=12, output_tokens=300,
+            cache_creation_input_tokens=None, cache_read_input_tokens=2100
+        )
+        self.assertEqual(usage_from_response(sdk), {
+            "input_tokens": 12, "output_tokens": 300,
+            "cache_creation_input_tokens": 0, "cache_read_input_tokens": 2100
+        })
+        self.assertEqual(usage_from_response({"input_tokens": 5})["cache_read_input_tokens"], 0)
+
+    def test_tracker_since_snapshot(self):
+        tracker = UsageTracker()
+        tracker.add(usage_from_response({"input_tokens": 100, "output_tokens": 50}))
+        before = tracker.totals()
+        tracker.add(usage_from_response({"input_tokens": 10, "cache_read_input_tokens": 30, "output_tokens": 5}))
+
+        delta = tracker.since(before)
+        self.assertEqual((delta["requests"], delta["input_tokens"], delta["output_tokens"]), (1, 10, 5))
+        self.assertEqual(delta["cache_read_ratio"], 0.75)
+
+    def test_tracker_totals(self):
+        tracker = UsageTracker()
+        tracker.add(usage_from_response({"input_tokens": 100, "cache_creation_input_tokens": 900, "output_tokens": 50}))
+        tracker.add(usage_from_response({"input_tokens": 100, "cache_read_input_tokens": 900, "output_tokens": 50}))
+
+        totals = tracker.totals()
+        self.assertEqual(totals["requests"], 2)
+        self.assertEqual(totals["output_tokens"], 100)
+        self.assertEqual(totals["cache_read_ratio"], 0.45)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from modules.background_remover import BackgroundRemover
+from modules.process_pool import split_cores
+from modules.rembg_session import MODEL_PROFILES
+
+
+class TestSplitCores(unittest.TestCase):
+    def test_auto_fills_cores_without_oversubscription(self):
+        for cpu_count in (1, 2, 4, 8, 16, 64):
+            with mock.patch("os.cpu_count", return_value=cpu_count):
+                workers, threads = split_cores(100)
+                self.assertGreaterEqual(workers, 1)
+                self.assertGreaterEqual(threads, 1)
+                self.assertLessEqual(workers * threads, cpu_count)
+                self.assertGreaterEqual(workers * threads, cpu_count - threads)
+
+    def test_few_jobs_get_more_threads(self):
+        with mock.patch("os.cpu_count", return_value=8):
+            self.assertEqual(split_cores(2), (2, 4))
+            self.assertEqual(split_cores(1), (1, 8))
+            self.assertEqual(split_cores(10, workers=2, threads=3), (2, 3))
+
+
+class TestModelProfiles(unittest.TestCase):
+    def test_profiles_pick_models(self):
+        remover = BackgroundRemover({"image_processing": {"background_removal": {"profile": "quality"}}})
+        self.assertEqual(remover.model_name, MODEL_PROFILES["quality"])
+        self.assertEqual(remover.preview_model_name, MODEL_PROFILES["draft"])
+
+    def test_explicit_model_wins(self):
+        remover = BackgroundRemover({"image_processing": {"background_removal": {
+            "model": "u2net_human_seg", "profile": "draft", "preview_profile": "silueta"
+        }}})
+        self.assertEqual(remover.model_name, "u2net_human_seg")
+        self.assertEqual(remover.preview_model_name, "silueta")
+
+
+class TestQuickPreview(unittest.TestCase):
+    def test_quick_preview_is_proxy_sized(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "large.jpg")
+            img = Image.new("RGB", (2400, 1600), (250, 250, 250))
+            ImageDraw.Draw(img).rectangle((600, 400, 1800, 1200), fill=(30, 60, 120))
+            img.save(path, quality=90)
+
+            remover = BackgroundRemover({"image_processing": {"background_removal": {
+                "preview_size": 300, "mask_cache": {"enabled": False}
+            }}})
+            preview = remover.quick_preview(path)
+
+            self.assertEqual(preview.mode, "RGBA")
+            self.assertLessEqual(max(preview.size), 300)
+            self.assertEqual(preview.width * 2, preview.height * 3)
+
+
+class TestBatchRemove(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        for i in range(4):
+            img = Image.new("RGB", (240, 180), (250, 250, 250))
+            ImageDraw.Draw(img).ellipse((40 + i * 10, 30, 200, 150), fill=(20 * i, 80, 140))
+            img.save(os.path.join(self.tmp.name, f"item-{i}.jpg"), quality=95)
+        self.config = {"image_processing": {"background_removal": {"mask_cache": {"enabled": False}}}}
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_parallel_matches_serial(self):
+        remover = BackgroundRemover(self.config)
+        serial_dir = os.path.join(self.tmp.name, "serial")
+        pool_dir = os.path.join(self.tmp.name, "pool")
+        progress = []
+
+        serial = remover.batch_remove(self.tmp.name, serial_dir, workers=1)
+        with mock.patch("os.cpu_count", return_value=4):
+            pooled = remover.batch_remove(
+                self.tmp.name, pool_dir, workers=2,
+                progress_callback=lambda current, total, name: progress.append(current)
+            )
+
+        self.assertEqual(serial["processed"], 4)
+        self.assertEqual(pooled["processed"], 4)
+        self.assertEqual(pooled["workers"], 2)
+        self.assertEqual(sorted(progress), [1, 2, 3, 4])
+        self.assertGreater(pooled["images_per_minute"], 0)
+        for a, b in zip(serial["files"], pooled["files"]):
+            self.assertEqual(os.path.basename(a), os.path.basename(b))
+            self.assertTrue(np.array_equal(np.asarray(Image.open(a)), np.asarray(Image.open(b))))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from PIL import Image
+
+from modules.batch_manifest import BatchManifest, STATE_ORIGINAL_DELETED, STATE_VERIFIED
+from modules.image_processor import ImageProcessor
+
+
+class TestBatchManifestResume(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.folder = Path(self._tmp.name)
+        self.config = {"image_processing": {"cache": {"enabled": False}, "parallel_workers": 1}}
+        for name, color in (("a.jpg", (255, 0, 0)), ("b.jpg", (0, 255, 0)), ("c.jpg", (0, 0, 255))):
+            Image.new("RGB", (300, 200), color).save(self.folder / name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_states_recorded_and_rerun_skips_completed(self):
+        processor = ImageProcessor(self.config)
+        paths = [str(self.folder / n) for n in ("a.jpg", "b.jpg", "c.jpg")]
+
+        first = processor.process_images(paths[:2], {"delete_originals": False})
+        self.assertEqual((first["processed"], first["resumed"]), (2, 0))
+
+        manifest = BatchManifest(str(self.folder))
+        self.assertEqual(manifest.get(paths[0])["state"], STATE_VERIFIED)
+        self.assertNotIn("c.jpg", manifest.entries)
+
+        # Re-run over the whole folder: a and b resume, c is encoded,
+        # and every original is deleted only after its output verified
+        second = processor.batch_process(str(self.folder), {"delete_originals": True})
+        self.assertEqual((second["processed"], second["resumed"], second["deleted"]), (3, 2, 3))
+
+        states = json.loads(manifest.path.read_text())["entries"]
+        self.assertEqual({e["state"] for e in states.values()}, {STATE_ORIGINAL_DELETED})
+        self.assertFalse(any(Path(p).exists() for p in paths))
+
+    def test_changed_options_or_source_reprocess(self):
+        processor = ImageProcessor(self.config)
+        path = str(self.folder / "a.jpg")
+
+        processor.process_images([path], {"delete_originals": False})
+        again = processor.process_images([path], {"delete_originals": False, "quality": 70})
+        self.assertEqual(again["resumed"], 0)
+
+        same = processor.process_images([path], {"delete_originals": False, "quality": 70})
+        self.assertEqual(same["resumed"], 1)
+
+        Image.new("RGB", (320, 200), (9, 9, 9)).save(path)
+        replaced = processor.process_images([path], {"delete_originals": False, "quality": 70})
+        self.assertEqual(replaced["resumed"], 0)
+        self.assertEqual(replaced["images"][0]["new_size"], (320, 200))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+
+from modules.classic_segmenter import flood_from_border, segment_foreground
+from modules.mask_refine import alpha_agreement
+
+
+def studio_shot(width=1600, height=1200, seed=3):
+    """Graded grey sweep with sensor noise; a brown product with a pale label."""
+    rng = np.random.default_rng(seed)
+    shade = np.linspace(1.0, 0.85, height)[:, None, None]
+    background = np.array([236, 235, 231]) * shade + rng.normal(0, 3, (height, width, 3))
+    img = Image.fromarray(background.clip(0, 255).astype(np.uint8))
+
+    truth = Image.new("L", img.size, 0)
+    draw = ImageDraw.Draw(truth)
+    draw.ellipse((450, 250, 1150, 950), fill=255)
+    draw.rectangle((760, 120, 840, 260), fill=255)
+
+    product = Image.new("RGB", img.size, (120, 72, 40))
+    # Label the same colour as the backdrop: must stay foreground
+    ImageDraw.Draw(product).rectangle((650, 500, 950, 700), fill=(234, 233, 229))
+    img.paste(product, mask=truth.filter(ImageFilter.GaussianBlur(1)))
+    return img, np.asarray(truth)
+
+
+class TestClassicSegmenter(unittest.TestCase):
+    def test_flood_fill_keeps_enclosed_regions(self):
+        candidate = np.ones((9, 9), dtype=bool)
+        candidate[2:7, 2:7] = False
+        candidate[4, 4] = True  # Background-coloured, but enclosed
+        reached = flood_from_border(candidate)
+        self.assertTrue(reached[0, 0] and reached[8, 8])
+        self.assertFalse(reached[4, 4])
+        self.assertEqual(int(reached.sum()), 81 - 25)
+
+    def test_studio_shot(self):
+        img, truth = studio_shot()
+        alpha = segment_foreground(img, strength=0.8)
+
+        self.assertEqual(alpha.size, img.size)
+        quality = alpha_agreement(np.asarray(alpha), truth)
+        self.assertGreater(quality["iou"], 0.98)
+        self.assertLess(quality["mean_abs_diff"], 3.0)
+
+    def test_product_touching_border(self):
+        img, truth = studio_shot()
+        # Crop so the product runs off the bottom edge
+        img, truth = img.crop((0, 0, 1600, 800)), truth[:800]
+        alpha = np.asarray(segment_foreground(img, strength=0.8))
+        self.assertGreater(alpha_agreement(alpha, truth)["iou"], 0.98)
+
+
+if __name__ == "__main__":
+    unittest.main()
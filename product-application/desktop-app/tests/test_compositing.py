@@ -0,0 +1,58 @@
+import unittest
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter, ImageOps
+
+from modules.compositing import composite_image, feather_alpha, parse_background
+
+
+def legacy_composite(img, bg_rgb, preserve_shadows, feather):
+    """The previous PIL split/merge/alpha_composite chain, for comparison."""
+    r, g, b, a = img.split()
+    if feather:
+        a = a.filter(ImageFilter.GaussianBlur(radius=feather))
+    img = Image.merge("RGBA", (r, g, b, a))
+    background = Image.new("RGBA", img.size, (*bg_rgb, 255))
+    if preserve_shadows:
+        shadow = ImageOps.invert(a).point(lambda x: int(x * 0.1))
+        shadow_layer = Image.new("RGBA", img.size, (0, 0, 0, 0))
+        shadow_layer.putalpha(shadow)
+        background = Image.alpha_composite(background, shadow_layer)
+    return Image.alpha_composite(background, img).convert("RGB")
+
+
+class TestCompositing(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        photo = Image.fromarray(rng.integers(0, 256, (700, 900, 3), dtype=np.uint8))
+        alpha = Image.new("L", photo.size, 0)
+        ImageDraw.Draw(alpha).ellipse((150, 100, 750, 600), fill=255)
+        alpha = alpha.filter(ImageFilter.GaussianBlur(3))
+        self.cutout = photo.convert("RGBA")
+        self.cutout.putalpha(alpha)
+
+    def test_matches_legacy_chain(self):
+        for shadows in (True, False):
+            for feather in (0, 2):
+                expected = np.asarray(legacy_composite(self.cutout, (240, 224, 208), shadows, feather), dtype=int)
+                actual = np.asarray(composite_image(self.cutout, "#F0E0D0", shadows, feather), dtype=int)
+                self.assertLessEqual(np.abs(expected - actual).max(), 1, (shadows, feather))
+
+    def test_feather_equals_full_frame_blur(self):
+        alpha = np.asarray(self.cutout.getchannel("A"))
+        expected = np.asarray(Image.fromarray(alpha).filter(ImageFilter.GaussianBlur(2)))
+        np.testing.assert_array_equal(feather_alpha(alpha, 2), expected)
+
+    def test_gradient_and_transparent(self):
+        self.assertEqual(parse_background("gradient:#FFFFFF,#000000"), ((255, 255, 255), (0, 0, 0)))
+        result = composite_image(self.cutout, "gradient:#FFFFFF,#000000", preserve_shadows=False)
+        self.assertEqual(result.getpixel((0, 0)), (255, 255, 255))
+        self.assertEqual(result.getpixel((0, result.height - 1)), (0, 0, 0))
+
+        transparent = composite_image(self.cutout, "transparent", feather_amount=2)
+        self.assertEqual(transparent.mode, "RGBA")
+        self.assertEqual(transparent.getpixel((0, 0))[3], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
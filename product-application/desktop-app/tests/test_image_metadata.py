@@ -0,0 +1,74 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from PIL import Image
+
+from modules.image_metadata import ImageMetadataService
+from modules.utils import validate_image_for_upload
+
+
+class TestImageMetadataService(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write_jpeg(self, name, size=(120, 80), orientation=None):
+        path = self.root / name
+        img = Image.new("RGB", size, (200, 100, 50))
+        exif = Image.Exif()
+        exif[0x010F] = "TestCam"  # Make
+        if orientation:
+            exif[0x0112] = orientation
+        img.save(path, "JPEG", exif=exif)
+        return path
+
+    def test_reads_header_fields_and_orientation(self):
+        path = self._write_jpeg("a.jpg", orientation=6)
+        info = ImageMetadataService().get(str(path))
+
+        self.assertTrue(info["valid"])
+        self.assertEqual(info["format"], "JPEG")
+        self.assertEqual((info["width"], info["height"]), (120, 80))
+        self.assertEqual(info["orientation"], 6)
+        self.assertEqual(info["display_size"], (80, 120))
+        self.assertEqual(info["exif"]["Make"], "TestCam")
+
+    def test_cache_hits_until_file_changes(self):
+        path = self._write_jpeg("a.jpg")
+        service = ImageMetadataService()
+
+        service.get(str(path))
+        service.get(str(path))
+        self.assertEqual((service.hits, service.misses), (1, 1))
+
+        Image.new("RGB", (60, 40)).save(path, "JPEG")
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        self.assertEqual(service.get(str(path))["width"], 60)
+        self.assertEqual(service.misses, 2)
+
+    def test_scan_folder_and_invalid_files(self):
+        self._write_jpeg("b.jpg")
+        self._write_jpeg("a.jpg")
+        (self.root / "broken.png").write_bytes(b"not an image")
+        (self.root / "notes.txt").write_text("skip me")
+
+        results = ImageMetadataService().scan_folder(str(self.root))
+
+        self.assertEqual([Path(p).name for p in results], ["a.jpg", "b.jpg", "broken.png"])
+        self.assertFalse(results[str(self.root / "broken.png")]["valid"])
+
+        ok, _ = validate_image_for_upload(str(self.root / "a.jpg"))
+        bad, error = validate_image_for_upload(str(self.root / "broken.png"))
+        self.assertTrue(ok)
+        self.assertFalse(bad)
+        self.assertIn("Invalid image file", error)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from PIL import Image
+
+from modules.image_processor import ImageProcessor
+
+
+class TestImageProcessorRenditions(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.folder = Path(self._tmp.name)
+        self.source = self.folder / "photo.jpg"
+        Image.new("RGB", (3000, 2000), (180, 120, 60)).save(self.source, quality=90)
+        self.config = {"image_processing": {
+            "max_dimension": 2400,
+            "thumbnail_size": 400,
+            "cache": {"enabled": False}
+        }}
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_single_decode_produces_all_renditions(self):
+        processor = ImageProcessor(self.config)
+        result = processor.process_image(
+            str(self.source),
+            {"listing_widths": [800, 1200, 5000], "delete_originals": False}
+        )
+
+        self.assertEqual(result["new_size"], (2400, 1600))
+        with Image.open(result["thumbnail_path"]) as thumb:
+            self.assertEqual(thumb.size, (400, 267))
+
+        # Oversized widths are skipped, the rest come back largest first
+        widths = [r["width"] for r in result["listing_renditions"]]
+        self.assertEqual(widths, [1200, 800])
+        for rendition in result["listing_renditions"]:
+            with Image.open(rendition["path"]) as img:
+                self.assertEqual(img.size, (rendition["width"], rendition["height"]))
+
+        self.assertTrue(self.source.exists())
+        self.assertFalse(result["original_deleted"])
+
+
+class TestAdaptiveEncoding(unittest.TestCase):
+    def test_target_size_and_line_art_choices(self):
+        import numpy as np
+
+        with tempfile.TemporaryDirectory() as tmp:
+            folder = Path(tmp)
+            # Gradient with sensor-like noise: about 167 KB at the fixed quality 88
+            y, x = np.mgrid[0:600, 0:800]
+            base = np.stack([x * 255 / 800, y * 255 / 600, (x + y) * 255 / 1400], axis=2)
+            noisy = base + np.random.default_rng(7).normal(0, 12, base.shape)
+            photo = folder / "photo.png"
+            Image.fromarray(np.clip(noisy, 0, 255).astype(np.uint8)).save(photo)
+            scan = folder / "scan.png"
+            page = Image.new("RGB", (800, 600), (255, 255, 255))
+            page.paste((0, 0, 0), (100, 100, 700, 110))
+            page.save(scan)
+
+            processor = ImageProcessor({"image_processing": {"cache": {"enabled": False}}})
+            photo_result = processor.process_image(
+                str(photo), {"encode_mode": "target_size", "target_kb": 100, "delete_originals": False}
+            )
+            scan_result = processor.process_image(
+                str(scan), {"encode_mode": "quality_floor", "delete_originals": False}
+            )
+
+            self.assertEqual(photo_result["encode_choice"], "lossy")
+            self.assertLessEqual(photo_result["new_file_size"], 100 * 1024)
+            self.assertGreater(photo_result["bytes_saved"], 0)
+            self.assertEqual(scan_result["encode_choice"], "lossless")
+            self.assertEqual(scan_result["content_class"], "few_colors")
+
+
+class TestImageProcessorParallel(unittest.TestCase):
+    def test_process_pool_keeps_input_order_and_result_shape(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            folder = Path(tmp)
+            paths = []
+            for i, size in enumerate([(900, 600), (600, 900), (700, 700)]):
+                path = folder / f"{i:02d}.png"
+                Image.new("RGB", size, (i * 40, 90, 200)).save(path)
+                paths.append(str(path))
+            broken = folder / "03.jpg"
+            broken.write_bytes(b"not an image")
+            paths.append(str(broken))
+
+            seen = []
+            processor = ImageProcessor({"image_processing": {
+                "max_dimension": 500,
+                "cache": {"enabled": False}
+            }})
+            results = processor.process_images(
+                paths,
+                {"delete_originals": True},
+                progress_callback=lambda current, total, name: seen.append((current, total)),
+                workers=2
+            )
+
+            self.assertEqual(results["total"], 4)
+            self.assertEqual(results["processed"], 3)
+            self.assertEqual(results["failed"], 1)
+            self.assertEqual(results["deleted"], 3)
+            self.assertEqual([r["input_path"] for r in results["images"]], paths[:3])
+            self.assertEqual(results["errors"][0]["file"], "03.jpg")
+            self.assertEqual(seen[-1], (4, 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
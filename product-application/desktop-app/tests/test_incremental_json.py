@@ -0,0 +1,64 @@
+import json
+import unittest
+
+from modules.incremental_json import IncrementalJSONParser
+
+SUGGESTION = {
+    "title": "Victorian \"Brass\" Carriage Clock, c. 1880 }{",
+    "category_id": "collectibles",
+    "condition": "Very Good",
+    "era": "1880s",
+    "origin": "France",
+    "description": "A fine clock.\n\nSecond paragraph with \\ and é.",
+    "keywords": ["carriage clock", "brass", "[antique]"],
+    "valuation": {"low": 400, "high": 650.5, "recommended": 550, "notes": {"x": [1, 2]}},
+    "restored": False,
+    "dimensions": None,
+    "count": -12
+}
+
+
+def feed_all(text, step):
+    parser = IncrementalJSONParser()
+    events = []
+    for i in range(0, len(text), step):
+        events.extend(parser.feed(text[i:i + step]))
+    return parser, events
+
+
+class TestIncrementalJSONParser(unittest.TestCase):
+    def test_any_chunking_gives_every_field_in_order(self):
+        text = "```json\n" + json.dumps(SUGGESTION, indent=2) + "\n```"
+        for step in (1, 2, 5, 17, len(text)):
+            parser, events = feed_all(text, step)
+            self.assertEqual([k for k, _ in events], list(SUGGESTION), step)
+            self.assertEqual(dict(events), SUGGESTION)
+            self.assertTrue(parser.done)
+
+    def test_fields_emitted_before_reply_finishes(self):
+        text = json.dumps(SUGGESTION)
+        cut = text.index("A fine clock") + 5
+        parser = IncrementalJSONParser()
+
+        events = parser.feed(text[:cut])
+        self.assertEqual([k for k, _ in events], ["title", "category_id", "condition", "era", "origin"])
+        self.assertEqual(parser.in_progress(), ("description", '"A fin'))
+        self.assertFalse(parser.done)
+
+        rest = parser.feed(text[cut:])
+        self.assertEqual(rest[0], ("description", SUGGESTION["description"]))
+
+    def test_number_waits_for_delimiter(self):
+        parser = IncrementalJSONParser()
+        self.assertEqual(parser.feed('{"low": 12'), [])
+        self.assertEqual(parser.feed('5, "high": 300}'), [("low", 125), ("high", 300)])
+
+    def test_text_after_object_is_ignored(self):
+        parser = IncrementalJSONParser()
+        events = parser.feed('Here it is: {"title": "Clock"} {"title": "Other"}')
+        self.assertEqual(events, [("title", "Clock")])
+        self.assertEqual(parser.fields, {"title": "Clock"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+from PIL import Image, ImageDraw
+
+from modules.background_remover import BackgroundRemover
+from modules.mask_cache import MaskCache
+
+
+class TestMaskCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.tmp.name, "masks")
+        self.image_path = os.path.join(self.tmp.name, "product.png")
+        img = Image.new("RGB", (320, 240), (250, 250, 250))
+        ImageDraw.Draw(img).rectangle((80, 60, 240, 180), fill=(30, 60, 120))
+        img.save(self.image_path)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def make_remover(self):
+        return BackgroundRemover({"image_processing": {"background_removal": {
+            "mask_cache": {"dir": self.cache_dir}
+        }}})
+
+    def test_put_and_get_mask(self):
+        cache = MaskCache(cache_dir=self.cache_dir)
+        key = cache.make_key(self.image_path, {"strength": 0.8})
+        mask = Image.fromarray(np.tile(np.arange(256, dtype=np.uint8), (10, 1)), "L")
+
+        self.assertIsNone(cache.get_mask(key))
+        self.assertTrue(cache.put_mask(key, mask))
+        self.assertTrue(np.array_equal(np.asarray(cache.get_mask(key)), np.asarray(mask)))
+        self.assertIsNone(cache.get_mask(key, size=(5, 5)))
+        self.assertEqual(cache.stats()["entries"], 1)
+
+    def test_restyle_reuses_mask(self):
+        remover = self.make_remover()
+        first = remover.remove_background(self.image_path, os.path.join(self.tmp.name, "white.png"), bg_color="#FFFFFF")
+        self.assertEqual(remover.mask_cache.hits, 0)
+
+        second = remover.remove_background(
+            self.image_path, os.path.join(self.tmp.name, "clear.png"), bg_color="transparent", feather_amount=0
+        )
+        self.assertEqual(remover.mask_cache.hits, 1)
+        self.assertEqual(Image.open(first).mode, "RGB")
+        self.assertEqual(Image.open(second).mode, "RGBA")
+
+        preview = self.make_remover().preview_removal(self.image_path)
+        self.assertTrue(np.array_equal(
+            np.asarray(preview.getchannel("A")), np.asarray(Image.open(second).getchannel("A"))
+        ))
+
+    def test_strength_is_part_of_key(self):
+        remover = self.make_remover()
+        remover.preview_removal(self.image_path, strength=0.8)
+        remover.preview_removal(self.image_path, strength=0.5)
+        self.assertEqual(remover.mask_cache.hits, 0)
+        self.assertEqual(remover.mask_cache.stats()["entries"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
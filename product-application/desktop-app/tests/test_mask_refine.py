@@ -0,0 +1,57 @@
+import unittest
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+
+from modules.mask_refine import alpha_agreement, boundary_band, make_proxy, refine_alpha, refine_options
+
+
+class TestMaskRefine(unittest.TestCase):
+    def setUp(self):
+        size = (1600, 1200)
+        box = (400, 300, 1200, 900)
+        self.img = Image.new("RGB", size, (235, 235, 235))
+        ImageDraw.Draw(self.img).ellipse(box, fill=(110, 60, 30))
+        self.truth = Image.new("L", size, 0)
+        ImageDraw.Draw(self.truth).ellipse(box, fill=255)
+
+    def test_guided_upsample_beats_plain_resize(self):
+        proxy = make_proxy(self.img, 320)
+        self.assertEqual(max(proxy.size), 320)
+        # Soft, slightly blurry mask as a segmentation model would return
+        mask = self.truth.resize(proxy.size, Image.Resampling.BILINEAR).filter(ImageFilter.GaussianBlur(1.5))
+
+        refined = np.asarray(refine_alpha(self.img, mask, matting=False))
+        plain = np.asarray(mask.resize(self.img.size, Image.Resampling.BILINEAR))
+        truth = np.asarray(self.truth)
+
+        refined_score = alpha_agreement(refined, truth)
+        self.assertGreater(refined_score["iou"], 0.99)
+        self.assertLess(refined_score["mean_abs_diff"], alpha_agreement(plain, truth)["mean_abs_diff"])
+
+        # Far from the outline alpha is hard 0 / 255
+        self.assertEqual(refined[600, 800], 255)
+        self.assertEqual(refined[20, 20], 0)
+
+    def test_band_follows_outline_only(self):
+        mask = self.truth.resize((400, 300), Image.Resampling.BILINEAR)
+        band = boundary_band(mask, self.img.size, band_width=12)
+        self.assertTrue(band[600, 400])   # left edge of the ellipse
+        self.assertFalse(band[600, 800])  # centre
+        self.assertLess(band.mean(), 0.1)
+
+    def test_strength_moves_the_edge(self):
+        # Very soft mask: the fringe is wide enough for the cutoff to matter
+        mask = self.truth.resize((400, 300), Image.Resampling.BILINEAR).filter(ImageFilter.GaussianBlur(6))
+        gentle = np.asarray(refine_alpha(self.img, mask, matting=False, **refine_options(0.2)))
+        strong = np.asarray(refine_alpha(self.img, mask, matting=False, **refine_options(0.9)))
+
+        self.assertFalse(np.array_equal(gentle, strong))
+        # Higher strength removes more of the fringe, never adds to it
+        self.assertTrue((strong <= gentle).all())
+        self.assertLess((strong >= 128).sum(), (gentle >= 128).sum())
+        self.assertGreater(refine_options(0.9)["band_width"], refine_options(0.2)["band_width"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from PIL import Image
+
+from modules.memory_budget import PixelBudget, draft_for_max_dimension, estimate_decode_bytes
+
+
+class TestPixelBudget(unittest.TestCase):
+    def test_admits_only_what_fits(self):
+        budget = PixelBudget(100)
+        self.assertTrue(budget.try_acquire(60))
+        self.assertFalse(budget.try_acquire(60))
+        self.assertTrue(budget.try_acquire(40))
+        budget.release(60)
+        budget.release(40)
+        # An oversized job is admitted once the budget is idle
+        self.assertTrue(budget.try_acquire(500))
+        self.assertEqual(budget.peak, 500)
+
+    def test_acquire_blocks_until_release(self):
+        budget = PixelBudget(100)
+        budget.acquire(80)
+        admitted = []
+        waiter = threading.Thread(target=lambda: admitted.append(budget.acquire(50, timeout=5)))
+        waiter.start()
+        time.sleep(0.1)
+        self.assertEqual(admitted, [])
+        budget.release(80)
+        waiter.join(5)
+        self.assertEqual(admitted, [True])
+
+
+class TestReducedDecode(unittest.TestCase):
+    def test_jpeg_draft_and_estimate(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "scan.jpg"
+            Image.new("RGB", (4000, 3000), (90, 80, 70)).save(path)
+
+            with Image.open(path) as img:
+                draft_for_max_dimension(img, 900)
+                img.load()
+                self.assertEqual(img.size, (1000, 750))
+
+            self.assertEqual(estimate_decode_bytes(str(path), 900, working_copies=1), 1000 * 750 * 4)
+            self.assertEqual(estimate_decode_bytes(str(path), None, working_copies=1), 4000 * 3000 * 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+from unittest import mock
+
+from PIL import Image
+
+from modules.workers import ProgressivePreviewThread
+
+
+class FakeRemover:
+    calls = []
+
+    def __init__(self, config):
+        pass
+
+    def quick_preview(self, image_path, strength):
+        self.calls.append("proxy")
+        return Image.new("RGBA", (4, 4))
+
+    def preview_removal(self, image_path, strength, final=False):
+        self.calls.append("final")
+        return Image.new("RGBA", (4, 4))
+
+
+class TestProgressivePreviewThread(unittest.TestCase):
+    def run_preview(self, generation, latest):
+        FakeRemover.calls = []
+        thread = ProgressivePreviewThread("x.jpg", {}, 0.5, generation, latest_generation=lambda: latest)
+        stages = []
+        thread.stage_ready.connect(lambda g, stage, image: stages.append(stage))
+        with mock.patch("modules.background_remover.BackgroundRemover", FakeRemover):
+            thread.run()  # Synchronously, on this thread
+        return stages, FakeRemover.calls
+
+    def test_latest_preview_runs_both_stages(self):
+        self.assertEqual(self.run_preview(3, 3), (["proxy", "final"], ["proxy", "final"]))
+
+    def test_superseded_preview_skips_full_resolution(self):
+        self.assertEqual(self.run_preview(3, 4), (["proxy"], ["proxy"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
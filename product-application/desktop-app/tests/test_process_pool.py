@@ -0,0 +1,36 @@
+import time
+import unittest
+
+from modules.process_pool import run_in_pool
+
+
+def sleepy(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+class TestRunInPoolTimeouts(unittest.TestCase):
+    def test_hung_job_does_not_time_out_the_rest(self):
+        start = time.monotonic()
+        outcomes = run_in_pool(sleepy, [(30,), (0.1,), (0.1,), (0.1,)], workers=1, timeout=1)
+
+        self.assertEqual(outcomes[0], {"result": None, "error": "Timed out after 1s"})
+        self.assertEqual([o["result"] for o in outcomes[1:]], [0.1, 0.1, 0.1])
+        self.assertTrue(all(o["error"] is None for o in outcomes[1:]))
+        self.assertLess(time.monotonic() - start, 10)
+
+    def test_jobs_sharing_the_pool_are_rerun(self):
+        seen = []
+        outcomes = run_in_pool(
+            # Job 2 starts at 0.5s and is still running when job 1 hangs past 1.5s
+            sleepy, [(0.5,), (30,), (1.2,)], workers=2, timeout=1.5,
+            progress_callback=lambda completed, total, index: seen.append(index)
+        )
+
+        self.assertEqual([o["result"] for o in outcomes], [0.5, None, 1.2])
+        self.assertIn("Timed out", outcomes[1]["error"])
+        self.assertEqual(sorted(seen), [0, 1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
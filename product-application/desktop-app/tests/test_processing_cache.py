@@ -0,0 +1,91 @@
+import os
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from PIL import Image
+
+from modules.image_processor import ImageProcessor
+from modules.processing_cache import ProcessingCache
+
+
+class TestProcessingCache(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.cache_dir = self.root / "cache"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _write(self, name, color, size=(64, 64)):
+        path = self.root / name
+        Image.new("RGB", size, color).save(path)
+        return path
+
+    def test_key_depends_on_content_and_options(self):
+        cache = ProcessingCache(str(self.cache_dir))
+        a = self._write("a.png", (255, 0, 0))
+        b = self._write("b.png", (255, 0, 0))
+        c = self._write("c.png", (0, 0, 255))
+
+        self.assertEqual(cache.make_key(str(a), {"q": 88}), cache.make_key(str(b), {"q": 88}))
+        self.assertNotEqual(cache.make_key(str(a), {"q": 88}), cache.make_key(str(c), {"q": 88}))
+        self.assertNotEqual(cache.make_key(str(a), {"q": 88}), cache.make_key(str(a), {"q": 80}))
+
+    def test_lru_eviction_keeps_recently_used(self):
+        blob = self.root / "blob.bin"
+        blob.write_bytes(b"x" * 1000)
+        cache = ProcessingCache(str(self.cache_dir), max_bytes=2500)
+
+        cache.put("old", {"output": str(blob)})
+        cache.put("used", {"output": str(blob)})
+        past = time.time() - 60
+        os.utime(self.cache_dir / "old" / "meta.json", (past, past))
+        os.utime(self.cache_dir / "used" / "meta.json", (past - 10, past - 10))
+        self.assertIsNotNone(cache.get("used"))  # touch -> most recent
+
+        cache.put("new", {"output": str(blob)})
+
+        self.assertIsNone(cache.get("old"))
+        self.assertIsNotNone(cache.get("used"))
+        self.assertIsNotNone(cache.get("new"))
+        self.assertEqual(cache.evictions, 1)
+
+    def test_directory_scanned_only_when_over_cap(self):
+        blob = self.root / "blob.bin"
+        blob.write_bytes(b"x" * 1000)
+        cache = ProcessingCache(str(self.cache_dir), max_bytes=5500)
+
+        with mock.patch.object(cache, "_entries", wraps=cache._entries) as scans:
+            for key in ("a", "b", "c", "d", "e"):
+                cache.put(key, {"output": str(blob)})
+            self.assertEqual(scans.call_count, 1)  # First put only
+            self.assertEqual(cache.evictions, 0)
+
+            cache.put("f", {"output": str(blob)})
+            self.assertEqual(scans.call_count, 2)
+        self.assertEqual(cache.evictions, 1)
+        self.assertEqual(cache._size_bytes, cache.stats()["size_bytes"])
+
+    def test_process_image_reuses_cached_rendition(self):
+        config = {"image_processing": {"cache": {"dir": str(self.cache_dir)}}}
+        source = self._write("photo.png", (20, 140, 90), size=(300, 200))
+
+        first = ImageProcessor(config).process_image(str(source), {"delete_originals": False})
+        Path(first["output_path"]).unlink()
+
+        processor = ImageProcessor(config)
+        second = processor.process_image(str(source), {"delete_originals": False})
+
+        self.assertFalse(first["cache_hit"])
+        self.assertTrue(second["cache_hit"])
+        self.assertTrue(Path(second["output_path"]).exists())
+        self.assertEqual(second["new_size"], (300, 200))
+        self.assertEqual(processor.cache.stats()["hits"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+
+from modules import rembg_session
+from modules.rembg_session import RembgSessionManager, configure_worker, get_session_manager
+
+
+class SlowLoader:
+    """new_session stand-in: counts loads, optionally failing the first ones."""
+
+    def __init__(self, delay=0.2, failures=0):
+        self.delay = delay
+        self.failures = failures
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, model_name):
+        with self.lock:
+            self.calls.append(model_name)
+            fail = len(self.calls) <= self.failures
+        time.sleep(self.delay)
+        if fail:
+            raise OSError("model download failed")
+        return f"session:{model_name}"
+
+
+class TestRembgSessionManager(unittest.TestCase):
+    def use_loader(self, loader):
+        for name, value in (("new_session", loader), ("REMBG_AVAILABLE", True)):
+            patcher = mock.patch.object(rembg_session, name, value, create=True)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def get_concurrently(self, manager, count):
+        results = []
+
+        def get():
+            try:
+                results.append(manager.get_session("u2netp"))
+            except RuntimeError as e:
+                results.append(e)
+
+        threads = [threading.Thread(target=get) for _ in range(count)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return results
+
+    def test_concurrent_get_loads_once(self):
+        loader = SlowLoader()
+        self.use_loader(loader)
+        manager = RembgSessionManager()
+
+        results = self.get_concurrently(manager, 5)
+
+        self.assertEqual(loader.calls, ["u2netp"])
+        self.assertEqual(results, ["session:u2netp"] * 5)
+        self.assertTrue(manager.is_loaded("u2netp"))
+        self.assertGreater(manager.stats()["u2netp"]["load_seconds"], 0)
+
+    def test_failed_load_reaches_waiters_and_can_be_retried(self):
+        loader = SlowLoader(failures=1)
+        self.use_loader(loader)
+        manager = RembgSessionManager()
+
+        results = self.get_concurrently(manager, 3)
+
+        self.assertEqual(len(loader.calls), 1)
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+        self.assertIn("model download failed", str(results[0]))
+        self.assertFalse(manager.is_loaded("u2netp"))
+
+        self.assertEqual(manager.get_session("u2netp"), "session:u2netp")
+        self.assertEqual(len(loader.calls), 2)
+
+    def test_warm_up_loads_in_background(self):
+        loader = SlowLoader(delay=0.05)
+        self.use_loader(loader)
+        manager = RembgSessionManager()
+
+        thread = manager.warm_up("u2net")
+        thread.join()
+        self.assertTrue(manager.is_loaded("u2net"))
+        self.assertIsNone(manager.warm_up("u2net"))
+
+    def test_configure_worker_sets_threads_and_fresh_manager(self):
+        before = get_session_manager()
+        with mock.patch.dict(os.environ, {}):
+            configure_worker(3)
+            self.assertEqual(os.environ["OMP_NUM_THREADS"], "3")
+            configure_worker(0)
+            self.assertEqual(os.environ["OMP_NUM_THREADS"], "1")
+        self.assertIsNot(get_session_manager(), before)
+
+
+if __name__ == "__main__":
+    unittest.main()
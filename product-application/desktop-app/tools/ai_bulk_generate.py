@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+"""
+Overnight AI descriptions and valuations for many products (Message Batches).
+
+Every sub-folder of <products_root> that holds images is one product.
+Requests are submitted as batches (half price, asynchronous); batch IDs
+are persisted, so an interrupted run is finished with --resume. Results
+are merged into each folder's product_info.json.
+
+Usage:
+    python tools/ai_bulk_generate.py <products_root> [--kinds description valuation]
+    python tools/ai_bulk_generate.py --resume
+    python tools/ai_bulk_generate.py <products_root> --submit-only
+    python tools/ai_bulk_generate.py <products_root> --direct   # now, via regular calls (bulk lane)
+    python tools/ai_bulk_generate.py <products_root> --base-url http://127.0.0.1:8765   # stand-in server
+"""
+
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+# Allow running from the desktop-app folder or from tools/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.ai_batch import BulkGenerator, IMAGE_EXTENSIONS, KINDS  # noqa: E402
+from modules.ai_engine import AIEngine  # noqa: E402
+from modules.ai_scheduler import PRIORITY_BULK  # noqa: E402
+from modules.paths import get_config_path  # noqa: E402
+
+
+def product_folders(root: Path):
+    return sorted(
+        folder for folder in root.iterdir()
+        if folder.is_dir() and any(p.suffix.lower() in IMAGE_EXTENSIONS for p in folder.iterdir())
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Bulk AI listing generation via Message Batches")
+    parser.add_argument("root", nargs="?", help="folder containing one sub-folder per product")
+    parser.add_argument("--kinds", nargs="+", default=list(KINDS), choices=KINDS)
+    parser.add_argument("--resume", action="store_true", help="collect previously submitted batches")
+    parser.add_argument("--submit-only", action="store_true", help="submit and exit; collect later with --resume")
+    parser.add_argument("--direct", action="store_true",
+                        help="generate now with regular (full-price) calls instead of batches")
+    parser.add_argument("--base-url", help="batch API base URL (e.g. the stand-in server)")
+    parser.add_argument("--config", default=str(get_config_path("config.json")))
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(message)s")
+    with open(args.config, encoding="utf-8") as f:
+        config = json.load(f)
+    if args.base_url:
+        config.setdefault("ai", {}).setdefault("batch", {})["base_url"] = args.base_url
+
+    bulk = BulkGenerator.from_config(AIEngine(config, priority=PRIORITY_BULK), config)
+
+    if args.resume:
+        print(f"Collected: {bulk.resume()}")
+        return 0
+    if not args.root:
+        parser.error("root is required unless --resume is given")
+
+    folders = product_folders(Path(args.root))
+    if args.direct:
+        print(f"Generated: {bulk.generate_direct([str(f) for f in folders], kinds=args.kinds)}")
+        return 0
+    batch_ids = bulk.submit([str(f) for f in folders], kinds=args.kinds)
+    print(f"Submitted {len(folders)} products in {len(batch_ids)} batch(es): {', '.join(batch_ids)}")
+    if not args.submit_only:
+        print(f"Collected: {bulk.wait_and_collect(batch_ids)}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Message Batches API.
+
+Implements the three endpoints modules/ai_batch.py uses, in memory:
+    POST /v1/messages/batches                 create a batch
+    GET  /v1/messages/batches/<id>            status (ends after N polls)
+    GET  /v1/messages/batches/<id>/results    JSONL results
+
+Replies are canned JSON matching the description/valuation prompts, or
+whatever a custom responder(custom_id, params) returns. Used by the
+tests, and for trying a bulk run without spending API credit:
+
+Usage:
+    python tools/batch_stub_server.py [--port 8765] [--polls 2]
+    python tools/ai_bulk_generate.py <products_root> --base-url http://127.0.0.1:8765
+"""
+
+import argparse
+import json
+import re
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, Optional
+
+Responder = Callable[[str, Dict[str, Any]], Optional[str]]
+
+
+def canned_reply(custom_id: str, params: Dict[str, Any]) -> str:
+    """Plausible reply for a description or valuation request."""
+    if custom_id.endswith("valuation"):
+        return json.dumps({
+            "valuation_range": {"low": 120, "high": 240, "recommended": 180},
+            "confidence_tier": "Tier 2 (Strong Analog)",
+            "valuation_justification": "Stand-in valuation",
+            "market_demand": "moderate",
+            "factors": ["condition", "age"]
+        })
+    return json.dumps({
+        "description": f"Stand-in description for {custom_id}.",
+        "seo_title": "Stand-in SEO title",
+        "seo_description": "Stand-in meta description",
+        "keywords": ["stand-in", "keyword"]
+    })
+
+
+class BatchStubServer:
+    """
+    In-memory batch endpoint on 127.0.0.1 (context manager).
+
+    Args:
+        responder: (custom_id, params) -> reply text, or None to report that
+            request as errored
+        polls_until_done: Status requests answered "in_progress" before "ended"
+        port: 0 picks a free port
+    """
+
+    def __init__(self, responder: Responder = canned_reply, polls_until_done: int = 1, port: int = 0):
+        self.responder = responder
+        self.polls_until_done = polls_until_done
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self.lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "BatchStubServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _create(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        batch_id = f"msgbatch_{uuid.uuid4().hex[:24]}"
+        with self.lock:
+            self.batches[batch_id] = {"requests": body["requests"], "polls": 0}
+        return self._status(batch_id, count_poll=False)
+
+    def _status(self, batch_id: str, count_poll: bool = True) -> Dict[str, Any]:
+        with self.lock:
+            batch = self.batches[batch_id]
+            if count_poll:
+                batch["polls"] += 1
+            ended = batch["polls"] >= self.polls_until_done
+        total = len(batch["requests"])
+        return {
+            "id": batch_id,
+            "type": "message_batch",
+            "processing_status": "ended" if ended else "in_progress",
+            "request_counts": {
+                "processing": 0 if ended else total,
+                "succeeded": total if ended else 0,
+                "errored": 0, "canceled": 0, "expired": 0
+            },
+            "results_url": f"{self.url}/v1/messages/batches/{batch_id}/results" if ended else None
+        }
+
+    def _results(self, batch_id: str) -> str:
+        lines = []
+        for request in self.batches[batch_id]["requests"]:
+            text = self.responder(request["custom_id"], request["params"])
+            if text is None:
+                result = {"type": "errored", "error": {"type": "error", "error": {
+                    "type": "invalid_request_error", "message": "stand-in error"}}}
+            else:
+                result = {"type": "succeeded", "message": {
+                    "type": "message", "role": "assistant",
+                    "content": [{"type": "text", "text": text}],
+                    "usage": {"input_tokens": 1000, "output_tokens": 200}
+                }}
+            lines.append(json.dumps({"custom_id": request["custom_id"], "result": result}))
+        return "\n".join(lines) + "\n"
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _send(self, status: int, body: str, content_type: str = "application/json") -> None:
+                data = body.encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                if self.path != "/v1/messages/batches":
+                    return self._send(404, '{"error": "not found"}')
+                body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+                self._send(200, json.dumps(server._create(body)))
+
+            def do_GET(self):
+                match = re.fullmatch(r"/v1/messages/batches/([\w-]+)(/results)?", self.path)
+                if not match or match.group(1) not in server.batches:
+                    return self._send(404, '{"error": "not found"}')
+                if match.group(2):
+                    self._send(200, server._results(match.group(1)), "application/x-jsonl")
+                else:
+                    self._send(200, json.dumps(server._status(match.group(1))))
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Local stand-in for the Message Batches API")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--polls", type=int, default=2, help="status polls before a batch ends")
+    args = parser.parse_args()
+
+    with BatchStubServer(polls_until_done=args.polls, port=args.port) as server:
+        print(f"Batch stand-in listening on {server.url} (Ctrl+C to stop)")
+        try:
+            threading.Event().wait()
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Background removal benchmark.
+
+Compares the full-resolution rembg path (alpha matting over the whole
+image) against proxy inference + guided upsampling + band-only matting,
+on a folder of real product photos.
+
+With --models, instead times each rembg model (default: every profile
+model already downloaded) through the configured proxy pipeline and
+compares its masks with the last, most accurate model in the list.
+
+Usage:
+    python tools/benchmark_bg_removal.py <folder> [--runs 2] [--proxy-size 1024] [--json out.json]
+    python tools/benchmark_bg_removal.py <folder> --models [u2netp u2net isnet-general-use]
+
+Quality is reported against the reference result: IoU of the
+foreground (alpha >= 128) and mean absolute alpha difference (0-255).
+"""
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Allow running from the desktop-app folder or from tools/
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from modules.background_remover import BackgroundRemover, REMBG_AVAILABLE  # noqa: E402
+from modules.mask_refine import alpha_agreement  # noqa: E402
+from modules.rembg_session import get_session_manager, installed_models, MODEL_PROFILES  # noqa: E402
+
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.webp', '.tiff', '.tif', '.bmp'}
+
+
+def make_remover(proxy: bool, args: argparse.Namespace, model: str = None) -> BackgroundRemover:
+    return BackgroundRemover({"image_processing": {"background_removal": {
+        "model": model or args.model,
+        "proxy_inference": proxy,
+        "proxy_size": args.proxy_size,
+        "max_input_dimension": args.max_input_dimension,
+        "mask_cache": {"enabled": False}
+    }}})
+
+
+def time_removal(remover: BackgroundRemover, image_path: Path, strength: float, runs: int):
+    """Best-of-runs seconds and the alpha of the last run."""
+    timings = []
+    alpha = None
+    for _ in range(runs):
+        img = remover._load_for_removal(image_path)
+        start = time.perf_counter()
+        result = remover._remove_with_rembg(img, strength)
+        timings.append(time.perf_counter() - start)
+        alpha = np.asarray(result.getchannel("A"))
+    return min(timings), alpha
+
+
+def compare_models(images, args: argparse.Namespace) -> list:
+    """Latency and mask agreement per model; the last model is the reference."""
+    models = args.models or installed_models()
+    if not models:
+        print(f"No profile models downloaded yet ({', '.join(MODEL_PROFILES.values())}); pass --models")
+        return []
+
+    manager = get_session_manager()
+    for model in models:
+        manager.get_session(model)  # Model load is not part of the timings
+    removers = {model: make_remover(True, args, model) for model in models}
+    reference = models[-1]
+    rows = []
+
+    print(f"Reference model: {reference}")
+    print(f"{'image':32} {'model':20} {'s':>8} {'IoU':>7} {'MAD':>6}")
+    for image_path in images:
+        alphas = {}
+        for model in models:
+            seconds, alphas[model] = time_removal(removers[model], image_path, args.strength, args.runs)
+            rows.append({"image": image_path.name, "model": model, "seconds": round(seconds, 3)})
+        for row in rows[-len(models):]:
+            row.update(alpha_agreement(alphas[row["model"]], alphas[reference]))
+            print(
+                f"{row['image'][:32]:32} {row['model'][:20]:20} {row['seconds']:>8} "
+                f"{row['iou']:>7} {row['mean_abs_diff']:>6}"
+            )
+
+    print()
+    for model in models:
+        model_rows = [r for r in rows if r["model"] == model]
+        print(
+            f"{model:20} median {statistics.median(r['seconds'] for r in model_rows):.3f}s, "
+            f"IoU {statistics.median(r['iou'] for r in model_rows):.4f}, "
+            f"MAD {statistics.median(r['mean_abs_diff'] for r in model_rows):.2f}"
+        )
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark background removal paths")
+    parser.add_argument("folder", help="Folder of test images")
+    parser.add_argument("--runs", type=int, default=2, help="Runs per image and path (best is kept)")
+    parser.add_argument("--strength", type=float, default=0.8)
+    parser.add_argument("--model", default="u2net")
+    parser.add_argument("--proxy-size", type=int, default=1024)
+    parser.add_argument("--max-input-dimension", type=int, default=0, help="0 = full source resolution")
+    parser.add_argument(
+        "--models", nargs="*",
+        help="Compare these rembg models instead (no names = every downloaded profile model)"
+    )
+    parser.add_argument("--json", help="Write per-image results to this file")
+    args = parser.parse_args()
+
+    if not REMBG_AVAILABLE:
+        print("rembg is not installed; nothing to benchmark (pip install rembg)")
+        return 1
+
+    images = sorted(p for p in Path(args.folder).iterdir() if p.suffix.lower() in IMAGE_EXTENSIONS)
+    if not images:
+        print(f"No images found in {args.folder}")
+        return 1
+
+    if args.models is not None:
+        rows = compare_models(images, args)
+        if args.json and rows:
+            write_json(args, rows)
+        return 0 if rows else 1
+
+    manager = get_session_manager()
+    manager.get_session(args.model)  # Model load is not part of either timing
+
+    full = make_remover(False, args)
+    proxy = make_remover(True, args)
+    rows = []
+
+    print(f"{'image':32} {'MP':>6} {'full s':>8} {'proxy s':>8} {'speedup':>8} {'IoU':>7} {'MAD':>6}")
+    for image_path in images:
+        full_seconds, full_alpha = time_removal(full, image_path, args.strength, args.runs)
+        proxy_seconds, proxy_alpha = time_removal(proxy, image_path, args.strength, args.runs)
+        quality = alpha_agreement(proxy_alpha, full_alpha)
+        row = {
+            "image": image_path.name,
+            "megapixels": round(full_alpha.size / 1e6, 1),
+            "full_seconds": round(full_seconds, 3),
+            "proxy_seconds": round(proxy_seconds, 3),
+            "speedup": round(full_seconds / proxy_seconds, 2) if proxy_seconds else 0.0,
+            **quality
+        }
+        rows.append(row)
+        print(
+            f"{row['image'][:32]:32} {row['megapixels']:>6} {row['full_seconds']:>8} "
+            f"{row['proxy_seconds']:>8} {row['speedup']:>7}x {row['iou']:>7} {row['mean_abs_diff']:>6}"
+        )
+
+    print(
+        f"\nMedian speedup {statistics.median(r['speedup'] for r in rows):.2f}x, "
+        f"median IoU {statistics.median(r['iou'] for r in rows):.4f}, "
+        f"median MAD {statistics.median(r['mean_abs_diff'] for r in rows):.2f}"
+    )
+
+    if args.json:
+        write_json(args, rows)
+    return 0
+
+
+def write_json(args: argparse.Namespace, rows: list) -> None:
+    with open(args.json, "w", encoding="utf-8") as f:
+        json.dump({"args": vars(args), "results": rows}, f, indent=2)
+    print(f"Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())